@@ -1,11 +1,19 @@
 from django.contrib import admin
-from airports.models import Airport, Route
+from airports.models import Airport, DatasetLoad, Route
 
 
 @admin.register(Airport)
 class AirportAdmin(admin.ModelAdmin):
-    list_display = ["name", "closest_big_city"]
-    search_fields = ["name", "closest_big_city"]
+    list_display = [
+        "name",
+        "iata_code",
+        "icao_code",
+        "closest_big_city",
+        "latitude",
+        "longitude",
+    ]
+    readonly_fields = ["geohash"]
+    search_fields = ["name", "closest_big_city", "iata_code", "icao_code"]
 
 
 @admin.register(Route)
@@ -13,3 +21,9 @@ class RouteAdmin(admin.ModelAdmin):
     list_display = ["source", "destination", "distance"]
     list_filter = ["source", "destination"]
     search_fields = ["source__name", "destination__name"]
+
+
+@admin.register(DatasetLoad)
+class DatasetLoadAdmin(admin.ModelAdmin):
+    list_display = ["name", "rows", "loaded_at", "fingerprint"]
+    readonly_fields = ["name", "rows", "loaded_at", "fingerprint"]
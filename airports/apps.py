@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AirportsConfig(AppConfig):
     name = "airports"
+
+    def ready(self):
+        import airports.signals  # noqa: F401
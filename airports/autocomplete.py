@@ -0,0 +1,87 @@
+import heapq
+import threading
+import unicodedata
+from bisect import bisect_left
+
+from airports.models import Airport
+from config.versioning import model_version
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(text.casefold().split())
+
+
+class AutocompleteIndex:
+    """
+    Prefix index over airport names and their closest big cities.
+
+    Every full name and every word of it is stored in one sorted array,
+    so all entries starting with a prefix form a contiguous slice found
+    with two binary searches. Matches on the start of the airport name
+    rank above city matches, which rank above matches on inner words.
+    """
+
+    def __init__(self, airports):
+        entries = []
+        self.airports = {}
+
+        for airport_id, name, city in airports:
+            self.airports[airport_id] = {
+                "id": airport_id,
+                "name": name,
+                "closest_big_city": city,
+            }
+            for rank, text in enumerate((name, city)):
+                words = normalize(text).split()
+                if not words:
+                    continue
+                entries.append((" ".join(words), rank, airport_id))
+                for word in words[1:]:
+                    entries.append((word, rank + 2, airport_id))
+
+        entries.sort()
+        self.keys = [key for key, _, _ in entries]
+        self.entries = entries
+
+    def search(self, query: str, limit: int = 10) -> list[dict]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        ranks = {}
+        for _, rank, airport_id in self.entries[start:end]:
+            if rank < ranks.get(airport_id, 4):
+                ranks[airport_id] = rank
+
+        best = heapq.nsmallest(
+            limit,
+            ranks.items(),
+            key=lambda item: (item[1], self.airports[item[0]]["name"])
+        )
+        return [self.airports[airport_id] for airport_id, _ in best]
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """Return this process' index, rebuilding it if airports changed."""
+    global _index, _index_version
+
+    version = model_version(Airport)
+    if _index is None or _index_version != version:
+        with _index_lock:
+            if _index is None or _index_version != version:
+                _index = AutocompleteIndex(
+                    Airport.objects.order_by().values_list(
+                        "id", "name", "closest_big_city"
+                    )
+                )
+                _index_version = version
+    return _index
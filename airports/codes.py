@@ -0,0 +1,42 @@
+import threading
+
+from airports.models import Airport
+from config.versioning import model_version
+
+_codes = None
+_codes_version = None
+_codes_lock = threading.Lock()
+
+
+def get_airport_codes() -> dict[str, int]:
+    """
+    Process-local IATA/ICAO code -> airport id map.
+
+    IATA codes have three characters and ICAO codes four, so both fit in
+    one dictionary. Rebuilt whenever the Airport version changes.
+    """
+    global _codes, _codes_version
+
+    version = model_version(Airport)
+    if _codes is None or _codes_version != version:
+        with _codes_lock:
+            if _codes is None or _codes_version != version:
+                codes = {}
+                for airport_id, iata_code, icao_code in (
+                    Airport.objects.order_by().values_list(
+                        "id", "iata_code", "icao_code"
+                    )
+                ):
+                    for code in (iata_code, icao_code):
+                        if code:
+                            codes[code] = airport_id
+                _codes = codes
+                _codes_version = version
+    return _codes
+
+
+def resolve_airport_code(code: str):
+    """Airport id for an IATA or ICAO code (any case), or None."""
+    if len(code) not in (3, 4):
+        return None
+    return get_airport_codes().get(code.upper())
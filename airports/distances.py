@@ -0,0 +1,304 @@
+import math
+import os
+import tempfile
+import threading
+from heapq import heappop, heappush
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from airports.models import Airport, Route
+from config.versioning import model_version
+
+MATRIX_FILE = "distances.npy"
+AIRPORTS_FILE = "airports.npy"
+EDGES_FILE = "edges.npy"
+# Route version the matrix was built from, see DistanceMatrix.is_stale().
+ROUTE_VERSION_FILE = "route_version.npy"
+
+# Rough cost of one Python heap operation relative to one vectorized
+# NumPy element operation; used to pick between the two algorithms.
+DIJKSTRA_COST_FACTOR = 1000
+
+
+class DistanceMatrixUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = (
+        "Distance matrix has not been built yet, "
+        "run the build_distance_matrix command."
+    )
+    default_code = "distance_matrix_unavailable"
+
+
+def matrix_dir() -> Path:
+    return Path(
+        getattr(
+            settings,
+            "DISTANCE_MATRIX_DIR",
+            settings.BASE_DIR / "var" / "distances"
+        )
+    )
+
+
+def load_edges() -> tuple[np.ndarray, np.ndarray]:
+    """
+    Airport ids (sorted) and the shortest direct edge per airport pair.
+
+    Edges are returned as an (E, 3) int64 array of
+    (source index, destination index, distance).
+    """
+    airport_ids = np.fromiter(
+        Airport.objects.order_by("id").values_list("id", flat=True),
+        dtype=np.int64
+    )
+    shortest = {}
+    for source_id, destination_id, distance in (
+        Route.objects.order_by().values_list(
+            "source_id", "destination_id", "distance"
+        )
+    ):
+        pair = (source_id, destination_id)
+        if distance < shortest.get(pair, math.inf):
+            shortest[pair] = distance
+
+    edges = np.array(
+        [(*pair, distance) for pair, distance in shortest.items()],
+        dtype=np.int64
+    ).reshape(-1, 3)
+    edges[:, :2] = np.searchsorted(airport_ids, edges[:, :2])
+    return airport_ids, edges
+
+
+def floyd_warshall(size: int, edges: np.ndarray) -> np.ndarray:
+    matrix = np.full((size, size), np.inf)
+    matrix[edges[:, 0], edges[:, 1]] = edges[:, 2]
+    np.fill_diagonal(matrix, 0)
+    for via in range(size):
+        np.minimum(
+            matrix, matrix[:, via, None] + matrix[None, via, :], out=matrix
+        )
+    return matrix
+
+
+def dijkstra(size: int, edges: np.ndarray) -> np.ndarray:
+    adjacency = [[] for _ in range(size)]
+    for source, destination, distance in edges.tolist():
+        adjacency[source].append((destination, distance))
+
+    matrix = np.full((size, size), np.inf)
+    for start in range(size):
+        row = matrix[start]
+        row[start] = 0
+        heap = [(0, start)]
+        while heap:
+            distance, node = heappop(heap)
+            if distance > row[node]:
+                continue
+            for neighbour, weight in adjacency[node]:
+                candidate = distance + weight
+                if candidate < row[neighbour]:
+                    row[neighbour] = candidate
+                    heappush(heap, (candidate, neighbour))
+    return matrix
+
+
+def is_sparse(size: int, edge_count: int) -> bool:
+    """Whether repeated Dijkstra is expected to beat Floyd–Warshall."""
+    heap_cost = edge_count * max(math.log2(size or 1), 1)
+    return heap_cost * DIJKSTRA_COST_FACTOR < size * size
+
+
+def shortest_distances(
+    size: int, edges: np.ndarray, algorithm: str = "auto"
+) -> np.ndarray:
+    if algorithm == "auto":
+        algorithm = "dijkstra" if is_sparse(size, len(edges)) else "floyd"
+    if algorithm == "dijkstra":
+        return dijkstra(size, edges)
+    return floyd_warshall(size, edges)
+
+
+def relax_edges(matrix: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Update an all-pairs matrix in place for new or shortened edges.
+
+    Each edge u -> v with weight w can only shorten paths that use it,
+    so one O(n^2) pass min(D, D[:, u] + w + D[v, :]) per edge suffices.
+    """
+    for source, destination, distance in edges.tolist():
+        np.minimum(
+            matrix,
+            matrix[:, source, None] + distance + matrix[None, destination, :],
+            out=matrix
+        )
+    return matrix
+
+
+def changed_edges(previous: np.ndarray, current: np.ndarray):
+    """
+    Edges that were added or got shorter, or None if any edge was removed
+    or got longer (which requires a full rebuild).
+    """
+    before = {
+        (source, destination): distance
+        for source, destination, distance in previous.tolist()
+    }
+    changed = []
+    for source, destination, distance in current.tolist():
+        old = before.pop((source, destination), None)
+        if old is None or distance < old:
+            changed.append((source, destination, distance))
+        elif distance > old:
+            return None
+    if before:
+        return None
+    return np.array(changed, dtype=np.int64).reshape(-1, 3)
+
+
+def _save(directory: Path, name: str, array: np.ndarray) -> None:
+    """Write next to the target and rename, so readers never see a partial
+    file and existing memory maps keep the old inode."""
+    with tempfile.NamedTemporaryFile(
+        dir=directory, suffix=".npy", delete=False
+    ) as file:
+        np.save(file, array)
+    os.replace(file.name, directory / name)
+
+
+def build_distance_matrix(algorithm="auto", incremental=True) -> dict:
+    """
+    Recompute the shortest-distance matrix and persist it as .npy files.
+
+    When only new or shorter routes appeared since the last build (and
+    the set of airports is unchanged), the stored matrix is relaxed with
+    the changed edges instead of being recomputed from scratch.
+    """
+    directory = matrix_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    # Read before the routes: a change during the build leaves it stale.
+    route_version = model_version(Route)
+    airport_ids, edges = load_edges()
+
+    changed = None
+    if incremental:
+        try:
+            previous_ids = np.load(directory / AIRPORTS_FILE)
+            previous_edges = np.load(directory / EDGES_FILE)
+            matrix = np.load(directory / MATRIX_FILE)
+        except (FileNotFoundError, ValueError):
+            pass
+        else:
+            if np.array_equal(previous_ids, airport_ids):
+                changed = changed_edges(previous_edges, edges)
+
+    if changed is not None:
+        matrix = relax_edges(matrix, changed)
+        mode = "incremental"
+    else:
+        matrix = shortest_distances(len(airport_ids), edges, algorithm)
+        mode = "full"
+
+    # The edge snapshot goes last: an interrupted build leaves the old
+    # snapshot behind, so the next run cannot relax a stale matrix.
+    _save(directory, MATRIX_FILE, matrix)
+    _save(directory, AIRPORTS_FILE, airport_ids)
+    _save(directory, EDGES_FILE, edges)
+    _save(directory, ROUTE_VERSION_FILE, np.array(route_version))
+    return {
+        "mode": mode,
+        "airports": len(airport_ids),
+        "edges": len(edges),
+        "changed": len(changed) if changed is not None else len(edges),
+    }
+
+
+class DistanceMatrix:
+    """Read-only view over the memory-mapped matrix shared by workers."""
+
+    def __init__(self, directory: Path):
+        self.airport_ids = np.load(directory / AIRPORTS_FILE)
+        self.matrix = np.load(directory / MATRIX_FILE, mmap_mode="r")
+        self.route_version = int(np.load(directory / ROUTE_VERSION_FILE))
+        if self.matrix.shape != (len(self.airport_ids),) * 2:
+            raise ValueError("Airport index does not match the matrix.")
+
+    def is_stale(self) -> bool:
+        """
+        Whether routes changed since the build (or the version counter was
+        lost with the cache), until build_distance_matrix runs again.
+        """
+        return self.route_version != model_version(Route)
+
+    def index(self, airport_id: int):
+        position = int(np.searchsorted(self.airport_ids, airport_id))
+        if (
+            position < len(self.airport_ids)
+            and self.airport_ids[position] == airport_id
+        ):
+            return position
+        return None
+
+    def distance(self, source_id: int, destination_id: int):
+        source = self.index(source_id)
+        destination = self.index(destination_id)
+        if source is None or destination is None:
+            return None
+        distance = self.matrix[source, destination]
+        return None if np.isinf(distance) else int(distance)
+
+    def distances_from(self, source_id: int) -> dict[int, int]:
+        source = self.index(source_id)
+        if source is None:
+            return {}
+        row = np.asarray(self.matrix[source])
+        reachable = np.flatnonzero(np.isfinite(row))
+        return dict(
+            zip(
+                self.airport_ids[reachable].tolist(),
+                row[reachable].astype(np.int64).tolist(),
+                strict=True,
+            )
+        )
+
+    def unreachable_to(self, destination_id: int) -> set[int]:
+        """Airports of the matrix with no path to the destination."""
+        destination = self.index(destination_id)
+        if destination is None:
+            return set()
+        column = np.asarray(self.matrix[:, destination])
+        return set(self.airport_ids[~np.isfinite(column)].tolist())
+
+
+_lock = threading.Lock()
+_matrix = None
+_matrix_version = None
+
+
+def get_distance_matrix() -> DistanceMatrix:
+    """Per-process matrix, reopened whenever a new build is written."""
+    global _matrix, _matrix_version
+
+    directory = matrix_dir()
+    try:
+        version = (directory,) + tuple(
+            (directory / name).stat().st_mtime_ns
+            for name in (AIRPORTS_FILE, MATRIX_FILE, ROUTE_VERSION_FILE)
+        )
+    except FileNotFoundError:
+        raise DistanceMatrixUnavailable() from None
+
+    if _matrix is not None and _matrix_version == version:
+        return _matrix
+
+    with _lock:
+        if _matrix is None or _matrix_version != version:
+            try:
+                _matrix = DistanceMatrix(directory)
+            except (FileNotFoundError, ValueError):
+                # Missing, or caught between two writes of a rebuild.
+                raise DistanceMatrixUnavailable() from None
+            _matrix_version = version
+        return _matrix
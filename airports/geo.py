@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(
+    latitude: float, longitude: float, precision: int = GEOHASH_PRECISION
+) -> str:
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (
+            (longitude, lon_range) if even else (latitude, lat_range)
+        )
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """Height and width of a geohash cell in degrees."""
+    bits = 5 * precision
+    return 180 / 2 ** (bits // 2), 360 / 2 ** ((bits + 1) // 2)
+
+
+def covering_cells(
+    latitude: float, longitude: float, radius_km: float
+) -> set[str]:
+    """
+    Geohash prefixes whose cells together cover the circle around a point.
+
+    Picks the longest precision whose cells are at least as large as the
+    circle's bounding box (so at most 2x2 cells are touched), then steps
+    over the box by half a cell so that every one of them is visited. An
+    empty set means the circle is too large (or too close to a pole) for
+    a prefix filter.
+    """
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_delta, 90.0)))
+    if cos_lat < 1e-6 or lat_delta / cos_lat >= 180:
+        return set()
+    lon_delta = lat_delta / cos_lat
+
+    precision = GEOHASH_PRECISION
+    while precision and (
+        cell_size(precision)[0] < lat_delta
+        or cell_size(precision)[1] < lon_delta
+    ):
+        precision -= 1
+    if not precision:
+        return set()
+
+    lat_step, lon_step = (size / 2 for size in cell_size(precision))
+    cells = set()
+    for lat in np.append(
+        np.arange(latitude - lat_delta, latitude + lat_delta, lat_step),
+        latitude + lat_delta,
+    ):
+        for lon in np.append(
+            np.arange(longitude - lon_delta, longitude + lon_delta, lon_step),
+            longitude + lon_delta,
+        ):
+            cells.add(
+                encode_geohash(
+                    float(np.clip(lat, -90, 90)),
+                    (float(lon) + 180) % 360 - 180,
+                    precision,
+                )
+            )
+    return cells
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; accepts scalars or NumPy arrays."""
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(value, dtype=np.float64))
+        for value in (lat1, lon1, lat2, lon2)
+    )
+    chord = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(chord, 0, 1)))
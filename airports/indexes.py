@@ -0,0 +1,32 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    GIN `gin_trgm_ops` index over UPPER(field).
+
+    It serves both `icontains` (UPPER(field) LIKE UPPER(...)) and trigram
+    similarity lookups on PostgreSQL. Other backends, such as SQLite test
+    runs, get a plain expression index over the same column instead.
+    """
+
+    def __init__(self, field_name, *, name):
+        self.field_name = field_name
+        super().__init__(
+            OpClass(Upper(field_name), name="gin_trgm_ops"),
+            name=name
+        )
+
+    def deconstruct(self):
+        path, _, _ = super().deconstruct()
+        return path, (self.field_name,), {"name": self.name}
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return models.Index(
+                Upper(self.field_name),
+                name=self.name
+            ).create_sql(model, schema_editor, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
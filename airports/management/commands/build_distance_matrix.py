@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from airports.distances import build_distance_matrix, matrix_dir
+
+
+class Command(BaseCommand):
+    """Django command to build the all-pairs airport distance matrix."""
+
+    help = (
+        "Compute shortest network distances between all airports and "
+        "store them as memory-mapped .npy files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithm",
+            choices=["auto", "floyd", "dijkstra"],
+            default="auto",
+            help="Algorithm for full rebuilds (auto picks by density).",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute from scratch even if an incremental update "
+                 "is possible.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        started = time.monotonic()
+        result = build_distance_matrix(
+            algorithm=options["algorithm"],
+            incremental=not options["full"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['mode'].capitalize()} build of "
+                f"{result['airports']} airports, {result['edges']} routes "
+                f"({result['changed']} applied) written to {matrix_dir()} "
+                f"in {time.monotonic() - started:.2f}s."
+            )
+        )
@@ -0,0 +1,106 @@
+import time
+from datetime import date
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from config.synthetic import SYNTHETIC_CHUNK_SIZE, DatasetGenerator
+from config.versioning import bump_model_version
+
+
+class Command(BaseCommand):
+    """Django command to generate a synthetic dataset for load testing."""
+
+    help = (
+        "Generate seedable synthetic airports, routes, airplanes, crew, "
+        "flights, orders and tickets with bulk inserts. Rows are added to "
+        "whatever the database already holds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--airports", type=int, default=1000)
+        parser.add_argument("--routes", type=int, default=20000)
+        parser.add_argument("--airplane-types", type=int, default=12)
+        parser.add_argument("--airplanes", type=int, default=2000)
+        parser.add_argument("--crew", type=int, default=10000)
+        parser.add_argument("--flights", type=int, default=100000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=10000,
+            help="Order owners to create; 0 uses the existing users.",
+        )
+        parser.add_argument(
+            "--hub-skew",
+            type=float,
+            default=1.0,
+            help="Zipf exponent of airport traffic; 0 spreads it evenly.",
+        )
+        parser.add_argument(
+            "--load-factor",
+            type=float,
+            default=0.8,
+            help="Mean share of seats sold per flight.",
+        )
+        parser.add_argument(
+            "--party-size",
+            type=float,
+            default=1.6,
+            help="Mean number of tickets per order.",
+        )
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="First departure date (YYYY-MM-DD), defaults to today.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Number of days departures are spread over.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=SYNTHETIC_CHUNK_SIZE,
+            help="Rows per insert.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        started = time.monotonic()
+        try:
+            counts = DatasetGenerator(
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+                hub_skew=options["hub_skew"],
+                load_factor=options["load_factor"],
+                party_size=options["party_size"],
+                start=options["start"],
+                days=options["days"],
+                progress=self.stdout.write,
+            ).generate(
+                airports=options["airports"],
+                routes=options["routes"],
+                airplane_types=options["airplane_types"],
+                airplanes=options["airplanes"],
+                crew=options["crew"],
+                flights=options["flights"],
+                users=options["users"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        # Rows were written without signals.
+        bump_model_version(*(apps.get_model(label) for label in counts))
+
+        elapsed = time.monotonic() - started
+        total = sum(counts.values())
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total} row(s) in {elapsed:.1f}s "
+                f"({total / max(elapsed, 1e-6):,.0f} rows/s)."
+            )
+        )
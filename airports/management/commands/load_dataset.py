@@ -0,0 +1,120 @@
+import os
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from airports.models import Airport, DatasetLoad, Route
+from config.dataset import (
+    DATASET_BATCH_SIZE,
+    DatasetLoader,
+    fingerprint,
+    restore_snapshot,
+)
+from config.versioning import bump_model_version
+from flights.models import Flight
+from flights.seat_map import invalidate_seat_maps
+from orders.models import Ticket
+
+
+class Command(BaseCommand):
+    """Django command to load a dataset in bulk, once."""
+
+    help = (
+        "Load a dumpdata JSON file (optionally gzipped) with bulk inserts, "
+        "or restore a dump_snapshot file with --snapshot. A file that was "
+        "already applied is skipped unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default="exported_data.json",
+            help="Dataset or snapshot file.",
+        )
+        parser.add_argument(
+            "--snapshot",
+            action="store_true",
+            help="The file is a snapshot; replace the tables it contains.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Load even if this file was already applied.",
+        )
+        parser.add_argument(
+            "-e",
+            "--exclude",
+            action="append",
+            default=[],
+            help="App label or app_label.ModelName to skip (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DATASET_BATCH_SIZE,
+            help="Rows per insert batch.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        path = options["path"]
+        if not os.path.isfile(path):
+            raise CommandError(f"No such file: {path}")
+
+        digest = fingerprint(
+            path,
+            "snapshot" if options["snapshot"] else "dataset",
+            sorted(options["exclude"]),
+        )
+        if (
+            not options["force"]
+            and DatasetLoad.objects.filter(fingerprint=digest).exists()
+        ):
+            self.stdout.write(f"{path} is already loaded, skipping.")
+            return
+
+        try:
+            with transaction.atomic():
+                if options["snapshot"]:
+                    counts = restore_snapshot(path)
+                else:
+                    counts = DatasetLoader(
+                        batch_size=options["batch_size"],
+                        exclude=options["exclude"],
+                    ).load(path)
+                self.after_load(
+                    [apps.get_model(label) for label in counts],
+                    reconcile=not options["snapshot"],
+                )
+                DatasetLoad.objects.update_or_create(
+                    fingerprint=digest,
+                    defaults={
+                        "name": os.path.basename(path),
+                        "rows": sum(counts.values()),
+                    },
+                )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        for label, count in counts.items():
+            self.stdout.write(f"{label}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {sum(counts.values())} row(s) from {path}."
+            )
+        )
+
+    def after_load(self, models, reconcile):
+        """Bring derived data and caches in line with the loaded rows."""
+        if Flight in models or Ticket in models:
+            if reconcile:
+                # Datasets carry tickets but not the seats_sold counters.
+                call_command("reconcile_seats_sold", stdout=StringIO())
+            invalidate_seat_maps(Flight.objects.values_list("id", flat=True))
+        # Rows were written without signals; Route and Airport versions
+        # also key the flight search cache.
+        bump_model_version(*set(models) | {Route, Airport})
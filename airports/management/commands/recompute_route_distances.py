@@ -0,0 +1,89 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from airports.geo import haversine
+from airports.models import Route
+from config.versioning import bump_model_version
+
+
+class Command(BaseCommand):
+    """Django command to recompute Route.distance from coordinates."""
+
+    help = (
+        "Recompute great-circle distances (km) of all routes whose "
+        "airports have coordinates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many routes would change.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per UPDATE statement.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        rows = np.array(
+            list(
+                Route.objects.filter(
+                    source__latitude__isnull=False,
+                    source__longitude__isnull=False,
+                    destination__latitude__isnull=False,
+                    destination__longitude__isnull=False,
+                )
+                .order_by()
+                .values_list(
+                    "id",
+                    "distance",
+                    "source__latitude",
+                    "source__longitude",
+                    "destination__latitude",
+                    "destination__longitude",
+                )
+            ),
+            dtype=np.float64,
+        ).reshape(-1, 6)
+
+        distances = np.rint(
+            haversine(rows[:, 2], rows[:, 3], rows[:, 4], rows[:, 5])
+        ).astype(np.int64)
+        changed = np.flatnonzero(distances != rows[:, 1].astype(np.int64))
+
+        if options["dry_run"]:
+            self.stdout.write(
+                f"{len(changed)} of {len(rows)} routes would be updated."
+            )
+            return
+
+        now = timezone.now()
+        routes = [
+            Route(id=route_id, distance=distance, updated_at=now)
+            for route_id, distance in zip(
+                rows[changed, 0].astype(np.int64).tolist(),
+                distances[changed].tolist(),
+                strict=True,
+            )
+        ]
+        with transaction.atomic():
+            Route.objects.bulk_update(
+                routes,
+                ["distance", "updated_at"],
+                batch_size=options["batch_size"]
+            )
+            if routes:
+                # bulk_update bypasses the post_save version bump.
+                bump_model_version(Route)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {len(routes)} of {len(rows)} route distances."
+            )
+        )
@@ -0,0 +1,16 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Enable pg_trgm before any airport table or index is created.
+
+    TrigramExtension is a no-op on non-PostgreSQL backends.
+    """
+
+    dependencies = []
+
+    operations = [
+        TrigramExtension(),
+    ]
@@ -1,16 +1,76 @@
+from django.core.validators import (
+    MaxValueValidator,
+    MinValueValidator,
+    RegexValidator,
+)
 from django.db import models
 
+from airports.geo import encode_geohash
+from airports.indexes import TrigramIndex
+
 
 class Airport(models.Model):
     name = models.CharField(max_length=255)
     closest_big_city = models.CharField(max_length=255)
+    iata_code = models.CharField(
+        max_length=3,
+        unique=True,
+        null=True,
+        blank=True,
+        validators=[RegexValidator(r"^[A-Za-z0-9]{3}$")]
+    )
+    icao_code = models.CharField(
+        max_length=4,
+        unique=True,
+        null=True,
+        blank=True,
+        validators=[RegexValidator(r"^[A-Za-z0-9]{4}$")]
+    )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    geohash = models.CharField(max_length=12, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name", "id"], name="airport_name_id_idx"),
+            TrigramIndex("name", name="airport_name_trgm_idx"),
+            # Pattern ops let Postgres use the index for prefix LIKE.
+            models.Index(
+                fields=["geohash"],
+                name="airport_geohash_idx",
+                opclasses=["varchar_pattern_ops"]
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.closest_big_city})"
 
+    def save(self, *args, **kwargs):
+        # Codes are stored upper-cased, and NULL rather than "" so that
+        # airports without a code do not collide on the unique index.
+        self.iata_code = (self.iata_code or "").upper() or None
+        self.icao_code = (self.icao_code or "").upper() or None
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and (
+            {"latitude", "longitude"} & set(update_fields)
+        ):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
 
 class Route(models.Model):
     source = models.ForeignKey(
@@ -24,9 +84,28 @@ class Route(models.Model):
         related_name="destination_routes"
     )
     distance = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["source", "destination"]
+        indexes = [
+            models.Index(
+                fields=["source", "destination", "id"],
+                name="route_source_destination_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.source} -> {self.destination} ({self.distance} km)"
+
+
+class DatasetLoad(models.Model):
+    """A dataset or snapshot applied by the load_dataset command."""
+
+    fingerprint = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)
+    rows = models.PositiveBigIntegerField(default=0)
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.loaded_at})"
@@ -0,0 +1,104 @@
+from functools import reduce
+from operator import or_
+
+import numpy as np
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Upper
+
+from airports.codes import resolve_airport_code
+from airports.geo import covering_cells, haversine
+from airports.models import Airport
+
+AIRPORT_MATCH_LIMIT = 20
+
+
+def match_airports(term: str) -> QuerySet:
+    """
+    Airports whose name matches `term`, best matches first.
+
+    On PostgreSQL substring and trigram-similar names (so typos still
+    match) are ranked by similarity using the trigram index. Other
+    backends fall back to a plain case-insensitive substring match.
+    """
+    if connection.vendor != "postgresql":
+        return Airport.objects.filter(name__icontains=term).order_by("name")
+
+    term = term.upper()
+    return (
+        Airport.objects.annotate(
+            name_upper=Upper("name"),
+            similarity=TrigramSimilarity(Upper("name"), term),
+        )
+        .filter(
+            Q(name_upper__contains=term) | Q(name_upper__trigram_similar=term)
+        )
+        .order_by("-similarity", "name")
+    )
+
+
+def airport_lookup(field: str, value: str) -> Q:
+    """
+    Route filter on `field` ("source" or "destination") for an airport
+    given as an IATA/ICAO code or, failing that, as a name.
+
+    Codes resolve through the in-process code map to a plain id filter,
+    so the common case needs no airport join.
+    """
+    airport_id = resolve_airport_code(value)
+    if airport_id is not None:
+        return Q(**{f"{field}_id": airport_id})
+    return Q(
+        **{
+            f"{field}__in": match_airports(value).values("id")[
+                :AIRPORT_MATCH_LIMIT
+            ]
+        }
+    )
+
+
+def airports_within(
+    latitude: float, longitude: float, radius_km: float, limit: int = 20
+) -> list[dict]:
+    """
+    Airports within radius_km of a point, nearest first.
+
+    Candidates come from geohash prefix lookups on the cells covering the
+    circle; exact distances are then computed with one vectorized
+    haversine pass over the candidates.
+    """
+    queryset = Airport.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    )
+    cells = covering_cells(latitude, longitude, radius_km)
+    if cells:
+        queryset = queryset.filter(
+            reduce(or_, (Q(geohash__startswith=cell) for cell in cells))
+        )
+
+    rows = list(
+        queryset.order_by().values_list(
+            "id", "name", "closest_big_city", "latitude", "longitude"
+        )
+    )
+    if not rows:
+        return []
+
+    coordinates = np.array([row[3:] for row in rows], dtype=np.float64)
+    distances = haversine(
+        latitude, longitude, coordinates[:, 0], coordinates[:, 1]
+    )
+    inside = np.flatnonzero(distances <= radius_km)
+    nearest = inside[np.argsort(distances[inside], kind="stable")][:limit]
+    return [
+        {
+            "id": rows[index][0],
+            "name": rows[index][1],
+            "closest_big_city": rows[index][2],
+            "latitude": rows[index][3],
+            "longitude": rows[index][4],
+            "distance": round(float(distances[index]), 1),
+        }
+        for index in nearest.tolist()
+    ]
@@ -9,7 +9,41 @@ from airports.models import (
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ["id", "name", "closest_big_city"]
+        fields = [
+            "id",
+            "name",
+            "closest_big_city",
+            "iata_code",
+            "icao_code",
+            "latitude",
+            "longitude",
+        ]
+
+    def to_internal_value(self, data):
+        # Upper-case codes before the unique validators see them.
+        codes = {
+            field: data[field].upper()
+            for field in ("iata_code", "icao_code")
+            if isinstance(data.get(field), str)
+        }
+        if codes:
+            data = data.copy()
+            for field, code in codes.items():
+                data[field] = code
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        latitude = attrs.get(
+            "latitude", getattr(self.instance, "latitude", None)
+        )
+        longitude = attrs.get(
+            "longitude", getattr(self.instance, "longitude", None)
+        )
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                "Latitude and longitude must be set together."
+            )
+        return attrs
 
 
 class AirportListSerializer(AirportSerializer):
@@ -32,6 +66,10 @@ class AirportDetailSerializer(AirportSerializer):
             "id",
             "name",
             "closest_big_city",
+            "iata_code",
+            "icao_code",
+            "latitude",
+            "longitude",
             "source_routes",
             "destination_routes"
         ]
@@ -65,3 +103,12 @@ class RouteDetailSerializer(RouteSerializer):
             "distance",
             "flights"
         ]
+
+
+class AirportNearbySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(
+        min_value=0, max_value=20000, default=100
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from airports.models import Airport, Route
+from config.versioning import bump_model_version
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+def bump_airport_version(sender, **kwargs):
+    bump_model_version(Airport)
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def bump_route_version(sender, **kwargs):
+    bump_model_version(Route)
@@ -1,26 +1,42 @@
 from django.db.models import Prefetch
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
+from airports.autocomplete import get_autocomplete_index
+from airports.distances import get_distance_matrix
 from airports.models import (
     Airport,
     Route
 )
+from airports.search import airport_lookup, airports_within
 from airports.serializers import (
     AirportSerializer,
     AirportListSerializer,
     AirportDetailSerializer,
+    AirportNearbySerializer,
     RouteSerializer,
     RouteListSerializer,
     RouteDetailSerializer,
 )
+from config.caching import CachedResponseMixin
+from config.conditional import ConditionalGetMixin
+from config.pagination import KeysetPagination
 from config.permissions import IsAdminOrIfAuthenticatedReadOnly
 from flights.models import Flight
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
     permission_classes = [IsAdminOrIfAuthenticatedReadOnly]
+    pagination_class = KeysetPagination
+    pagination_ordering = ["name", "id"]
+    cache_models = [Airport, Route]
+    etag_models = [Route]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -46,14 +62,103 @@ class AirportViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    @action(detail=False, methods=["get"], url_path="autocomplete")
+    def autocomplete(self, request):
+        """
+        Top airports whose name, city or one of their words starts with q.
 
-class RouteViewSet(viewsets.ModelViewSet):
+        Served from an in-process prefix index, without database queries.
+        """
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            raise ValidationError(
+                {"limit": "A valid integer is required."}
+            ) from None
+        return Response(
+            get_autocomplete_index().search(
+                request.query_params.get("q", ""),
+                limit=max(limit, 1)
+            )
+        )
+
+    @action(detail=False, methods=["get"], url_path="nearby")
+    def nearby(self, request):
+        """Airports within radius km of (lat, lon), nearest first"""
+        search = AirportNearbySerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+        return Response(
+            airports_within(
+                params["lat"],
+                params["lon"],
+                params["radius"],
+                limit=params["limit"],
+            )
+        )
+
+    @action(detail=False, methods=["get"], url_path="distances")
+    def distances(self, request):
+        """
+        Shortest network distance from source to destination (km), or to
+        every reachable airport when destination is omitted.
+
+        Read from the matrix written by the build_distance_matrix command;
+        `stale` is true when routes changed since it was built.
+        """
+        params = {}
+        for name in ("source", "destination"):
+            value = request.query_params.get(name)
+            if value is None:
+                continue
+            try:
+                params[name] = int(value)
+            except ValueError:
+                raise ValidationError(
+                    {name: "A valid integer is required."}
+                ) from None
+        if "source" not in params:
+            raise ValidationError({"source": "This parameter is required."})
+
+        matrix = get_distance_matrix()
+        if "destination" in params:
+            return Response(
+                {
+                    "source": params["source"],
+                    "destination": params["destination"],
+                    "distance": matrix.distance(
+                        params["source"], params["destination"]
+                    ),
+                    "stale": matrix.is_stale(),
+                }
+            )
+        return Response(
+            {
+                "source": params["source"],
+                "distances": matrix.distances_from(params["source"]),
+                "stale": matrix.is_stale(),
+            }
+        )
+
+
+class RouteViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     serializer_class = RouteSerializer
     permission_classes = [IsAdminOrIfAuthenticatedReadOnly]
+    pagination_class = KeysetPagination
+    pagination_ordering = ["source_id", "destination_id", "id"]
+    cache_models = [Route, Airport, Flight]
+    etag_models = [Airport, Flight]
 
     def get_queryset(self):
         queryset = Route.objects.select_related("source", "destination")
 
+        for param in ("source", "destination"):
+            value = self.request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(airport_lookup(param, value))
+
         if self.action == "retrieve":
             queryset = queryset.prefetch_related(
                 Prefetch(
@@ -0,0 +1,91 @@
+"""
+Compare two endpoint benchmark result files.
+
+The files are written by the endpoint benchmark suite, e.g.:
+
+    BENCHMARK_RESULTS=before.json python manage.py test \\
+        tests.test_benchmarks
+    # ...change the code...
+    BENCHMARK_RESULTS=after.json python manage.py test \\
+        tests.test_benchmarks
+
+    python benchmarks/compare.py before.json after.json --threshold 20
+
+Prints every metric per endpoint with its relative change and exits
+with status 1 when a query count grew or a latency or memory figure
+grew by more than --threshold percent.
+
+Only the standard library is used, so it runs from any checkout.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ["queries", "p50_ms", "p99_ms", "memory_kb"]
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["endpoints"]
+
+
+def change(before, after):
+    if not before:
+        return 0.0 if not after else float("inf")
+    return (after - before) / before * 100
+
+
+def compare(before, after, threshold):
+    """Yield (endpoint, metric, before, after, change %, regressed)."""
+    for name in sorted(before.keys() | after.keys()):
+        old, new = before.get(name), after.get(name)
+        if old is None or new is None:
+            yield name, None, old, new, None, False
+            continue
+        for metric in METRICS:
+            percent = change(old[metric], new[metric])
+            regressed = (
+                new[metric] > old[metric]
+                if metric == "queries"
+                else percent > threshold
+            )
+            yield name, metric, old[metric], new[metric], percent, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=20.0,
+        help="Allowed latency and memory growth in percent.",
+    )
+    args = parser.parse_args()
+
+    regressions = 0
+    print(
+        f"{'endpoint':<36} {'metric':<10} {'before':>10} {'after':>10} "
+        f"{'change':>8}"
+    )
+    for name, metric, old, new, percent, regressed in compare(
+        load(args.before), load(args.after), args.threshold
+    ):
+        if metric is None:
+            side = "after" if old is None else "before"
+            print(f"{name:<36} only in {side}")
+            continue
+        regressions += regressed
+        print(
+            f"{name:<36} {metric:<10} {old:>10} {new:>10} "
+            f"{percent:>+7.1f}%" + ("  !" if regressed else "")
+        )
+    if regressions:
+        print(f"{regressions} regression(s).")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Concurrent slow-client benchmark for the WSGI and ASGI serving paths.
+
+Opens --concurrency connections at once; each client trickles its
+request headers over --slow seconds (a slow mobile client), then reads
+the whole response. Thread-per-request servers can serve only as many
+such clients at once as they have threads, an event loop serves all of
+them. Run two servers side by side and compare, e.g.:
+
+    gunicorn -c gunicorn.conf.py -b 0.0.0.0:8000
+    GUNICORN_WORKER_CLASS=gthread GUNICORN_APP=config.wsgi:application \\
+        gunicorn -c gunicorn.conf.py -b 0.0.0.0:8001
+
+    python benchmarks/concurrency.py --token <access token> \\
+        --target wsgi=http://localhost:8001/api/flights/list-flights/ \\
+        --target asgi=http://localhost:8000/api/flights/async/list-flights/
+
+Only the standard library is used, so it runs from any checkout.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch(url, token, slow, timeout):
+    """Return (status, seconds) for one request over a new connection."""
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    started = time.perf_counter()
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(parts.hostname, parts.port or 80), timeout
+    )
+    try:
+        lines = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {parts.netloc}",
+            "Accept: application/json",
+            "Connection: close",
+        ]
+        if token:
+            lines.append(f"Authorization: Bearer {token}")
+        for line in lines:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+            await asyncio.sleep(slow / len(lines))
+        writer.write(b"\r\n")
+        await writer.drain()
+
+        response = await asyncio.wait_for(reader.read(), timeout)
+        status = int(response.split(b" ", 2)[1]) if response else 0
+    finally:
+        writer.close()
+    return status, time.perf_counter() - started
+
+
+async def run(url, token, concurrency, rounds, slow, timeout):
+    async def client():
+        results = []
+        for _ in range(rounds):
+            try:
+                results.append(await fetch(url, token, slow, timeout))
+            except (OSError, asyncio.TimeoutError, ValueError):
+                results.append((0, None))
+        return results
+
+    started = time.perf_counter()
+    batches = await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return [result for batch in batches for result in batch], elapsed
+
+
+def summarize(name, results, elapsed):
+    latencies = sorted(
+        seconds for status, seconds in results if status == 200
+    )
+    errors = len(results) - len(latencies)
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100)
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else float("nan")
+    return (
+        f"{name:<10} {len(latencies):>8} {errors:>7} "
+        f"{len(latencies) / elapsed:>9.1f} "
+        f"{p50 * 1000:>9.0f} {p95 * 1000:>9.0f} {p99 * 1000:>9.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        metavar="NAME=URL",
+        help="Endpoint to load; repeat to compare several.",
+    )
+    parser.add_argument("--token", help="JWT access token.")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument(
+        "--rounds", type=int, default=2, help="Requests per client."
+    )
+    parser.add_argument(
+        "--slow",
+        type=float,
+        default=1.0,
+        help="Seconds each client takes to send its request.",
+    )
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    print(
+        f"{'target':<10} {'ok':>8} {'errors':>7} {'req/s':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    )
+    for target in args.target:
+        name, _, url = target.partition("=")
+        results, elapsed = asyncio.run(
+            run(
+                url,
+                args.token,
+                args.concurrency,
+                args.rounds,
+                args.slow,
+                args.timeout,
+            )
+        )
+        print(summarize(name, results, elapsed))
+
+
+if __name__ == "__main__":
+    main()
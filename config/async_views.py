@@ -0,0 +1,97 @@
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+class AsyncAPIView(View):
+    """
+    Async view for hot endpoints served over ASGI.
+
+    DRF views are synchronous, so under ASGI each request holds a thread
+    for its whole duration. These views await the async ORM instead and
+    only hop to a thread for authentication and throttling (usually
+    served from per-process caches). They reuse the DRF request, the
+    default authenticators and throttles and answer in DRF's JSON and
+    error format; handlers return the response data, or an HttpResponse.
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    throttle_scope = None
+    renderer = JSONRenderer()
+
+    def check_request(self, request):
+        """Authenticate and throttle; runs in a worker thread."""
+        if not (request.user and request.user.is_authenticated):
+            raise exceptions.NotAuthenticated()
+        self.check_throttles(request)
+
+    def check_throttles(self, request):
+        for throttle in (throttle() for throttle in self.throttle_classes):
+            if not throttle.allow_request(request, self):
+                raise exceptions.Throttled(throttle.wait())
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        if method not in self.http_method_names or not hasattr(self, method):
+            return await self.http_method_not_allowed(
+                request, *args, **kwargs
+            )
+        if request.method == "OPTIONS":
+            return await self.options(request, *args, **kwargs)
+
+        self.request = request = Request(
+            request,
+            parsers=[parser() for parser in self.parser_classes],
+            authenticators=[auth() for auth in self.authentication_classes],
+        )
+        try:
+            await sync_to_async(self.check_request)(request)
+            handler = getattr(self, method)
+            data = await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+        if isinstance(data, HttpResponse):
+            return data
+        return self.render(data)
+
+    def render(self, data, status=200, headers=None):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            headers=headers,
+            content_type="application/json",
+        )
+
+    def handle_exception(self, request, exc):
+        headers = {}
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            if request.authenticators:
+                header = request.authenticators[0].authenticate_header(
+                    request
+                )
+                if header:
+                    headers["WWW-Authenticate"] = header
+                else:
+                    exc.status_code = 403
+        if getattr(exc, "wait", None):
+            headers["Retry-After"] = str(int(exc.wait))
+
+        data = exc.detail
+        if not isinstance(data, (dict, list)):
+            data = {"detail": data}
+        return self.render(data, exc.status_code, headers)
+
+
+class AsyncReadView(AsyncAPIView):
+    """Read-only AsyncAPIView for authenticated GET endpoints."""
+
+    http_method_names = ["get", "head", "options"]
@@ -0,0 +1,82 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from config.versioning import model_version
+
+RESPONSE_CACHE_KEY = "response:{}"
+
+
+class CachedResponseMixin:
+    """
+    Serve list/retrieve responses as cached rendered bytes.
+
+    The key covers the absolute URL (query string included), the
+    negotiated media type and the current version of every model in
+    `cache_models`, so a save or delete of any of them in any process
+    switches readers to fresh keys; stale entries simply expire.
+    Permissions and throttling still run on every request. The browsable
+    API is never cached because its page depends on the user.
+    """
+
+    cache_models = []
+    cache_alias = "default"
+
+    def get_cache_models(self):
+        return self.cache_models
+
+    def _response_cache_key(self, request):
+        versions = ":".join(
+            f"{model._meta.label_lower}={model_version(model)}"
+            for model in self.get_cache_models()
+        )
+        raw = "|".join(
+            [
+                request.build_absolute_uri(),
+                request.accepted_media_type,
+                versions,
+            ]
+        )
+        return RESPONSE_CACHE_KEY.format(
+            hashlib.sha256(raw.encode()).hexdigest()
+        )
+
+    def _cached_response(self, request, handler, *args, **kwargs):
+        if request.accepted_renderer.format == "api":
+            return handler(request, *args, **kwargs)
+
+        cache = caches[self.cache_alias]
+        key = self._response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Response-Cache"] = "hit"
+            return response
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 3600)
+
+            def store(rendered):
+                cache.set(
+                    key,
+                    (rendered.content, rendered["Content-Type"]),
+                    timeout
+                )
+
+            response.add_post_render_callback(store)
+            response["X-Response-Cache"] = "miss"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(
+            request, super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(
+            request, super().retrieve, *args, **kwargs
+        )
@@ -0,0 +1,95 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from config.versioning import field_version, model_version
+
+
+class ConditionalGetMixin:
+    """
+    Answer If-None-Match / If-Modified-Since on list and retrieve with
+    304 before anything is serialized.
+
+    Lists are tagged with the full path (query string included) and the
+    versions of the listed model and of `etag_models`, so the tag costs
+    no query and any save, delete or counter update of those models
+    changes it. Details are tagged with the object's own updated_at.
+    Versions of `etag_models` cover related rows shown in the payload
+    (airport names on a flight, say); `etag_fields` lists (model, field)
+    counters updated without a model version bump. Lists only carry an
+    ETag: model versions say nothing about when a row last changed. An
+    ETag already set by an inner cache layer (stored with its entry) is
+    kept.
+    """
+
+    etag_models = []
+    etag_fields = []
+
+    def _etag(self, request, *parts):
+        raw = "|".join(
+            [
+                self.basename,
+                request.accepted_media_type,
+                *(str(part) for part in parts),
+                *(str(model_version(model)) for model in self.etag_models),
+                *(
+                    str(field_version(model, field))
+                    for model, field in self.etag_fields
+                ),
+            ]
+        )
+        return quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+    def _conditional(
+        self, request, handler, etag, last_modified, *args, **kwargs
+    ):
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response.setdefault("ETag", etag)
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get_object(self):
+        # retrieve() looks the object up once for its tag and once more
+        # in the parent implementation; reuse the first lookup.
+        if getattr(self, "_conditional_object", None) is None:
+            self._conditional_object = super().get_object()
+        return self._conditional_object
+
+    def get_list_etag(self, request) -> str:
+        model = getattr(self.queryset, "model", None)
+        if model is None:
+            model = self.get_serializer_class().Meta.model
+        return self._etag(
+            request, "list", request.get_full_path(), model_version(model)
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(
+            request,
+            super().list,
+            self.get_list_etag(request),
+            None,
+            *args,
+            **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self._etag(
+            request, "detail", instance.pk, instance.updated_at.isoformat()
+        )
+        return self._conditional(
+            request,
+            super().retrieve,
+            etag,
+            int(instance.updated_at.timestamp()),
+            *args,
+            **kwargs
+        )
@@ -0,0 +1,474 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+from contextlib import contextmanager
+from itertools import islice
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+DATASET_BATCH_SIZE = 5000
+READ_SIZE = 64 * 1024
+# Bumped whenever loading semantics change, so old fingerprints reload.
+LOADER_VERSION = 1
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_MANIFEST = "manifest.json"
+COPY_OPTIONS = "(FORMAT csv, NULL '\\N')"
+
+
+def open_dataset(path, mode="rt"):
+    """Open a JSON dataset, transparently decompressing `.gz` files."""
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def fingerprint(path, *extra) -> str:
+    """SHA-256 of a file's bytes and of anything else that affects loading."""
+    digest = hashlib.sha256(
+        json.dumps([LOADER_VERSION, *extra], default=str).encode()
+    )
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_json_array(fileobj):
+    """
+    Yield the elements of a top-level JSON array as they are read, so a
+    dump larger than memory can be loaded.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof, started = "", 0, False, False
+
+    while True:
+        separators = " \t\r\n," if started else " \t\r\n"
+        while pos < len(buffer) and buffer[pos] in separators:
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of dataset.")
+            chunk = fileobj.read(READ_SIZE)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("A dataset must be a JSON array.")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Most likely an object cut off at the end of the buffer.
+            chunk = fileobj.read(READ_SIZE)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+            continue
+        pos = end
+        yield obj
+
+
+def sort_models(models) -> list:
+    """
+    Order models so that each comes after the models its foreign keys
+    point to. Self references and cycles are left to the deferred
+    constraint checks of the load transaction.
+    """
+    models = set(models)
+    ordered, visiting = [], set()
+
+    def visit(model):
+        if model in ordered or model in visiting:
+            return
+        visiting.add(model)
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if related in models and related is not model:
+                visit(related)
+        visiting.discard(model)
+        ordered.append(model)
+
+    for model in sorted(models, key=lambda model: model._meta.label):
+        visit(model)
+    return ordered
+
+
+def _batches(lines, size):
+    lines = iter(lines)
+    while batch := [json.loads(line) for line in islice(lines, size)]:
+        yield batch
+
+
+def _auto_date_fields(model):
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+        or getattr(field, "auto_now_add", False)
+    ]
+
+
+@contextmanager
+def raw_dates(model):
+    """Let bulk_create() store auto_now(_add) values from the dataset."""
+    fields = _auto_date_fields(model)
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(
+            fields, flags, strict=True
+        ):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class DatasetLoader:
+    """
+    Load a Django JSON fixture (as written by dumpdata) in bulk.
+
+    The file is parsed as a stream and its rows are spooled per model to
+    temporary files; models are then written in foreign key order in
+    batches, through COPY into a temporary table and one upserting
+    INSERT on PostgreSQL and through bulk_create() elsewhere. Like
+    loaddata, rows are stored as they are in the dataset (save() and
+    signals are not run) and existing rows with the same primary key are
+    overwritten. Everything happens in one transaction.
+    """
+
+    def __init__(
+        self,
+        using=DEFAULT_DB_ALIAS,
+        batch_size=DATASET_BATCH_SIZE,
+        exclude=(),
+    ):
+        self.using = using
+        self.connection = connections[using]
+        self.batch_size = batch_size
+        self.exclude = set(exclude)
+        self.counts = {}
+
+    def _excluded(self, model) -> bool:
+        return (
+            model._meta.app_label in self.exclude
+            or model._meta.label in self.exclude
+            or model._meta.label_lower in self.exclude
+        )
+
+    def load(self, path) -> dict:
+        """Load a dataset file; returns the number of rows per model."""
+        with tempfile.TemporaryDirectory() as spool_dir:
+            with open_dataset(path) as f:
+                spools = self._spool(iter_json_array(f), spool_dir)
+            with transaction.atomic(using=self.using):
+                m2m = {}
+                for model in sort_models(spools):
+                    with open(spools[model], encoding="utf-8") as rows:
+                        self._load_model(model, rows, m2m, spool_dir)
+                for (through, source, target), path in m2m.items():
+                    with open(path, encoding="utf-8") as rows:
+                        self._load_m2m(through, source, target, rows)
+                reset_sequences(self.using, spools)
+        return self.counts
+
+    def _spool(self, objects, spool_dir) -> dict:
+        paths, files = {}, {}
+        try:
+            for obj in objects:
+                model = apps.get_model(obj["model"])
+                if self._excluded(model):
+                    continue
+                if model not in files:
+                    paths[model] = os.path.join(
+                        spool_dir, f"{model._meta.label_lower}.ndjson"
+                    )
+                    files[model] = open(paths[model], "w", encoding="utf-8")
+                files[model].write(json.dumps(obj))
+                files[model].write("\n")
+        finally:
+            for spool in files.values():
+                spool.close()
+        return paths
+
+    def _load_model(self, model, rows, m2m, spool_dir):
+        now = timezone.now()
+        auto_dates = _auto_date_fields(model)
+        m2m_files = {}
+        try:
+            for batch in _batches(rows, self.batch_size):
+                objects = []
+                for deserialized in serializers.deserialize(
+                    "python",
+                    batch,
+                    using=self.using,
+                    ignorenonexistent=True,
+                ):
+                    obj = deserialized.object
+                    for field in auto_dates:
+                        # Rows dumped before the field existed.
+                        if getattr(obj, field.attname) is None:
+                            setattr(obj, field.attname, now)
+                    objects.append(obj)
+                    for name, values in (deserialized.m2m_data or {}).items():
+                        key = self._m2m_key(model, name)
+                        if key not in m2m_files:
+                            m2m[key] = os.path.join(
+                                spool_dir,
+                                f"{key[0]._meta.label_lower}.m2m.ndjson",
+                            )
+                            m2m_files[key] = open(
+                                m2m[key], "w", encoding="utf-8"
+                            )
+                        m2m_files[key].write(
+                            json.dumps([obj.pk, list(values)], default=str)
+                        )
+                        m2m_files[key].write("\n")
+                self._write(model, objects)
+                self.counts[model._meta.label] = (
+                    self.counts.get(model._meta.label, 0) + len(objects)
+                )
+        finally:
+            for spool in m2m_files.values():
+                spool.close()
+
+    @staticmethod
+    def _m2m_key(model, name):
+        field = model._meta.get_field(name)
+        through = field.remote_field.through
+        return (
+            through,
+            through._meta.get_field(field.m2m_field_name()).attname,
+            through._meta.get_field(field.m2m_reverse_field_name()).attname,
+        )
+
+    def _write(self, model, objects):
+        if self.connection.vendor == "postgresql":
+            self._copy_upsert(model, objects)
+            return
+
+        pk = model._meta.pk
+        update_fields = [
+            field.name
+            for field in model._meta.concrete_fields
+            if not field.primary_key and not field.generated
+        ]
+        with raw_dates(model):
+            model._default_manager.using(self.using).bulk_create(
+                objects,
+                batch_size=self.batch_size,
+                update_conflicts=bool(update_fields),
+                ignore_conflicts=not update_fields,
+                unique_fields=[pk.name] if update_fields else None,
+                update_fields=update_fields or None,
+            )
+
+    def _copy_upsert(self, model, objects):
+        connection = self.connection
+        quote = connection.ops.quote_name
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if not field.generated
+        ]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objects:
+            writer.writerow(
+                [
+                    "\\N" if value is None else value
+                    for value in (
+                        field.get_db_prep_save(
+                            getattr(obj, field.attname), connection
+                        )
+                        for field in fields
+                    )
+                ]
+            )
+        buffer.seek(0)
+
+        table = quote(model._meta.db_table)
+        staging = quote(f"dataset_{model._meta.db_table}")
+        columns = ", ".join(quote(field.column) for field in fields)
+        updates = ", ".join(
+            f"{quote(field.column)} = EXCLUDED.{quote(field.column)}"
+            for field in fields
+            if not field.primary_key
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            cursor.execute(f"TRUNCATE {staging}")
+            cursor.copy_expert(
+                f"COPY {staging} ({columns}) FROM STDIN WITH {COPY_OPTIONS}",
+                buffer,
+            )
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM {staging} "
+                f"ON CONFLICT ({quote(model._meta.pk.column)}) "
+                + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING")
+            )
+
+    def _load_m2m(self, through, source, target, rows):
+        """Replace the relations of every loaded row with the dataset's."""
+        manager = through._default_manager.using(self.using)
+        for batch in _batches(rows, self.batch_size):
+            manager.filter(
+                **{f"{source}__in": [pk for pk, _ in batch]}
+            ).delete()
+            manager.bulk_create(
+                [
+                    through(**{source: pk, target: related})
+                    for pk, related_pks in batch
+                    for related in related_pks
+                ],
+                batch_size=self.batch_size,
+            )
+            self.counts[through._meta.label] = self.counts.get(
+                through._meta.label, 0
+            ) + sum(len(related_pks) for _, related_pks in batch)
+
+
+def reset_sequences(using, models):
+    """Move primary key sequences past rows inserted with explicit ids."""
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), list(models))
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def _require_postgresql(using):
+    if connections[using].vendor != "postgresql":
+        raise ValueError("Snapshots need a PostgreSQL database.")
+
+
+def dump_snapshot(path, models, using=DEFAULT_DB_ALIAS) -> dict:
+    """
+    Write `models` to a gzipped tar of one CSV per table (PostgreSQL COPY
+    format) plus a manifest, from one consistent read-only transaction.
+    Returns the number of rows per model.
+    """
+    _require_postgresql(using)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    models = sort_models(models)
+    manifest = {"format": SNAPSHOT_FORMAT, "tables": []}
+    counts = {}
+    # Only possible as the first statement of a new transaction.
+    isolate = not connection.in_atomic_block
+
+    with (
+        tempfile.TemporaryDirectory() as work_dir,
+        transaction.atomic(using=using),
+        connection.cursor() as cursor,
+    ):
+        if isolate:
+            cursor.execute(
+                "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+            )
+        for model in models:
+            fields = [
+                field
+                for field in model._meta.concrete_fields
+                if not field.generated
+            ]
+            columns = ", ".join(quote(field.column) for field in fields)
+            name = f"{model._meta.label_lower}.csv"
+            with open(os.path.join(work_dir, name), "w") as f:
+                cursor.copy_expert(
+                    f"COPY (SELECT {columns} "
+                    f"FROM {quote(model._meta.db_table)} "
+                    f"ORDER BY {quote(model._meta.pk.column)}) "
+                    f"TO STDOUT WITH {COPY_OPTIONS}",
+                    f,
+                )
+            counts[model._meta.label] = (
+                model._default_manager.using(using).count()
+            )
+            manifest["tables"].append(
+                {
+                    "model": model._meta.label,
+                    "columns": [field.column for field in fields],
+                    "file": name,
+                    "rows": counts[model._meta.label],
+                }
+            )
+
+        with tarfile.open(path, "w:gz") as tar:
+            data = json.dumps(manifest, indent=2).encode()
+            info = tarfile.TarInfo(SNAPSHOT_MANIFEST)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+            for table in manifest["tables"]:
+                tar.add(os.path.join(work_dir, table["file"]), table["file"])
+    return counts
+
+
+def restore_snapshot(path, using=DEFAULT_DB_ALIAS) -> dict:
+    """
+    Replace the contents of the snapshot's tables with its rows, streaming
+    each CSV straight into COPY. Tables with foreign keys to them are
+    emptied as well (TRUNCATE ... CASCADE). Returns the number of rows
+    per model.
+    """
+    _require_postgresql(using)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    counts = {}
+
+    with (
+        tarfile.open(path, "r|gz") as tar,
+        transaction.atomic(using=using),
+        connection.cursor() as cursor,
+    ):
+        member = tar.next()
+        if member is None or member.name != SNAPSHOT_MANIFEST:
+            raise ValueError("Not a snapshot: the manifest is missing.")
+        manifest = json.load(tar.extractfile(member))
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError("Unsupported snapshot format.")
+        tables = {table["file"]: table for table in manifest["tables"]}
+        models = [apps.get_model(table["model"]) for table in tables.values()]
+
+        # TRUNCATE refuses tables with pending deferred FK checks.
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(
+            "TRUNCATE "
+            + ", ".join(quote(model._meta.db_table) for model in models)
+            + " CASCADE"
+        )
+        cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+        for member in tar:
+            if member.name == SNAPSHOT_MANIFEST:
+                continue
+            table = tables[member.name]
+            model = apps.get_model(table["model"])
+            columns = ", ".join(quote(column) for column in table["columns"])
+            cursor.copy_expert(
+                f"COPY {quote(model._meta.db_table)} ({columns}) "
+                f"FROM STDIN WITH {COPY_OPTIONS}",
+                tar.extractfile(member),
+            )
+            counts[model._meta.label] = table["rows"]
+        reset_sequences(using, models)
+    return counts
@@ -0,0 +1,240 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the full view ordering.
+
+    The cursor stores the ordering values of the last (or first) row of
+    a page, and the next page is selected with a keyset predicate, so a
+    deep page costs the same as the first one and no COUNT(*) is run.
+    The last ordering field must be unique (usually the primary key).
+    Views set `pagination_ordering` or define `get_pagination_ordering()`.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("-id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view):
+        if hasattr(view, "get_pagination_ordering"):
+            return tuple(view.get_pagination_ordering())
+        return tuple(getattr(view, "pagination_ordering", self.ordering))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views, using the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.fields = self.get_ordering(view)
+        self.values, self.reverse = self.decode_cursor(request)
+        if self.values is not None:
+            self.values = self.clean_values(queryset.model, self.values)
+
+        ordering = self.fields
+        if self.reverse:
+            ordering = tuple(self.flip(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.values is not None:
+            queryset = queryset.filter(
+                self.keyset_filter(ordering, self.values)
+            )
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous = self.values is not None
+            self.has_next = has_more
+
+        self.page = results
+        return results
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def keyset_filter(ordering, values):
+        """
+        Build `(f1, f2, ...) > (v1, v2, ...)` for mixed directions.
+
+        The leading `f1 >= v1` bound is redundant but keeps the predicate
+        sargable on the composite index.
+        """
+        conditions = []
+        for position, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {
+                previous.lstrip("-"): values[index]
+                for index, previous in enumerate(ordering[:position])
+            }
+            conditions.append(
+                Q(**equal, **{f"{name}__{lookup}": values[position]})
+            )
+
+        first = ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & reduce(
+            or_, conditions
+        )
+
+    def get_values(self, obj):
+        values = []
+        for field in self.fields:
+            value = obj
+            for attribute in field.lstrip("-").split("__"):
+                value = getattr(value, attribute)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def encode_value(value):
+        # Keep full microsecond precision: keys must round-trip exactly.
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    def encode_cursor(self, obj, reverse):
+        payload = json.dumps(
+            {"v": self.get_values(obj), "r": reverse},
+            default=self.encode_value,
+            separators=(",", ":")
+        )
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values, reverse = payload["v"], bool(payload["r"])
+        # binascii.Error and UnicodeError are ValueErrors.
+        except (ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    @staticmethod
+    def get_model_field(model, path):
+        """The model field behind an ordering path, None for annotations."""
+        field = None
+        for name in path.split("__"):
+            if model is None:
+                return None
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            model = field.related_model
+        # Reverse relations have no to_python().
+        return field if field.concrete else None
+
+    def clean_values(self, model, values):
+        """Convert cursor values to the ordering fields' Python types."""
+        cleaned = []
+        for field, value in zip(self.fields, values, strict=True):
+            if value is None or isinstance(value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            model_field = self.get_model_field(model, field.lstrip("-"))
+            if model_field is not None:
+                try:
+                    value = model_field.to_python(value)
+                except ValidationError:
+                    raise NotFound(self.invalid_cursor_message) from None
+            cleaned.append(value)
+        return cleaned
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
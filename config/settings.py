@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "debug_toolbar",
     "rest_framework",
     "rest_framework_simplejwt",
@@ -55,13 +56,19 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "config.throttling.AnonTokenBucketThrottle",
+        "config.throttling.UserTokenBucketThrottle",
+        "config.throttling.ScopedTokenBucketThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "300/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "300/day",
+        "orders": "10/minute",
+        "flight_search": "60/minute",
+    },
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -69,8 +76,21 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_REFRESH_SERIALIZER":
+        "users.serializers.RevocableTokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER":
+        "users.serializers.RevocableTokenVerifySerializer",
 }
 
+SEAT_HOLD_TTL = timedelta(minutes=10)
+
+# Seconds an authenticated user is served from the per-process cache.
+USER_CACHE_TTL = 60
+
+DISTANCE_MATRIX_DIR = Path(
+    os.getenv("DISTANCE_MATRIX_DIR", BASE_DIR / "var" / "distances")
+)
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Airport Service API",
     "DESCRIPTION": "API service for airport and flight management",
@@ -128,6 +148,33 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Model versions and cached responses live here, so every worker process
+# must share it (file or redis) for writes to invalidate all of them.
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[os.getenv("CACHE_BACKEND", "locmem")],
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 3600))
+
+# Token buckets: "local" keeps them per process, "redis" shares them
+# between all workers.
+THROTTLE_STORE = os.getenv("THROTTLE_STORE", "local")
+THROTTLE_REDIS_URL = os.getenv(
+    "THROTTLE_REDIS_URL", os.getenv("CACHE_LOCATION", "")
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -164,6 +211,13 @@ USE_TZ = True
 
 AUTH_USER_MODEL = "users.User"
 
+AUTHENTICATION_BACKENDS = ["users.backends.PooledModelBackend"]
+
+# Processes per worker that hash passwords (0: in the request thread) and
+# how many hashing jobs may be running or waiting before logins get a 429.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 16))
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
@@ -0,0 +1,577 @@
+import calendar
+import csv
+import io
+from itertools import product
+from string import ascii_uppercase
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from airports.geo import encode_geohash, haversine
+from airports.models import Airport, Route
+from config.dataset import COPY_OPTIONS, raw_dates, reset_sequences
+from flights.models import Airplane, AirplaneType, Crew, Flight
+from orders.models import Order, Ticket
+
+SYNTHETIC_CHUNK_SIZE = 200_000
+CRUISE_SPEED_KMH = 800
+# Taxi, climb and descent on top of the cruise time.
+GROUND_MINUTES = 30
+SLOT_SECONDS = 5 * 60
+# Higher means load factors cluster more tightly around the mean.
+LOAD_FACTOR_CONCENTRATION = 20
+CREW_PER_FLIGHT = (2, 4)
+ORDER_LEAD_DAYS = (1 / 24, 90)
+LATITUDES = (-55.0, 70.0)
+
+SYLLABLES = [
+    "an", "bel", "bor", "ca", "dor", "fa", "gen", "ha", "ka", "lin",
+    "lo", "ma", "mir", "na", "no", "pol", "ra", "ri", "sa", "sta",
+    "ta", "tor", "va", "ve", "vi", "war", "za",
+]
+AIRPORT_SUFFIXES = ["International", "Airport", "Regional", "City"]
+AIRPLANE_TYPES = [
+    "Airbus A220", "Airbus A320", "Airbus A321", "Airbus A330",
+    "Airbus A350", "ATR 72", "Boeing 737", "Boeing 767", "Boeing 777",
+    "Boeing 787", "Embraer E175", "Embraer E195",
+]
+# (rows, seats_in_row) cabin layouts, from regional to wide-body.
+LAYOUTS = [
+    (18, 4), (22, 4), (25, 5), (28, 6), (31, 6), (33, 6), (36, 6),
+    (38, 7), (42, 8), (45, 9), (50, 10),
+]
+REGISTRATION_PREFIXES = ["D", "F", "G", "N", "SP", "UR"]
+FIRST_NAMES = [
+    "Anna", "Andrii", "Daria", "David", "Emma", "Ivan", "Jan", "Julia",
+    "Kateryna", "Lukas", "Maria", "Mark", "Olena", "Oleh", "Piotr",
+    "Sofia", "Taras", "Yana",
+]
+LAST_NAMES = [
+    "Bondarenko", "Kowalski", "Kravets", "Lysenko", "Melnyk", "Miller",
+    "Nowak", "Petrenko", "Schmidt", "Shevchenko", "Smith", "Tkachenko",
+    "Wisniewski",
+]
+# Seat strides; every cabin size is coprime to at least one of them.
+SEAT_STEPS = [7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+
+
+def _letters(index: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        index, rest = divmod(index, 26)
+        chars.append(ascii_uppercase[rest])
+    return "".join(reversed(chars))
+
+
+def _free_codes(length, count, taken):
+    """Up to `count` unused letter codes, then None for the rest."""
+    codes = []
+    for letters in product(ascii_uppercase, repeat=length):
+        if len(codes) == count:
+            break
+        code = "".join(letters)
+        if code not in taken:
+            codes.append(code)
+    return codes + [None] * (count - len(codes))
+
+
+def _timestamps(seconds) -> list[str]:
+    return np.datetime_as_string(
+        np.asarray(seconds, dtype=np.int64).astype("datetime64[s]"),
+        timezone="UTC",
+    ).tolist()
+
+
+def _positions(counts):
+    """Index of every repeated element within its own group."""
+    starts = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(starts, counts)
+
+
+class DatasetGenerator:
+    """
+    Write a seedable synthetic dataset with bulk inserts.
+
+    Airports are spread over the inhabited latitudes and get a Zipf
+    "hub" weight (`hub_skew`); route endpoints and flights per route are
+    drawn by those weights, so a few hubs carry most of the traffic.
+    Each flight sells a Beta-distributed share of its seats around
+    `load_factor`, split into orders of about `party_size` tickets, and
+    seats_sold is written with it. Rows get explicit ids after the
+    current maximum and are sent with COPY on PostgreSQL (bulk_create
+    elsewhere), one transaction per chunk, so the target database should
+    not be taking other writes meanwhile. The same seed and options give
+    the same rows on an empty database.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        using=DEFAULT_DB_ALIAS,
+        chunk_size=SYNTHETIC_CHUNK_SIZE,
+        hub_skew=1.0,
+        load_factor=0.8,
+        party_size=1.6,
+        start=None,
+        days=365,
+        progress=None,
+    ):
+        if not 0 < load_factor < 1:
+            raise ValueError("The load factor must be between 0 and 1.")
+        if party_size < 1:
+            raise ValueError("The party size must be at least 1.")
+        self.rng = np.random.default_rng(seed)
+        self.using = using
+        self.connection = connections[using]
+        self.chunk_size = chunk_size
+        self.hub_skew = hub_skew
+        self.load_factor = load_factor
+        self.party_size = party_size
+        start = start or timezone.now().date()
+        self.start = calendar.timegm(start.timetuple())
+        self.days = days
+        self.progress = progress or (lambda message: None)
+        self.counts = {}
+
+    def generate(
+        self,
+        airports=0,
+        routes=0,
+        airplane_types=0,
+        airplanes=0,
+        crew=0,
+        flights=0,
+        users=0,
+    ) -> dict:
+        """Generate the requested rows; returns row counts per model."""
+        self.now_seconds = int(timezone.now().timestamp())
+        self.now = _timestamps([self.now_seconds])[0]
+        if routes and airports < 2:
+            raise ValueError("Routes need at least two airports.")
+        if airplanes and not airplane_types:
+            raise ValueError("Airplanes need airplane types.")
+        if flights and not (routes and airplanes and crew):
+            raise ValueError("Flights need routes, airplanes and crew.")
+
+        hubs = self._airports(airports)
+        self._routes(routes, hubs)
+        self._airplane_types(airplane_types)
+        self._airplanes(airplanes)
+        self._crew(crew)
+        if users or flights:
+            self._users(users)
+        if flights:
+            self._flights(flights)
+
+        models = [
+            model
+            for model in (
+                Airport, Route, AirplaneType, Airplane, Crew,
+                get_user_model(), Flight, Flight.crew.through, Order, Ticket,
+            )
+            if self.counts.get(model._meta.label)
+        ]
+        reset_sequences(self.using, models)
+        return self.counts
+
+    def _next_id(self, model) -> int:
+        return (
+            model._default_manager.using(self.using).aggregate(
+                top=Max("pk")
+            )["top"]
+            or 0
+        ) + 1
+
+    def _write(self, model, columns):
+        """Insert one chunk given as attname -> column values."""
+        names = list(columns)
+        values = [
+            column.tolist() if isinstance(column, np.ndarray) else column
+            for column in columns.values()
+        ]
+        count = len(values[0])
+
+        with transaction.atomic(using=self.using):
+            if self.connection.vendor == "postgresql":
+                values = [
+                    (
+                        ["\\N" if value is None else value for value in column]
+                        if None in column
+                        else column
+                    )
+                    for column in values
+                ]
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(zip(*values, strict=True))
+                buffer.seek(0)
+                quote = self.connection.ops.quote_name
+                opts = model._meta
+                with self.connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        f"COPY {quote(opts.db_table)} ("
+                        + ", ".join(
+                            quote(opts.get_field(name).column)
+                            for name in names
+                        )
+                        + f") FROM STDIN WITH {COPY_OPTIONS}",
+                        buffer,
+                    )
+            else:
+                with raw_dates(model):
+                    model._default_manager.using(self.using).bulk_create(
+                        [
+                            model(**dict(zip(names, row, strict=True)))
+                            for row in zip(*values, strict=True)
+                        ],
+                        batch_size=self.chunk_size,
+                    )
+
+        label = model._meta.label
+        self.counts[label] = self.counts.get(label, 0) + count
+
+    def _names(self, count) -> list[str]:
+        sizes = self.rng.integers(2, 4, count)
+        picks = self.rng.integers(0, len(SYLLABLES), (count, 3))
+        return [
+            "".join(SYLLABLES[i] for i in row[:size]).capitalize()
+            for row, size in zip(
+                picks.tolist(), sizes.tolist(), strict=True
+            )
+        ]
+
+    def _airports(self, count):
+        """Write airports; returns (ids, latitudes, longitudes, weights)."""
+        if not count:
+            return None
+        first_id = self._next_id(Airport)
+        ids = np.arange(first_id, first_id + count)
+        # Uniform over the sphere's surface between the two latitudes.
+        low, high = np.sin(np.radians(LATITUDES))
+        latitudes = np.round(
+            np.degrees(np.arcsin(self.rng.uniform(low, high, count))), 6
+        )
+        longitudes = np.round(self.rng.uniform(-180, 180, count), 6)
+        ranks = self.rng.permutation(count) + 1
+        weights = 1.0 / ranks ** self.hub_skew
+
+        taken = set()
+        for codes in Airport.objects.using(self.using).values_list(
+            "iata_code", "icao_code"
+        ):
+            taken.update(code for code in codes if code)
+        cities = self._names(count)
+        suffixes = self.rng.integers(0, len(AIRPORT_SUFFIXES), count)
+
+        self._write(
+            Airport,
+            {
+                "id": ids,
+                "name": [
+                    f"{city} {AIRPORT_SUFFIXES[suffix]}"
+                    for city, suffix in zip(
+                        cities, suffixes.tolist(), strict=True
+                    )
+                ],
+                "closest_big_city": cities,
+                # Busiest airports get the first codes.
+                "iata_code": [
+                    code
+                    for _, code in sorted(
+                        zip(
+                            ranks.tolist(),
+                            _free_codes(3, count, taken),
+                            strict=True,
+                        )
+                    )
+                ],
+                "icao_code": _free_codes(4, count, taken),
+                "latitude": latitudes,
+                "longitude": longitudes,
+                "geohash": [
+                    encode_geohash(lat, lon)
+                    for lat, lon in zip(
+                        latitudes.tolist(), longitudes.tolist(), strict=True
+                    )
+                ],
+                "updated_at": [self.now] * count,
+            },
+        )
+        return ids, latitudes, longitudes, weights / weights.sum()
+
+    def _routes(self, count, hubs):
+        if not count:
+            return
+        ids, latitudes, longitudes, weights = hubs
+        size = len(ids)
+        count = min(count, size * (size - 1))
+
+        pairs = np.empty(0, dtype=np.int64)
+        attempt = 0
+        while len(pairs) < count:
+            # Blend towards uniform so dense route sets still fill up.
+            mix = min(1.0, attempt / 10)
+            probabilities = (1 - mix) * weights + mix / size
+            draws = int((count - len(pairs)) * 1.2) + 16
+            sources = self.rng.choice(size, draws, p=probabilities)
+            destinations = self.rng.choice(size, draws, p=probabilities)
+            keys = (sources * size + destinations)[sources != destinations]
+            merged = np.concatenate([pairs, keys])
+            _, first = np.unique(merged, return_index=True)
+            pairs = merged[np.sort(first)]
+            attempt += 1
+        sources, destinations = np.divmod(pairs[:count], size)
+
+        first_id = self._next_id(Route)
+        self.routes = {
+            "ids": np.arange(first_id, first_id + count),
+            "distance": np.maximum(
+                np.rint(
+                    haversine(
+                        latitudes[sources],
+                        longitudes[sources],
+                        latitudes[destinations],
+                        longitudes[destinations],
+                    )
+                ).astype(np.int64),
+                1,
+            ),
+            "weight": weights[sources] * weights[destinations],
+        }
+        for start in range(0, count, self.chunk_size):
+            window = slice(start, start + self.chunk_size)
+            self._write(
+                Route,
+                {
+                    "id": self.routes["ids"][window],
+                    "source_id": ids[sources[window]],
+                    "destination_id": ids[destinations[window]],
+                    "distance": self.routes["distance"][window],
+                    "updated_at": [self.now] * len(sources[window]),
+                },
+            )
+
+    def _airplane_types(self, count):
+        if not count:
+            return
+        first_id = self._next_id(AirplaneType)
+        self.airplane_types = np.arange(first_id, first_id + count)
+        self._write(
+            AirplaneType,
+            {
+                "id": self.airplane_types,
+                "name": [
+                    AIRPLANE_TYPES[i % len(AIRPLANE_TYPES)]
+                    + (
+                        f" ({i // len(AIRPLANE_TYPES) + 1})"
+                        if i >= len(AIRPLANE_TYPES)
+                        else ""
+                    )
+                    for i in range(count)
+                ],
+            },
+        )
+
+    def _airplanes(self, count):
+        if not count:
+            return
+        first_id = self._next_id(Airplane)
+        layouts = np.array(LAYOUTS)[self.rng.integers(0, len(LAYOUTS), count)]
+        capacity = layouts[:, 0] * layouts[:, 1]
+        steps = np.array(SEAT_STEPS)
+        coprime = capacity[:, None] % steps[None, :] != 0
+        self.airplanes = {
+            "ids": np.arange(first_id, first_id + count),
+            "seats_in_row": layouts[:, 1],
+            "capacity": capacity,
+            "step": steps[np.argmax(coprime, axis=1)],
+        }
+        prefixes = self.rng.integers(0, len(REGISTRATION_PREFIXES), count)
+        self._write(
+            Airplane,
+            {
+                "id": self.airplanes["ids"],
+                "name": [
+                    f"{REGISTRATION_PREFIXES[prefix]}-{_letters(i, 4)}"
+                    for i, prefix in zip(
+                        range(first_id, first_id + count),
+                        prefixes.tolist(),
+                        strict=True,
+                    )
+                ],
+                "airplane_type_id": self.rng.choice(
+                    self.airplane_types, count
+                ),
+                "rows": layouts[:, 0],
+                "seats_in_row": layouts[:, 1],
+                "updated_at": [self.now] * count,
+            },
+        )
+
+    def _crew(self, count):
+        if not count:
+            return
+        first_id = self._next_id(Crew)
+        self.crew = np.arange(first_id, first_id + count)
+        self._write(
+            Crew,
+            {
+                "id": self.crew,
+                "first_name": np.array(FIRST_NAMES)[
+                    self.rng.integers(0, len(FIRST_NAMES), count)
+                ].tolist(),
+                "last_name": np.array(LAST_NAMES)[
+                    self.rng.integers(0, len(LAST_NAMES), count)
+                ].tolist(),
+            },
+        )
+
+    def _users(self, count):
+        user_model = get_user_model()
+        if not count:
+            # Orders then go to the users already in the database.
+            self.users = np.fromiter(
+                user_model.objects.using(self.using).values_list(
+                    "id", flat=True
+                ),
+                dtype=np.int64,
+            )
+            return
+        first_id = self._next_id(user_model)
+        self.users = np.arange(first_id, first_id + count)
+        for start in range(first_id, first_id + count, self.chunk_size):
+            ids = range(start, min(start + self.chunk_size, first_id + count))
+            size = len(ids)
+            self._write(
+                user_model,
+                {
+                    "id": list(ids),
+                    "email": [f"loadtest{i}@example.com" for i in ids],
+                    # Unusable password: generated users cannot log in.
+                    "password": ["!"] * size,
+                    "first_name": [""] * size,
+                    "last_name": [""] * size,
+                    "is_staff": [False] * size,
+                    "is_superuser": [False] * size,
+                    "is_active": [True] * size,
+                    "date_joined": [self.now] * size,
+                },
+            )
+
+    def _flights(self, count):
+        if not len(self.users):
+            raise ValueError("Orders need at least one user.")
+        routes, airplanes = self.routes, self.airplanes
+        route_p = routes["weight"] / routes["weight"].sum()
+        per_flight = airplanes["capacity"].mean() * self.load_factor
+        batch = max(1, int(self.chunk_size // max(per_flight, 1)))
+        ids = {
+            model: self._next_id(model) for model in (Flight, Order, Ticket)
+        }
+
+        for start in range(0, count, batch):
+            size = min(batch, count - start)
+            ids = self._flight_chunk(size, ids, route_p)
+            self.progress(f"{start + size}/{count} flights")
+
+    def _flight_chunk(self, size, ids, route_p):
+        rng, airplanes = self.rng, self.airplanes
+        flight_ids = np.arange(ids[Flight], ids[Flight] + size)
+        route = rng.choice(len(route_p), size, p=route_p)
+        plane = rng.integers(0, len(airplanes["ids"]), size)
+        departure = self.start + SLOT_SECONDS * rng.integers(
+            0, self.days * 86400 // SLOT_SECONDS, size
+        )
+        minutes = (
+            self.routes["distance"][route] / CRUISE_SPEED_KMH * 60
+            + GROUND_MINUTES
+        )
+        arrival = departure + SLOT_SECONDS * np.ceil(
+            minutes * 60 / SLOT_SECONDS
+        ).astype(np.int64)
+
+        capacity = airplanes["capacity"][plane]
+        alpha = self.load_factor * LOAD_FACTOR_CONCENTRATION
+        beta = (1 - self.load_factor) * LOAD_FACTOR_CONCENTRATION
+        sold = rng.binomial(capacity, rng.beta(alpha, beta, size))
+
+        self._write(
+            Flight,
+            {
+                "id": flight_ids,
+                "departure_time": _timestamps(departure),
+                "arrival_time": _timestamps(arrival),
+                "airplane_id": airplanes["ids"][plane],
+                "route_id": self.routes["ids"][route],
+                "seats_sold": sold,
+                "updated_at": [self.now] * size,
+            },
+        )
+
+        crew_size = np.minimum(
+            rng.integers(CREW_PER_FLIGHT[0], CREW_PER_FLIGHT[1] + 1, size),
+            len(self.crew),
+        )
+        # Consecutive crew members from a random offset never repeat.
+        members = (
+            np.repeat(rng.integers(0, len(self.crew), size), crew_size)
+            + _positions(crew_size)
+        ) % len(self.crew)
+        self._write(
+            Flight.crew.through,
+            {
+                "flight_id": np.repeat(flight_ids, crew_size),
+                "crew_id": self.crew[members],
+            },
+        )
+
+        # Seats are walked with a stride coprime to the cabin size from a
+        # random offset, which visits distinct seats in a scattered order.
+        position = _positions(sold)
+        seat_index = (
+            np.repeat(rng.integers(0, capacity), sold)
+            + position * np.repeat(airplanes["step"][plane], sold)
+        ) % np.repeat(capacity, sold)
+        seats_in_row = np.repeat(airplanes["seats_in_row"][plane], sold)
+
+        new_order = rng.random(len(position)) < 1 / self.party_size
+        new_order[position == 0] = True
+        order_count = int(new_order.sum())
+        order_ids = np.arange(ids[Order], ids[Order] + order_count)
+        lead = rng.uniform(*ORDER_LEAD_DAYS, order_count) * 86400
+        self._write(
+            Order,
+            {
+                "id": order_ids,
+                # Orders for flights far ahead were still placed by now.
+                "created_at": _timestamps(
+                    np.minimum(
+                        np.repeat(departure, sold)[new_order]
+                        - lead.astype(np.int64),
+                        self.now_seconds,
+                    )
+                ),
+                "user_id": self.users[
+                    rng.integers(0, len(self.users), order_count)
+                ],
+            },
+        )
+
+        ticket_count = len(position)
+        self._write(
+            Ticket,
+            {
+                "id": np.arange(ids[Ticket], ids[Ticket] + ticket_count),
+                "order_id": order_ids[np.cumsum(new_order) - 1],
+                "flight_id": np.repeat(flight_ids, sold),
+                "row": seat_index // seats_in_row + 1,
+                "seat": seat_index % seats_in_row + 1,
+            },
+        )
+        return {
+            Flight: ids[Flight] + size,
+            Order: ids[Order] + order_count,
+            Ticket: ids[Ticket] + ticket_count,
+        }
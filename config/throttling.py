@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from django.conf import settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+# Refill and consume in one round trip. Uses the server clock so that
+# workers with skewed clocks share one notion of "now"; returns the wait
+# as a string because Lua numbers are truncated to integers on return.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+
+class LocalTokenBucketStore:
+    """
+    In-process buckets for tests and single-process development.
+
+    Beyond max_buckets the least recently used bucket is dropped; it has
+    refilled the longest, so forgetting it gives back the fewest tokens.
+    """
+
+    max_buckets = 100_000
+
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, rate):
+        now = time.monotonic()
+        with self.lock:
+            tokens, ts = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            if tokens >= 1:
+                allowed, wait, tokens = True, 0.0, tokens - 1
+            else:
+                allowed, wait = False, (1 - tokens) / rate
+            self.buckets[key] = (tokens, now)
+            self.buckets.move_to_end(key)
+            if len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        return allowed, wait
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class RedisTokenBucketStore:
+    """Buckets in a Redis-compatible server, updated by one Lua script."""
+
+    def __init__(self, url):
+        self.client = redis.Redis.from_url(url)
+        self.script = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, key, capacity, rate):
+        allowed, wait = self.script(keys=[key], args=[capacity, rate])
+        return bool(allowed), float(wait)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_token_bucket_store():
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if getattr(settings, "THROTTLE_STORE", "local") == "redis":
+                    _store = RedisTokenBucketStore(
+                        settings.THROTTLE_REDIS_URL
+                    )
+                else:
+                    _store = LocalTokenBucketStore()
+    return _store
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with token-bucket state in a shared store.
+
+    A rate of N/period is a bucket of N tokens refilled at N/period per
+    second. Each check is one atomic O(1) update instead of rewriting a
+    list of timestamps, and with the Redis store all workers share one
+    budget.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = get_token_bucket_store().consume(
+            self.key, self.num_requests, self.num_requests / self.duration
+        )
+        return allowed
+
+    def wait(self):
+        return getattr(self, "wait_seconds", None)
+
+
+class AnonTokenBucketThrottle(AnonRateThrottle, TokenBucketThrottle):
+    pass
+
+
+class UserTokenBucketThrottle(UserRateThrottle, TokenBucketThrottle):
+    pass
+
+
+class ScopedTokenBucketThrottle(ScopedRateThrottle, TokenBucketThrottle):
+    """Separate budgets for views (or actions) that set throttle_scope."""
@@ -0,0 +1,87 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+MODEL_VERSION_KEY = "model-version:{}"
+OBJECT_VERSION_KEY = "model-version:{}:{}"
+FIELD_VERSION_KEY = "model-version:{}.{}"
+
+
+def _version_key(model) -> str:
+    return MODEL_VERSION_KEY.format(model._meta.label_lower)
+
+
+def _object_version_key(model, pk) -> str:
+    return OBJECT_VERSION_KEY.format(model._meta.label_lower, pk)
+
+
+def _field_version_key(model, field) -> str:
+    return FIELD_VERSION_KEY.format(model._meta.label_lower, field)
+
+
+def _current(key) -> int:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def model_version(model) -> int:
+    """
+    Current data version of a model, shared through the default cache.
+
+    Versions start from a timestamp so that a counter lost to eviction
+    never restarts at a value some process has already seen.
+    """
+    return _current(_version_key(model))
+
+
+def object_version(model, pk) -> int:
+    """Current data version of a single row, see model_version."""
+    return _current(_object_version_key(model, pk))
+
+
+def field_version(model, field) -> int:
+    """
+    Current data version of one column across all rows.
+
+    Meant for counters updated in bulk, so that bumping them leaves
+    everything derived from the rest of the model cached.
+    """
+    return _current(_field_version_key(model, field))
+
+
+def _bump(keys) -> None:
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def _bump_now_and_on_commit(keys) -> None:
+    _bump(keys)
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def bump_model_version(*models) -> None:
+    """
+    Invalidate everything derived from the given models.
+
+    The version is bumped right away for readers inside the writing
+    transaction and once more on commit, so nobody can cache data read
+    before the commit under the new version.
+    """
+    _bump_now_and_on_commit([_version_key(model) for model in models])
+
+
+def bump_object_version(model, pk) -> None:
+    """Invalidate everything derived from one row, see bump_model_version."""
+    _bump_now_and_on_commit([_object_version_key(model, pk)])
+
+
+def bump_field_version(model, field) -> None:
+    """Invalidate everything derived from one column, see field_version."""
+    _bump_now_and_on_commit([_field_version_key(model, field)])
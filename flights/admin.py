@@ -29,7 +29,13 @@ class CrewAdmin(admin.ModelAdmin):
 
 @admin.register(Flight)
 class FlightAdmin(admin.ModelAdmin):
-    list_display = ["route", "airplane", "departure_time", "arrival_time"]
+    list_display = [
+        "route",
+        "airplane",
+        "departure_time",
+        "arrival_time",
+        "seats_sold"
+    ]
     list_filter = ["departure_time", "airplane"]
     search_fields = ["route__source__name", "route__destination__name"]
     filter_horizontal = ["crew"]
@@ -0,0 +1,105 @@
+from typing import Iterable
+
+Seat = tuple[int, int]
+
+
+class SeatAllocator:
+    """
+    Assign blocks of adjacent free seats on an in-memory occupancy grid.
+
+    A party is placed in a single row whenever possible, using the free
+    run that leaves the smallest gap (best fit). Parties that no longer
+    fit into one row are spread over the fewest consecutive rows.
+    """
+
+    def __init__(self, rows: int, seats_in_row: int, taken: Iterable[Seat]):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.free = [bytearray(b"\x01" * seats_in_row) for _ in range(rows)]
+        for row, seat in taken:
+            if 1 <= row <= rows and 1 <= seat <= seats_in_row:
+                self.free[row - 1][seat - 1] = 0
+
+    def free_runs(self, row_index: int) -> list[tuple[int, int]]:
+        """Return (start, length) of every free run in a row."""
+        runs = []
+        start = None
+        for index, is_free in enumerate(self.free[row_index]):
+            if is_free and start is None:
+                start = index
+            elif not is_free and start is not None:
+                runs.append((start, index - start))
+                start = None
+        if start is not None:
+            runs.append((start, self.seats_in_row - start))
+        return runs
+
+    def _take(self, row_index: int, start: int, length: int) -> list[Seat]:
+        for index in range(start, start + length):
+            self.free[row_index][index] = 0
+        return [
+            (row_index + 1, index + 1)
+            for index in range(start, start + length)
+        ]
+
+    def _best_fit_in_row(self, size: int) -> list[Seat] | None:
+        best = None
+        for row_index in range(self.rows):
+            for start, length in self.free_runs(row_index):
+                if length >= size and (best is None or length < best[0]):
+                    best = (length, row_index, start)
+                    if length == size:
+                        return self._take(row_index, start, size)
+        if best is None:
+            return None
+        _, row_index, start = best
+        return self._take(row_index, start, size)
+
+    def _fewest_rows(self, size: int) -> list[Seat] | None:
+        free_counts = [sum(row) for row in self.free]
+        best = None
+        for first in range(self.rows):
+            total = 0
+            for last in range(first, self.rows):
+                total += free_counts[last]
+                if total >= size:
+                    if best is None or last - first < best[1] - best[0]:
+                        best = (first, last)
+                    break
+        if best is None:
+            return None
+
+        seats = []
+        for row_index in range(best[0], best[1] + 1):
+            runs = sorted(
+                self.free_runs(row_index),
+                key=lambda run: run[1],
+                reverse=True
+            )
+            for start, length in runs:
+                taken = min(length, size - len(seats))
+                seats.extend(self._take(row_index, start, taken))
+                if len(seats) == size:
+                    return seats
+        return seats
+
+    def allocate(self, size: int) -> list[Seat] | None:
+        """Reserve `size` seats on the grid, or return None if full."""
+        if size < 1:
+            return None
+        if size <= self.seats_in_row:
+            seats = self._best_fit_in_row(size)
+            if seats is not None:
+                return seats
+        return self._fewest_rows(size)
+
+    def allocate_many(self, sizes: list[int]) -> list[list[Seat] | None]:
+        """Allocate several parties, biggest first, in request order."""
+        allocations = [None] * len(sizes)
+        for index in sorted(
+            range(len(sizes)),
+            key=lambda position: sizes[position],
+            reverse=True
+        ):
+            allocations[index] = self.allocate(sizes[index])
+        return allocations
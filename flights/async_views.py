@@ -0,0 +1,72 @@
+import base64
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound
+
+from config.async_views import AsyncReadView
+from config.pagination import KeysetPagination
+from flights.filters import (
+    filter_flights,
+    filter_seats_available,
+    flight_ordering,
+)
+from flights.models import Flight
+from flights.seat_map import aget_seat_map
+from flights.serializers import FlightDetailSerializer, FlightListSerializer
+from flights.views import FlightViewSet
+
+
+class AsyncFlightListView(AsyncReadView):
+    """Flight search with the filters and paging of the flight list."""
+
+    throttle_scope = "flight_search"
+
+    def get_queryset(self):
+        params = self.request.query_params
+        return filter_seats_available(
+            filter_flights(FlightViewSet.queryset, params)
+            .with_seats_available(),
+            params,
+        )
+
+    def get_pagination_ordering(self):
+        return flight_ordering(self.request.query_params)
+
+    async def get(self, request):
+        # Airport codes resolve through a map that may need loading.
+        queryset = await sync_to_async(self.get_queryset)()
+        paginator = KeysetPagination()
+        flights = await paginator.apaginate_queryset(queryset, request, self)
+        return paginator.get_paginated_response(
+            FlightListSerializer(flights, many=True).data
+        ).data
+
+
+class AsyncFlightDetailView(AsyncReadView):
+    async def get(self, request, pk):
+        flight = await (
+            FlightViewSet.queryset.prefetch_related("tickets")
+            .filter(pk=pk)
+            .afirst()
+        )
+        if flight is None:
+            raise NotFound()
+        return FlightDetailSerializer(flight).data
+
+
+class AsyncSeatMapView(AsyncReadView):
+    async def get(self, request, pk):
+        """Taken seats as a base64 bitset, as in the flight seat-map."""
+        flight = await (
+            Flight.objects.select_related("airplane").filter(pk=pk).afirst()
+        )
+        if flight is None:
+            raise NotFound()
+        bitmap = await aget_seat_map(flight)
+        return {
+            "flight": flight.id,
+            "rows": flight.airplane.rows,
+            "seats_in_row": flight.airplane.seats_in_row,
+            "encoding": "base64",
+            "bitmap": base64.b64encode(bitmap).decode(),
+        }
@@ -0,0 +1,141 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from airports.models import Route
+from airports.search import airport_lookup
+
+ORDERING_FIELDS = ["departure_time", "seats_available"]
+
+
+def get_timezone(name: str | None):
+    if not name:
+        return timezone.get_current_timezone()
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValidationError(
+            {"tz": f"Unknown time zone {name!r}."}
+        ) from None
+
+
+def parse_bound(param: str, value: str, tz, end: bool = False) -> datetime:
+    """
+    Turn a date or datetime query param into an aware datetime.
+
+    A bare date means the start of that day in `tz`; when `end` is set it
+    means the start of the next day, so the day itself is included in a
+    half-open `[from, to)` range.
+    """
+    # Dates first: parse_datetime() also accepts a bare date (as
+    # midnight) on Python 3.11+, which would lose the `end` handling.
+    try:
+        day = parse_date(value)
+        moment = None if day else parse_datetime(value)
+    except ValueError:
+        moment = day = None
+
+    if moment is not None:
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment, tz)
+        return moment
+    if day is None:
+        raise ValidationError(
+            {param: "Use YYYY-MM-DD or an ISO 8601 datetime."}
+        )
+    if end:
+        day += timedelta(days=1)
+    return timezone.make_aware(datetime.combine(day, time.min), tz)
+
+
+def departure_range(params) -> tuple[datetime | None, datetime | None]:
+    """
+    Read `date`, `date_from`, `date_to` and `tz` into a departure range.
+
+    The bounds are compared against the raw column (`>=` / `<`) instead
+    of casting it to a date, so the departure time indexes stay usable.
+    """
+    tz = get_timezone(params.get("tz"))
+    start = end = None
+
+    if params.get("date"):
+        start = parse_bound("date", params["date"], tz)
+        end = parse_bound("date", params["date"], tz, end=True)
+    if params.get("date_from"):
+        start = parse_bound("date_from", params["date_from"], tz)
+    if params.get("date_to"):
+        end = parse_bound("date_to", params["date_to"], tz, end=True)
+
+    return start, end
+
+
+def route_filter(params) -> Q:
+    """Route conditions from `source`/`destination` (code or name) and
+    `source_id`/`destination_id`."""
+    routes = Q()
+
+    for param in ("source", "destination"):
+        if params.get(param):
+            routes &= airport_lookup(param, params[param])
+    for param in ("source_id", "destination_id"):
+        if params.get(param):
+            try:
+                routes &= Q(**{param: int(params[param])})
+            except ValueError:
+                raise ValidationError(
+                    {param: "A valid integer is required."}
+                ) from None
+    return routes
+
+
+def filter_flights(queryset, params):
+    """Restrict a Flight queryset to the searched routes and departures."""
+    routes = route_filter(params)
+    if routes:
+        queryset = queryset.filter(
+            route_id__in=Route.objects.filter(routes).values("id")
+        )
+
+    departure_from, departure_to = departure_range(params)
+    if departure_from:
+        queryset = queryset.filter(departure_time__gte=departure_from)
+    if departure_to:
+        queryset = queryset.filter(departure_time__lt=departure_to)
+    return queryset
+
+
+def filter_seats_available(queryset, params):
+    """Apply `min_seats_available` to a queryset with_seats_available()."""
+    min_seats = params.get("min_seats_available")
+
+    if min_seats:
+        try:
+            min_seats = int(min_seats)
+        except ValueError:
+            raise ValidationError(
+                {"min_seats_available": "A valid integer is required."}
+            ) from None
+        queryset = queryset.filter(seats_available__gte=min_seats)
+
+    return queryset
+
+
+def flight_ordering(params) -> list[str]:
+    """Keyset ordering from the `ordering` param; id breaks ties."""
+    ordering = params.get("ordering")
+
+    if not ordering:
+        return ["-departure_time", "-id"]
+    if ordering.lstrip("-") not in ORDERING_FIELDS:
+        raise ValidationError(
+            {
+                "ordering": f"Must be one of "
+                            f"{', '.join(ORDERING_FIELDS)}, "
+                            f"optionally prefixed with '-'."
+            }
+        )
+    return [ordering, "-id"]
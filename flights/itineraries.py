@@ -0,0 +1,264 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.conf import settings
+
+from airports.distances import (
+    DistanceMatrixUnavailable,
+    get_distance_matrix,
+)
+from airports.models import Airport, Route
+from config.versioning import model_version
+from flights.models import Flight
+
+MAX_STOPS = 2
+MAX_ROUTE_PATHS = 500
+MAX_CONNECTIONS_PER_LEG = 5
+SCHEDULE_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class Leg:
+    flight_id: int
+    route_id: int
+    source_id: int
+    destination_id: int
+    departure_time: datetime
+    arrival_time: datetime
+
+
+@dataclass
+class Itinerary:
+    legs: list[Leg]
+    distance: int
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def duration(self) -> timedelta:
+        return self.arrival_time - self.departure_time
+
+
+@dataclass
+class RouteGraph:
+    """Airports as nodes and routes as weighted (distance) edges."""
+
+    airports: dict[int, str]
+    edges: dict[int, list[tuple[int, int, int]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+
+    def route_paths(
+        self, source_id, destination_id, max_legs, deadline, dead_ends=()
+    ):
+        """
+        Yield (route ids, distance) for simple paths up to max_legs.
+
+        Paths are expanded one leg at a time, so every path with fewer
+        legs comes first and MAX_ROUTE_PATHS is not used up by longer
+        detours; within one leg count shorter paths come first. Airports
+        in dead_ends (no way on to the destination) are not expanded.
+        """
+        found = 0
+        frontier = [(source_id, (), 0, frozenset([source_id]))]
+        for legs in range(1, max_legs + 1):
+            paths = []
+            next_frontier = []
+            for airport_id, routes, distance, visited in frontier:
+                if time.monotonic() > deadline:
+                    return
+                for next_id, route_id, route_distance in self.edges.get(
+                    airport_id, ()
+                ):
+                    if next_id in visited or next_id in dead_ends:
+                        continue
+                    path = routes + (route_id,)
+                    if next_id == destination_id:
+                        paths.append((path, distance + route_distance))
+                    elif legs < max_legs:
+                        next_frontier.append(
+                            (
+                                next_id,
+                                path,
+                                distance + route_distance,
+                                visited | {next_id},
+                            )
+                        )
+            paths.sort(key=lambda item: item[1])
+            for path in paths[: MAX_ROUTE_PATHS - found]:
+                yield path
+            found += len(paths)
+            if found >= MAX_ROUTE_PATHS:
+                return
+            frontier = next_frontier
+
+
+class Schedule:
+    """Flights of a time window grouped per route, sorted by departure."""
+
+    def __init__(self, legs):
+        self.by_route = defaultdict(list)
+        for leg in legs:
+            self.by_route[leg.route_id].append(leg)
+        self.departures = {}
+        for route_id, route_legs in self.by_route.items():
+            route_legs.sort(key=lambda leg: leg.departure_time)
+            self.departures[route_id] = [
+                leg.departure_time for leg in route_legs
+            ]
+
+    def departing(self, route_id, earliest, latest):
+        departures = self.departures.get(route_id)
+        if not departures:
+            return []
+        start = bisect_left(departures, earliest)
+        end = bisect_left(departures, latest, lo=start)
+        return self.by_route[route_id][start:end]
+
+
+_lock = threading.Lock()
+_graph = None
+_graph_version = None
+_schedules = OrderedDict()
+
+
+def get_route_graph() -> RouteGraph:
+    global _graph, _graph_version
+
+    version = (model_version(Route), model_version(Airport))
+    if _graph is not None and _graph_version == version:
+        return _graph
+
+    with _lock:
+        if _graph is None or _graph_version != version:
+            graph = RouteGraph(
+                airports=dict(
+                    Airport.objects.order_by().values_list("id", "name")
+                )
+            )
+            for route_id, source_id, destination_id, distance in (
+                Route.objects.order_by().values_list(
+                    "id", "source_id", "destination_id", "distance"
+                )
+            ):
+                graph.edges[source_id].append(
+                    (destination_id, route_id, distance)
+                )
+            _graph, _graph_version = graph, version
+        return _graph
+
+
+def get_schedule(start: datetime, end: datetime) -> Schedule:
+    key = (start, end, model_version(Flight), model_version(Route))
+    with _lock:
+        if key in _schedules:
+            _schedules.move_to_end(key)
+            return _schedules[key]
+
+    schedule = Schedule(
+        Leg(*row)
+        for row in Flight.objects.filter(
+            departure_time__gte=start,
+            departure_time__lt=end
+        ).order_by().values_list(
+            "id",
+            "route_id",
+            "route__source_id",
+            "route__destination_id",
+            "departure_time",
+            "arrival_time",
+        )
+    )
+    with _lock:
+        _schedules[key] = schedule
+        while len(_schedules) > SCHEDULE_CACHE_SIZE:
+            _schedules.popitem(last=False)
+    return schedule
+
+
+def find_itineraries(
+    source_id: int,
+    destination_id: int,
+    day_start: datetime,
+    max_stops: int = MAX_STOPS,
+    limit: int = 10,
+) -> list[Itinerary]:
+    """
+    Direct and connecting itineraries departing within one day.
+
+    Candidate route sequences come from a bounded search of the cached
+    route graph, skipping airports the distance matrix (when built and up
+    to date) shows cannot reach the destination; flights are then chained
+    so every connection respects the minimum and maximum connection time.
+    The whole search stops at ITINERARY_SEARCH_TIME_LIMIT and returns what
+    it has found so far.
+    """
+    min_connection = getattr(
+        settings, "MIN_CONNECTION_TIME", timedelta(minutes=45)
+    )
+    max_connection = getattr(
+        settings, "MAX_CONNECTION_TIME", timedelta(hours=12)
+    )
+    deadline = time.monotonic() + getattr(
+        settings, "ITINERARY_SEARCH_TIME_LIMIT", 0.2
+    )
+
+    day_end = day_start + timedelta(days=1)
+    schedule = get_schedule(
+        day_start, day_end + (max_connection + timedelta(days=1)) * max_stops
+    )
+    graph = get_route_graph()
+    dead_ends = frozenset()
+    try:
+        matrix = get_distance_matrix()
+    except DistanceMatrixUnavailable:
+        pass
+    else:
+        # A matrix built before a route change may call reachable
+        # airports dead ends.
+        if not matrix.is_stale():
+            dead_ends = matrix.unreachable_to(destination_id)
+    results = []
+
+    for routes, distance in graph.route_paths(
+        source_id, destination_id, max_stops + 1, deadline, dead_ends
+    ):
+        chains = [
+            [leg] for leg in schedule.departing(routes[0], day_start, day_end)
+        ]
+        for route_id in routes[1:]:
+            chains = [
+                chain + [leg]
+                for chain in chains
+                for leg in schedule.departing(
+                    route_id,
+                    chain[-1].arrival_time + min_connection,
+                    chain[-1].arrival_time + max_connection,
+                )[:MAX_CONNECTIONS_PER_LEG]
+            ]
+            if not chains:
+                break
+        results.extend(
+            Itinerary(legs=chain, distance=distance) for chain in chains
+        )
+        if time.monotonic() > deadline:
+            break
+
+    results.sort(
+        key=lambda itinerary: (
+            itinerary.arrival_time,
+            len(itinerary.legs),
+            itinerary.duration,
+        )
+    )
+    return results[:limit]
@@ -1,6 +1,17 @@
 from django.db import models
+from django.db.models import (
+    Case,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Value,
+    When
+)
+from django.db.models.functions import Now
 
 from airports.models import Airport, Route
+from config.versioning import bump_field_version
+from flights.search_cache import bump_search_routes
 
 
 class AirplaneType(models.Model):
@@ -19,6 +30,7 @@ class Airplane(models.Model):
     )
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     @property
     def capacity(self):
@@ -43,6 +55,62 @@ class Crew(models.Model):
         return f"{self.first_name} {self.last_name}"
 
 
+class FlightQuerySet(models.QuerySet):
+    def with_seats_available(self):
+        return self.annotate(
+            seats_available=ExpressionWrapper(
+                F("airplane__rows") * F("airplane__seats_in_row")
+                - F("seats_sold"),
+                output_field=IntegerField()
+            )
+        )
+
+    def add_seats_sold(self, counts: dict[int, int]) -> int:
+        """
+        Apply per-flight seat deltas in one UPDATE and invalidate what
+        depends on availability.
+
+        Searches are only bumped for routes with a flight that sold out
+        or got seats back; everything else derived from flights keeps
+        its cache, only the seats_sold version changes.
+        """
+        counts = {
+            flight_id: delta
+            for flight_id, delta in counts.items()
+            if delta
+        }
+        if not counts:
+            return 0
+        updated = self.filter(pk__in=counts).update(
+            updated_at=Now(),
+            seats_sold=F("seats_sold") + Case(
+                *[
+                    When(pk=flight_id, then=Value(delta))
+                    for flight_id, delta in counts.items()
+                ],
+                default=Value(0),
+                output_field=IntegerField()
+            )
+        )
+
+        # Flights that just sold out or just got seats back drop out of
+        # or reappear in availability searches.
+        crossed = [
+            route_id
+            for flight_id, route_id, available in (
+                self.filter(pk__in=counts)
+                .with_seats_available()
+                .values_list("id", "route_id", "seats_available")
+            )
+            if available == 0 or available + counts[flight_id] == 0
+        ]
+        if crossed:
+            bump_search_routes(crossed)
+        # The UPDATE bypasses post_save; availability ETags follow this.
+        bump_field_version(Flight, "seats_sold")
+        return updated
+
+
 class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
@@ -51,15 +119,37 @@ class Flight(models.Model):
         on_delete=models.CASCADE,
         related_name="flights"
     )
+    # Covered by the (route, departure_time) index below.
     route = models.ForeignKey(
         Route,
         on_delete=models.CASCADE,
-        related_name="flights"
+        related_name="flights",
+        db_index=False
     )
     crew = models.ManyToManyField(Crew, related_name="flights")
+    seats_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = FlightQuerySet.as_manager()
 
     class Meta:
         ordering = ["-departure_time"]
+        indexes = [
+            models.Index(
+                fields=["-departure_time", "-id"],
+                name="flight_departure_id_idx"
+            ),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.route} ({self.departure_time})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_route_id = instance.__dict__.get("route_id")
+        return instance
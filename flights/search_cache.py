@@ -0,0 +1,221 @@
+import hashlib
+import json
+import math
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from airports.models import Airport, Route
+from config.versioning import model_version
+
+SEARCH_KEY = "flights:search:{}"
+LOCK_KEY = "flights:search-lock:{}"
+ROUTE_VERSION_KEY = "flights:search-route:{}"
+ALL_ROUTES = "all"
+
+SEARCH_CACHE_TTL = 30
+SEARCH_LOCK_TIMEOUT = 10
+# Only spent when there is no consistent entry to serve meanwhile.
+SEARCH_LOCK_WAIT = 0.25
+SEARCH_LOCK_POLL = 0.02
+# XFetch beta: > 1 refreshes earlier, < 1 later.
+SEARCH_EARLY_REFRESH_BETA = 1.0
+
+
+def _route_keys(route_ids) -> list[str]:
+    if route_ids is None:
+        return [ROUTE_VERSION_KEY.format(ALL_ROUTES)]
+    return [ROUTE_VERSION_KEY.format(route_id) for route_id in route_ids]
+
+
+def _route_versions(route_ids) -> list:
+    """
+    Current search versions of the routes. Like model versions, missing
+    ones start from a timestamp so an evicted counter never comes back
+    with a value an old entry was stored under.
+    """
+    keys = _route_keys(route_ids)
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key) for key in keys]
+
+
+def _bump(route_ids) -> None:
+    for key in _route_keys(route_ids) + _route_keys(None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_search_routes(route_ids) -> None:
+    """
+    Invalidate cached searches that returned flights of these routes.
+
+    Searches without a route filter depend on every route and are
+    invalidated as well. Bumped right away and again on commit, like
+    model versions.
+    """
+    route_ids = sorted(set(route_ids))
+    _bump(route_ids)
+    transaction.on_commit(lambda: _bump(route_ids))
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class FlightSearchCacheMixin:
+    """
+    Short-TTL cache for flight list pages with stampede protection.
+
+    Entries are keyed on the normalized filters (see
+    `get_search_cache_params`) plus the Route and Airport versions, and
+    remember the routes the search covered together with their search
+    versions; a flight change or sell-out on one of those routes makes the
+    entry stale. Only one worker recomputes a missing or expiring entry
+    (a cache.add lock); others serve the stale entry or wait briefly for
+    the new one. Entries are refreshed probabilistically before expiry
+    (XFetch), so popular searches rarely expire at all. The ETag of the
+    view (`get_list_etag`, from ConditionalGetMixin) is stored with each
+    entry and sent with it, so a stale body never goes out under the
+    tag of newer data.
+
+    Seat sales that leave seats on the flight do not invalidate entries:
+    seat counts and `min_seats_available` results may lag them by up to
+    FLIGHT_SEARCH_CACHE_TTL. Bookings check the seats themselves.
+    """
+
+    def get_search_cache_params(self):
+        """Filters the page depends on; the raw query string by default."""
+        return sorted(self.request.query_params.lists())
+
+    def get_search_route_ids(self):
+        """Route ids the search is restricted to, or None for all."""
+        return None
+
+    def _search_key(self, request):
+        raw = json.dumps(
+            [
+                # Pagination links are absolute.
+                request.scheme,
+                request.get_host(),
+                request.accepted_media_type,
+                self.get_search_cache_params(),
+                model_version(Route),
+                model_version(Airport),
+            ],
+            default=str,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _is_fresh(self, entry) -> bool:
+        if entry["versions"] != _route_versions(entry["routes"]):
+            return False
+        # XFetch: the longer the recompute took, the earlier we refresh.
+        beta = _setting(
+            "FLIGHT_SEARCH_EARLY_REFRESH_BETA", SEARCH_EARLY_REFRESH_BETA
+        )
+        early = entry["delta"] * beta * -math.log(1 - random.random())
+        return time.time() + early < entry["expires"]
+
+    def _compute(self, request, key, handler, *args, **kwargs):
+        started = time.time()
+        route_ids = self.get_search_route_ids()
+        versions = _route_versions(route_ids)
+        # Taken before the query, like the route versions, so the tag
+        # can only be older than the data it is stored with.
+        get_list_etag = getattr(self, "get_list_etag", None)
+        etag = get_list_etag(request) if get_list_etag else None
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        if etag:
+            response["ETag"] = etag
+
+        ttl = _setting("FLIGHT_SEARCH_CACHE_TTL", SEARCH_CACHE_TTL)
+        now = time.time()
+        entry = {
+            "data": response.data,
+            "routes": route_ids,
+            "versions": versions,
+            "etag": etag,
+            "delta": now - started,
+            "expires": now + ttl,
+        }
+        # Kept past its logical expiry so waiters have something to serve
+        # while one worker recomputes.
+        cache.set(SEARCH_KEY.format(key), entry, ttl * 2)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format == "api":
+            return super().list(request, *args, **kwargs)
+
+        key = self._search_key(request)
+        entry = cache.get(SEARCH_KEY.format(key))
+        if entry is not None and self._is_fresh(entry):
+            return self._cached(request, entry, "hit")
+
+        lock = LOCK_KEY.format(key)
+        lock_timeout = _setting(
+            "FLIGHT_SEARCH_LOCK_TIMEOUT", SEARCH_LOCK_TIMEOUT
+        )
+        if cache.add(lock, 1, lock_timeout):
+            try:
+                response = self._compute(
+                    request, key, super().list, *args, **kwargs
+                )
+            finally:
+                cache.delete(lock)
+            response["X-Search-Cache"] = "miss"
+            return response
+
+        # Someone else is recomputing: serve what we have if it is still
+        # consistent with the data, otherwise wait for their result.
+        if entry is not None and (
+            entry["versions"] == _route_versions(entry["routes"])
+        ):
+            return self._cached(request, entry, "stale")
+
+        deadline = time.monotonic() + _setting(
+            "FLIGHT_SEARCH_LOCK_WAIT", SEARCH_LOCK_WAIT
+        )
+        while time.monotonic() < deadline:
+            time.sleep(SEARCH_LOCK_POLL)
+            fresh = cache.get(SEARCH_KEY.format(key))
+            if (
+                fresh is not None
+                and (entry is None or fresh["expires"] != entry["expires"])
+                and fresh["versions"] == _route_versions(fresh["routes"])
+            ):
+                return self._cached(request, fresh, "coalesced")
+            if cache.get(lock) is None:
+                break
+
+        response = self._compute(
+            request, key, super().list, *args, **kwargs
+        )
+        response["X-Search-Cache"] = "miss"
+        return response
+
+    def _cached(self, request, entry, status):
+        etag = entry.get("etag")
+        response = None
+        if etag:
+            response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = Response(entry["data"])
+        if etag:
+            response["ETag"] = etag
+        response["X-Search-Cache"] = status
+        return response
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from flights.models import Flight
+
+SEAT_MAP_CACHE_KEY = "flights:seat-map:{}"
+
+
+def seat_index(row: int, seat: int, seats_in_row: int) -> int:
+    return (row - 1) * seats_in_row + seat - 1
+
+
+def build_seat_map(flight: Flight) -> bytes:
+    """
+    Pack the taken seats of a flight into a bitset.
+
+    Bit `(row - 1) * seats_in_row + (seat - 1)` is set for every sold
+    seat; bits are numbered from the most significant bit of byte 0.
+    """
+    return pack_seat_map(
+        flight, flight.tickets.values_list("row", "seat")
+    )
+
+
+def pack_seat_map(flight: Flight, seats) -> bytes:
+    rows = flight.airplane.rows
+    seats_in_row = flight.airplane.seats_in_row
+    bitmap = bytearray((flight.airplane.capacity + 7) // 8)
+
+    for row, seat in seats:
+        # Tickets sold before the airplane was swapped may not fit it.
+        if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+            continue
+        index = seat_index(row, seat, seats_in_row)
+        bitmap[index >> 3] |= 0x80 >> (index & 7)
+
+    return bytes(bitmap)
+
+
+def decode_seat_map(bitmap: bytes, seats_in_row: int):
+    """Yield (row, seat) for every bit set in a seat map."""
+    for byte_index, byte in enumerate(bitmap):
+        if not byte:
+            continue
+        for bit in range(8):
+            if byte & (0x80 >> bit):
+                index = byte_index * 8 + bit
+                yield index // seats_in_row + 1, index % seats_in_row + 1
+
+
+def get_seat_map(flight: Flight) -> bytes:
+    """Return the cached seat bitset of a flight, rebuilding it if stale."""
+    key = SEAT_MAP_CACHE_KEY.format(flight.pk)
+    layout = (flight.airplane.rows, flight.airplane.seats_in_row)
+    cached = cache.get(key)
+
+    if cached is not None and cached[0] == layout:
+        return cached[1]
+
+    bitmap = build_seat_map(flight)
+    cache.set(
+        key,
+        (layout, bitmap),
+        getattr(settings, "SEAT_MAP_CACHE_TIMEOUT", 300)
+    )
+    return bitmap
+
+
+async def aget_seat_map(flight: Flight) -> bytes:
+    """get_seat_map() for async views."""
+    key = SEAT_MAP_CACHE_KEY.format(flight.pk)
+    layout = (flight.airplane.rows, flight.airplane.seats_in_row)
+    cached = await cache.aget(key)
+
+    if cached is not None and cached[0] == layout:
+        return cached[1]
+
+    bitmap = pack_seat_map(
+        flight,
+        [seat async for seat in flight.tickets.values_list("row", "seat")],
+    )
+    await cache.aset(
+        key,
+        (layout, bitmap),
+        getattr(settings, "SEAT_MAP_CACHE_TIMEOUT", 300)
+    )
+    return bitmap
+
+
+def invalidate_seat_maps(flight_ids) -> None:
+    """Drop cached seat maps once the current transaction commits."""
+    keys = [SEAT_MAP_CACHE_KEY.format(flight_id) for flight_id in flight_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
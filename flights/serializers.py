@@ -85,7 +85,7 @@ class FlightListSerializer(FlightSerializer):
 
     @extend_schema_field(int)
     def get_tickets_available(self, obj: Flight) -> int:
-        return obj.airplane.capacity - obj.tickets.count()
+        return obj.airplane.capacity - obj.seats_sold
 
     class Meta:
         model = Flight
@@ -124,3 +124,56 @@ class FlightDetailSerializer(FlightSerializer):
             "crew",
             "taken_seats",
         ]
+
+
+class SeatAllocationSerializer(serializers.Serializer):
+    party_sizes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+
+
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    date = serializers.DateField()
+    tz = serializers.CharField(required=False)
+    max_stops = serializers.IntegerField(min_value=0, max_value=2, default=2)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(source="flight_id")
+    route = serializers.IntegerField(source="route_id")
+    source = serializers.IntegerField(source="source_id")
+    source_name = serializers.SerializerMethodField()
+    destination = serializers.IntegerField(source="destination_id")
+    destination_name = serializers.SerializerMethodField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
+    @extend_schema_field(str)
+    def get_source_name(self, obj) -> str:
+        return self.context.get("airports", {}).get(obj.source_id)
+
+    @extend_schema_field(str)
+    def get_destination_name(self, obj) -> str:
+        return self.context.get("airports", {}).get(obj.destination_id)
+
+
+class ItinerarySerializer(serializers.Serializer):
+    stops = serializers.SerializerMethodField()
+    distance = serializers.IntegerField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    duration_minutes = serializers.SerializerMethodField()
+    legs = ItineraryLegSerializer(many=True)
+
+    @extend_schema_field(int)
+    def get_stops(self, obj) -> int:
+        return len(obj.legs) - 1
+
+    @extend_schema_field(int)
+    def get_duration_minutes(self, obj) -> int:
+        return int(obj.duration.total_seconds() // 60)
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.versioning import bump_model_version
+from flights.models import Airplane, AirplaneType, Flight
+from flights.search_cache import bump_search_routes
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def bump_flight_version(sender, instance, **kwargs):
+    bump_model_version(Flight)
+    bump_search_routes(
+        {instance.route_id, getattr(instance, "_loaded_route_id", None)}
+        - {None}
+    )
+    instance._loaded_route_id = instance.route_id
+
+
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+def bump_airplane_version(sender, **kwargs):
+    bump_model_version(Airplane)
+
+
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_delete, sender=AirplaneType)
+def bump_airplane_type_version(sender, **kwargs):
+    bump_model_version(AirplaneType)
@@ -1,10 +1,18 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from flights.async_views import (
+    AsyncFlightDetailView,
+    AsyncFlightListView,
+    AsyncSeatMapView,
+)
 from flights.views import (
     AirplaneTypeViewSet,
     AirplaneViewSet,
     CrewViewSet,
+    FlightExportView,
     FlightViewSet,
+    ItineraryView,
 )
 
 router = DefaultRouter()
@@ -13,6 +21,26 @@ router.register("list-airplanes", AirplaneViewSet)
 router.register("list-crew", CrewViewSet)
 router.register("list-flights", FlightViewSet)
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("itineraries/", ItineraryView.as_view(), name="itineraries"),
+    path(
+        "export/flights/", FlightExportView.as_view(), name="flight-export"
+    ),
+    path(
+        "async/list-flights/",
+        AsyncFlightListView.as_view(),
+        name="async-flight-list",
+    ),
+    path(
+        "async/list-flights/<int:pk>/",
+        AsyncFlightDetailView.as_view(),
+        name="async-flight-detail",
+    ),
+    path(
+        "async/list-flights/<int:pk>/seat-map/",
+        AsyncSeatMapView.as_view(),
+        name="async-flight-seat-map",
+    ),
+] + router.urls
 
 app_name = "flights"
@@ -1,7 +1,21 @@
-from rest_framework import viewsets
-from rest_framework.permissions import IsAdminUser
-from django.db.models import Count
+import base64
+from datetime import datetime, time
 
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from airports.models import Airport, Route
+from airports.codes import resolve_airport_code
+from config.caching import CachedResponseMixin
+from config.conditional import ConditionalGetMixin
+from config.export import ExportView
+from config.pagination import KeysetPagination
 from config.permissions import IsAdminOrIfAuthenticatedReadOnly
 from flights.models import (
     Flight,
@@ -18,19 +32,42 @@ from flights.serializers import (
     FlightSerializer,
     FlightListSerializer,
     FlightDetailSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
+    SeatAllocationSerializer,
+)
+from flights.allocation import SeatAllocator
+from flights.filters import (
+    departure_range,
+    filter_flights,
+    filter_seats_available,
+    flight_ordering,
+    get_timezone,
+    route_filter,
 )
+from flights.itineraries import find_itineraries, get_route_graph
+from flights.renderers import BinaryRenderer
+from flights.search_cache import FlightSearchCacheMixin
+from flights.seat_map import decode_seat_map, get_seat_map
+from orders.seats import active_held_seats, hold_seats
+from orders.serializers import SeatHoldSerializer
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     permission_classes = [IsAdminOrIfAuthenticatedReadOnly]
+    cache_models = [AirplaneType]
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(
+    ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet
+):
     queryset = Airplane.objects.select_related("airplane_type")
     serializer_class = AirplaneSerializer
     permission_classes = [IsAdminOrIfAuthenticatedReadOnly]
+    cache_models = [Airplane, AirplaneType]
+    etag_models = [AirplaneType]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -46,7 +83,9 @@ class CrewViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
 
 
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(
+    ConditionalGetMixin, FlightSearchCacheMixin, viewsets.ModelViewSet
+):
     queryset = Flight.objects.select_related(
         "airplane__airplane_type",
         "route__source",
@@ -54,12 +93,19 @@ class FlightViewSet(viewsets.ModelViewSet):
     ).prefetch_related("crew")
     serializer_class = FlightSerializer
     permission_classes = [IsAdminOrIfAuthenticatedReadOnly]
+    pagination_class = KeysetPagination
+    etag_models = [Route, Airport, Airplane, AirplaneType]
+    etag_fields = [(Flight, "seats_sold")]
 
     def get_serializer_class(self):
         if self.action == "list":
             return FlightListSerializer
         elif self.action == "retrieve":
             return FlightDetailSerializer
+        elif self.action == "holds":
+            return SeatHoldSerializer
+        elif self.action == "allocate":
+            return SeatAllocationSerializer
         return FlightSerializer
 
     def get_queryset(self):
@@ -68,20 +114,216 @@ class FlightViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             queryset = queryset.prefetch_related("tickets")
 
+        params = self.request.query_params
+        queryset = filter_flights(queryset, params)
+
+        if self.action == "list":
+            queryset = filter_seats_available(
+                queryset.with_seats_available(), params
+            )
+
+        return queryset
+
+    def get_search_cache_params(self):
+        params = self.request.query_params
+        normalized = {}
+
+        for param in ("source", "destination"):
+            value = params.get(param, "").strip()
+            if value:
+                airport_id = resolve_airport_code(value)
+                normalized[param] = (
+                    f"id:{airport_id}" if airport_id else value.upper()
+                )
+        normalized["departure"] = [
+            bound.isoformat() if bound else None
+            for bound in departure_range(params)
+        ]
+        for param in (
+            "source_id",
+            "destination_id",
+            "min_seats_available",
+            "ordering",
+            "cursor",
+            "page_size",
+        ):
+            if params.get(param):
+                normalized[param] = params[param]
+        return normalized
+
+    def get_search_route_ids(self):
+        routes = route_filter(self.request.query_params)
+        if not routes:
+            return None
+        return sorted(
+            Route.objects.filter(routes).values_list("id", flat=True)
+        )
+
+    def get_throttles(self):
         if self.action == "list":
-            queryset = queryset.annotate(tickets_count=Count("tickets"))
+            self.throttle_scope = "flight_search"
+        return super().get_throttles()
+
+    def get_pagination_ordering(self):
+        return flight_ordering(self.request.query_params)
 
-        source = self.request.query_params.get("source")
-        destination = self.request.query_params.get("destination")
-        date = self.request.query_params.get("date")
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="holds",
+        permission_classes=[IsAuthenticated]
+    )
+    def holds(self, request, pk=None):
+        """Reserve seats on the flight for a short time before ordering"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        hold = hold_seats(
+            request.user,
+            pk,
+            [
+                (seat["row"], seat["seat"])
+                for seat in serializer.validated_data["seats"]
+            ]
+        )
+        return Response(
+            self.get_serializer(hold).data,
+            status=status.HTTP_201_CREATED
+        )
 
-        if source:
-            queryset = queryset.filter(route__source__name__icontains=source)
-        if destination:
-            queryset = queryset.filter(
-                route__destination__name__icontains=destination
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="seat-map",
+        renderer_classes=[JSONRenderer, BrowsableAPIRenderer, BinaryRenderer]
+    )
+    def seat_map(self, request, pk=None):
+        """
+        Taken seats as a bitset of rows x seats_in_row bits.
+
+        Bit `(row - 1) * seats_in_row + (seat - 1)`, counted from the most
+        significant bit of the first byte, is set for every sold seat.
+        Request `application/octet-stream` to get the raw bytes.
+        """
+        flight = get_object_or_404(
+            Flight.objects.select_related("airplane"),
+            pk=pk
+        )
+        bitmap = get_seat_map(flight)
+        layout = {
+            "rows": flight.airplane.rows,
+            "seats_in_row": flight.airplane.seats_in_row,
+        }
+
+        if request.accepted_renderer.format == BinaryRenderer.format:
+            return Response(
+                bitmap,
+                headers={
+                    "X-Seat-Map-Rows": str(layout["rows"]),
+                    "X-Seat-Map-Seats-In-Row": str(layout["seats_in_row"]),
+                }
             )
-        if date:
-            queryset = queryset.filter(departure_time__date=date)
+        return Response(
+            {
+                "flight": flight.id,
+                **layout,
+                "encoding": "base64",
+                "bitmap": base64.b64encode(bitmap).decode(),
+            }
+        )
 
-        return queryset
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="allocate",
+        permission_classes=[IsAuthenticated]
+    )
+    def allocate(self, request, pk=None):
+        """
+        Suggest blocks of adjacent free seats for one or more parties.
+
+        Seats are not reserved: hold the suggested seats to keep them.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        flight = get_object_or_404(
+            Flight.objects.select_related("airplane"),
+            pk=pk
+        )
+        airplane = flight.airplane
+        taken = list(
+            decode_seat_map(get_seat_map(flight), airplane.seats_in_row)
+        )
+        taken.extend(active_held_seats(flight.pk))
+
+        allocator = SeatAllocator(airplane.rows, airplane.seats_in_row, taken)
+        sizes = serializer.validated_data["party_sizes"]
+        return Response(
+            {
+                "flight": flight.id,
+                "parties": [
+                    {
+                        "size": size,
+                        "seats": (
+                            [{"row": row, "seat": seat} for row, seat in seats]
+                            if seats is not None
+                            else None
+                        ),
+                    }
+                    for size, seats in zip(
+                        sizes, allocator.allocate_many(sizes), strict=True
+                    )
+                ],
+            }
+        )
+
+
+class ItineraryView(generics.GenericAPIView):
+    serializer_class = ItinerarySerializer
+    permission_classes = [IsAuthenticated]
+    throttle_scope = "flight_search"
+
+    def get(self, request):
+        """Direct and 1-2 stop connections between two airports on a day"""
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        params = search.validated_data
+
+        day_start = timezone.make_aware(
+            datetime.combine(params["date"], time.min),
+            get_timezone(params.get("tz"))
+        )
+        itineraries = find_itineraries(
+            params["source"],
+            params["destination"],
+            day_start,
+            max_stops=params["max_stops"],
+            limit=params["limit"],
+        )
+        serializer = self.get_serializer(
+            itineraries,
+            many=True,
+            context={
+                **self.get_serializer_context(),
+                "airports": get_route_graph().airports,
+            },
+        )
+        return Response(serializer.data)
+
+
+class FlightExportView(ExportView):
+    queryset = Flight.objects.annotate(
+        capacity=F("airplane__rows") * F("airplane__seats_in_row")
+    )
+    columns = {
+        "id": "id",
+        "route": "route_id",
+        "source": "route__source_id",
+        "destination": "route__destination_id",
+        "airplane": "airplane_id",
+        "departure_time": "departure_time",
+        "arrival_time": "arrival_time",
+        "capacity": "capacity",
+        "seats_sold": "seats_sold",
+    }
+    date_field = "departure_time"
+    filename = "flights"
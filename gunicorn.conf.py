@@ -0,0 +1,63 @@
+"""
+Gunicorn settings for production serving.
+
+By default each worker is a uvicorn event loop running the ASGI
+application, so async endpoints keep many slow clients open without a
+thread each. Set GUNICORN_WORKER_CLASS=gthread and
+GUNICORN_APP=config.wsgi:application to serve the WSGI path instead
+(e.g. to compare the two with benchmarks/concurrency.py).
+
+Workers default to one while state that must be shared between them
+is kept per process (the default locmem cache and local throttle
+store), and to 2 * CPUs + 1 once both live in shared stores. Asking for
+more than one worker with per-process state refuses to start.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = os.getenv("GUNICORN_APP", "config.asgi:application")
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+# Mirrors the defaults in config/settings.py.
+shared_state = (
+    os.getenv("CACHE_BACKEND", "locmem") != "locmem"
+    and os.getenv("THROTTLE_STORE", "local") == "redis"
+)
+workers = int(
+    os.getenv(
+        "GUNICORN_WORKERS",
+        multiprocessing.cpu_count() * 2 + 1 if shared_state else 1,
+    )
+)
+worker_class = os.getenv(
+    "GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker"
+)
+# Only used by gthread workers.
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+# uvicorn_worker keeps idle connections open this long.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10_000))
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+
+
+def on_starting(server):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from django.conf import settings
+
+    if server.cfg.workers > 1 and settings.THROTTLE_STORE != "redis":
+        raise RuntimeError(
+            f"THROTTLE_STORE={settings.THROTTLE_STORE!r} keeps a rate limit "
+            f"budget per worker, admitting up to {server.cfg.workers}x the "
+            "configured rates. Set THROTTLE_STORE=redis or "
+            "GUNICORN_WORKERS=1."
+        )
+    backend = settings.CACHES["default"]["BACKEND"]
+    if server.cfg.workers > 1 and backend.endswith(".LocMemCache"):
+        raise RuntimeError(
+            "CACHE_BACKEND=locmem gives every worker its own model versions, "
+            "so writes leave the other workers serving stale responses. Set "
+            "CACHE_BACKEND to file or redis, or GUNICORN_WORKERS=1."
+        )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from orders.models import Order, Ticket
+from orders.models import HeldSeat, Order, SeatHold, Ticket
 
 
 class TicketInline(admin.TabularInline):
@@ -20,3 +20,16 @@ class TicketAdmin(admin.ModelAdmin):
     list_display = ["id", "order", "flight", "row", "seat"]
     list_filter = ["flight"]
     search_fields = ["order__id", "flight__id"]
+
+
+class HeldSeatInline(admin.TabularInline):
+    model = HeldSeat
+    extra = 0
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ["id", "user", "flight", "created_at", "expires_at"]
+    list_filter = ["expires_at"]
+    search_fields = ["user__email", "flight__id"]
+    inlines = [HeldSeatInline]
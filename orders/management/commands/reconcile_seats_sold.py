@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Now
+
+from config.versioning import bump_field_version
+from flights.models import Flight
+from orders.models import Ticket
+
+
+class Command(BaseCommand):
+    """Django command to recount Flight.seats_sold from issued tickets."""
+
+    help = "Recount Flight.seats_sold from tickets and fix drifted counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report flights whose counters have drifted.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        tickets_count = Coalesce(
+            Subquery(
+                Ticket.objects.filter(flight=OuterRef("pk"))
+                .order_by()
+                .values("flight")
+                .annotate(total=Count("pk"))
+                .values("total"),
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+        with transaction.atomic():
+            drifted = (
+                Flight.objects.select_for_update()
+                .annotate(actual_seats_sold=tickets_count)
+                .exclude(seats_sold=F("actual_seats_sold"))
+                .values_list("pk", "seats_sold", "actual_seats_sold")
+            )
+            drifted = list(drifted)
+
+            for flight_id, stored, actual in drifted:
+                self.stdout.write(
+                    f"Flight #{flight_id}: seats_sold {stored} -> {actual}"
+                )
+
+            if not options["dry_run"] and drifted:
+                Flight.objects.filter(
+                    pk__in=[flight_id for flight_id, _, _ in drifted]
+                ).update(seats_sold=tickets_count, updated_at=Now())
+                # The UPDATE bypasses post_save, as in add_seats_sold.
+                bump_field_version(Flight, "seats_sold")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(drifted)} flight(s) with drifted seat counters"
+                + (" found." if options["dry_run"] else " reconciled.")
+            )
+        )
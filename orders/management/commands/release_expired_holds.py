@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from orders.seats import release_expired_holds
+
+
+class Command(BaseCommand):
+    """Django command to reclaim seats from expired holds."""
+
+    help = "Delete expired seat holds in bulk."
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        deleted = release_expired_holds()
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {deleted} expired hold object(s).")
+        )
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 from flights.models import Flight
 from users.models import User
@@ -15,6 +16,12 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="order_user_created_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} by {self.user} at {self.created_at}"
@@ -43,6 +50,12 @@ class Ticket(models.Model):
                 f"{self.flight} - Row {self.row}, "
                 f"Seat {self.seat}")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_flight_id = instance.__dict__.get("flight_id")
+        return instance
+
     def clean(self):
         if self.row > self.flight.airplane.rows:
             raise ValidationError(
@@ -57,3 +70,57 @@ class Ticket(models.Model):
     def save(self, *args, **kwargs):
         self.clean()
         super().save(*args, **kwargs)
+
+
+class SeatHold(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["flight", "expires_at"],
+                name="seathold_flight_expires_idx"
+            ),
+            models.Index(fields=["expires_at"], name="seathold_expires_idx"),
+        ]
+
+    def __str__(self):
+        return (f"Hold #{self.id} by {self.user} on "
+                f"Flight #{self.flight_id} until {self.expires_at}")
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+class HeldSeat(models.Model):
+    hold = models.ForeignKey(
+        SeatHold,
+        on_delete=models.CASCADE,
+        related_name="seats"
+    )
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="held_seats"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+
+    class Meta:
+        unique_together = ["flight", "row", "seat"]
+
+    def __str__(self):
+        return f"Row {self.row}, Seat {self.seat} ({self.hold})"
@@ -0,0 +1,178 @@
+from collections import Counter
+from datetime import timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+
+from flights.models import Flight
+from flights.seat_map import invalidate_seat_maps
+from orders.models import HeldSeat, Order, SeatHold, Ticket
+from users.models import User
+
+
+def seat_error(flight: Flight, row: int, seat: int, reason: str) -> dict:
+    return {"flight": flight.pk, "row": row, "seat": seat, "reason": reason}
+
+
+def find_seat_conflicts(
+    seats: Iterable[tuple[Flight, int, int]],
+    user: User | None = None
+) -> list[dict]:
+    """
+    Return every requested seat that cannot be booked.
+
+    Flights must come with their airplane loaded: bounds and duplicates
+    are checked in memory, while sold and held seats are looked up with
+    one set-based query each for the whole payload. Seats held by `user`
+    do not count as conflicts.
+    """
+    seats = list(seats)
+    conflicts = []
+    requested = Counter(
+        (flight.pk, row, seat) for flight, row, seat in seats
+    )
+    reported = set()
+
+    for flight, row, seat in seats:
+        airplane = flight.airplane
+        key = (flight.pk, row, seat)
+        if not 1 <= row <= airplane.rows:
+            conflicts.append(seat_error(flight, row, seat, "invalid_row"))
+        elif not 1 <= seat <= airplane.seats_in_row:
+            conflicts.append(seat_error(flight, row, seat, "invalid_seat"))
+        elif requested[key] > 1 and key not in reported:
+            conflicts.append(seat_error(flight, row, seat, "duplicate"))
+            reported.add(key)
+
+    if not seats:
+        return conflicts
+
+    lookup = {
+        "flight_id__in": {flight.pk for flight, _, _ in seats},
+        "row__in": {row for _, row, _ in seats},
+        "seat__in": {seat for _, _, seat in seats},
+    }
+    taken = set(
+        Ticket.objects.filter(**lookup).values_list("flight_id", "row", "seat")
+    )
+    held = HeldSeat.objects.filter(
+        hold__expires_at__gt=timezone.now(), **lookup
+    )
+    if user is not None:
+        held = held.exclude(hold__user=user)
+    held = set(held.values_list("flight_id", "row", "seat"))
+
+    for flight, row, seat in seats:
+        if (flight.pk, row, seat) in taken:
+            conflicts.append(seat_error(flight, row, seat, "taken"))
+        elif (flight.pk, row, seat) in held:
+            conflicts.append(seat_error(flight, row, seat, "held"))
+
+    return conflicts
+
+
+def active_held_seats(flight_id: int) -> list[tuple[int, int]]:
+    return list(
+        HeldSeat.objects.filter(
+            flight_id=flight_id,
+            hold__expires_at__gt=timezone.now()
+        ).values_list("row", "seat")
+    )
+
+
+def book_tickets(order: Order, tickets: list[Ticket]) -> list[Ticket]:
+    """Insert validated tickets in one statement and count the sold seats."""
+    try:
+        with transaction.atomic():
+            Ticket.objects.bulk_create(tickets)
+    except IntegrityError:
+        raise ValidationError(
+            {"seats": "Some seats were booked by another order, "
+                      "please try again."}
+        ) from None
+    sold = Counter(ticket.flight_id for ticket in tickets)
+    Flight.objects.add_seats_sold(sold)
+    invalidate_seat_maps(sold)
+    return tickets
+
+
+def release_expired_holds(flight_ids: Iterable[int] | None = None) -> int:
+    """Delete expired holds (and their seats) in bulk."""
+    holds = SeatHold.objects.filter(expires_at__lte=timezone.now())
+    if flight_ids is not None:
+        holds = holds.filter(flight_id__in=flight_ids)
+    deleted, _ = holds.delete()
+    return deleted
+
+
+def hold_seats(
+    user: User,
+    flight_id: int,
+    seats: list[tuple[int, int]]
+) -> SeatHold:
+    """
+    Reserve seats on a flight for SEAT_HOLD_TTL.
+
+    Hold creation is serialized per flight by locking the flight row, so
+    competing clients are rejected here instead of at order commit time.
+    """
+    ttl = getattr(settings, "SEAT_HOLD_TTL", timedelta(minutes=10))
+
+    with transaction.atomic():
+        flight = get_object_or_404(
+            Flight.objects.select_for_update(of=("self",))
+            .select_related("airplane"),
+            pk=flight_id
+        )
+        release_expired_holds(flight_ids=[flight.pk])
+
+        conflicts = find_seat_conflicts(
+            (flight, row, seat) for row, seat in seats
+        )
+        if conflicts:
+            raise ValidationError({"seats": conflicts})
+
+        hold = SeatHold.objects.create(
+            user=user,
+            flight=flight,
+            expires_at=timezone.now() + ttl
+        )
+        HeldSeat.objects.bulk_create(
+            HeldSeat(hold=hold, flight=flight, row=row, seat=seat)
+            for row, seat in seats
+        )
+    return hold
+
+
+def order_from_hold(user: User, hold_id: int) -> Order:
+    """Turn an active hold into an order and release the held seats."""
+    with transaction.atomic():
+        hold = (
+            SeatHold.objects.select_for_update()
+            .filter(pk=hold_id, user=user)
+            .first()
+        )
+        if hold is None:
+            raise ValidationError({"hold": "Hold does not exist."})
+        if hold.is_expired:
+            raise ValidationError({"hold": "Hold has expired."})
+
+        order = Order.objects.create(user=user)
+        book_tickets(
+            order,
+            [
+                Ticket(
+                    order=order,
+                    flight_id=hold.flight_id,
+                    row=row,
+                    seat=seat
+                )
+                for row, seat in hold.seats.values_list("row", "seat")
+            ]
+        )
+        hold.delete()
+    return order
@@ -4,12 +4,61 @@ from rest_framework.exceptions import ValidationError
 
 from orders.models import (
     Order,
-    Ticket
+    Ticket,
+    SeatHold
 )
+from orders.seats import book_tickets, find_seat_conflicts
+from flights.models import Flight
 from flights.serializers import FlightListSerializer
 
 
+class PrefetchedFlightField(serializers.PrimaryKeyRelatedField):
+    """Resolve flights from `prefetched` before falling back to a query."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.prefetched = {}
+
+    def to_internal_value(self, data):
+        try:
+            return self.prefetched[int(data)]
+        except (KeyError, TypeError, ValueError):
+            return super().to_internal_value(data)
+
+
+class BookingListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            flight_ids = set()
+            for item in data:
+                try:
+                    flight_ids.add(int(item["flight"]))
+                except (KeyError, TypeError, ValueError):
+                    continue
+            self.child.fields["flight"].prefetched = (
+                Flight.objects.select_related("airplane").in_bulk(flight_ids)
+            )
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        request = self.context.get("request")
+        conflicts = find_seat_conflicts(
+            (
+                (ticket["flight"], ticket["row"], ticket["seat"])
+                for ticket in attrs
+            ),
+            user=request.user if request else None
+        )
+        if conflicts:
+            raise ValidationError({"seats": conflicts})
+        return attrs
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = PrefetchedFlightField(
+        queryset=Flight.objects.select_related("airplane")
+    )
+
     class Meta:
         model = Ticket
         fields = [
@@ -18,15 +67,10 @@ class TicketSerializer(serializers.ModelSerializer):
             "row",
             "seat"
         ]
-
-    def validate(self, attrs):
-        data = super().validate(attrs)
-        flight = attrs["flight"]
-        row = attrs["row"]
-        seat = attrs["seat"]
-        if Ticket.objects.filter(flight=flight, row=row, seat=seat).exists():
-            raise ValidationError("Ticket already exists")
-        return data
+        list_serializer_class = BookingListSerializer
+        # Seat uniqueness is checked for the whole booking at once by
+        # find_seat_conflicts() and enforced by the unique constraint.
+        validators = []
 
 
 class TicketListSerializer(TicketSerializer):
@@ -42,6 +86,11 @@ class TicketListSerializer(TicketSerializer):
         ]
 
 
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
 class TicketSeatsSerializer(serializers.Serializer):
     class Meta:
         model = Ticket
@@ -66,8 +115,13 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
         order = Order.objects.create(**validated_data)
-        for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+        book_tickets(
+            order,
+            [
+                Ticket(order=order, **ticket_data)
+                for ticket_data in tickets_data
+            ]
+        )
         return order
 
 
@@ -77,3 +131,22 @@ class OrderListSerializer(OrderSerializer):
 
 class OrderDetailSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        model = SeatHold
+        fields = [
+            "id",
+            "flight",
+            "created_at",
+            "expires_at",
+            "seats"
+        ]
+        read_only_fields = ["flight", "created_at", "expires_at"]
+
+
+class OrderFromHoldSerializer(serializers.Serializer):
+    hold = serializers.IntegerField()
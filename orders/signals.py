@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from flights.models import Flight
+from flights.seat_map import invalidate_seat_maps
+from orders.models import Ticket
+
+_deletions = threading.local()
+
+
+class TicketDeletion:
+    """Tickets removed by one delete() call, with their seat deltas."""
+
+    def __init__(self, origin):
+        # Holding the origin keeps its id() from being reused meanwhile.
+        self.origin = origin
+        self.pending = set()
+        self.deltas = Counter()
+
+
+def _running_deletions() -> dict:
+    if not hasattr(_deletions, "running"):
+        _deletions.running = {}
+    return _deletions.running
+
+
+@receiver(post_save, sender=Ticket)
+def count_saved_ticket(sender, instance, created, **kwargs):
+    previous_flight_id = getattr(instance, "_loaded_flight_id", None)
+
+    if created:
+        Flight.objects.add_seats_sold({instance.flight_id: 1})
+    elif previous_flight_id and previous_flight_id != instance.flight_id:
+        Flight.objects.add_seats_sold(
+            {previous_flight_id: -1, instance.flight_id: 1}
+        )
+        invalidate_seat_maps([previous_flight_id])
+    invalidate_seat_maps([instance.flight_id])
+    instance._loaded_flight_id = instance.flight_id
+
+
+@receiver(pre_delete, sender=Ticket)
+def expect_deleted_ticket(sender, instance, origin, **kwargs):
+    # Django sends pre_delete for every ticket of a cascade before
+    # deleting any of them, then post_delete for each; counting them in
+    # lets the last post_delete apply all deltas in one UPDATE.
+    running = _running_deletions()
+    deletion = running.get(id(origin))
+    if deletion is None or instance.pk in deletion.pending:
+        # A ticket already pending means an earlier delete() of the same
+        # origin failed half way; start over.
+        deletion = running[id(origin)] = TicketDeletion(origin)
+    deletion.pending.add(instance.pk)
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, origin, **kwargs):
+    running = _running_deletions()
+    deletion = running[id(origin)]
+    deletion.pending.discard(instance.pk)
+    deletion.deltas[instance.flight_id] -= 1
+    if deletion.pending:
+        return
+
+    del running[id(origin)]
+    Flight.objects.add_seats_sold(deletion.deltas)
+    invalidate_seat_maps(list(deletion.deltas))
@@ -1,10 +1,16 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from orders.views import OrderViewSet
+from orders.views import OrderExportView, OrderViewSet, TicketExportView
 
 router = DefaultRouter()
 router.register("orders", OrderViewSet, basename="orders")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("export/orders/", OrderExportView.as_view(), name="order-export"),
+    path(
+        "export/tickets/", TicketExportView.as_view(), name="ticket-export"
+    ),
+] + router.urls
 
 app_name = "orders"
@@ -1,18 +1,26 @@
 from django.db.models import Prefetch
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from config.export import ExportView
+from config.pagination import KeysetPagination
 from orders.models import Order, Ticket
+from orders.seats import order_from_hold
 from orders.serializers import (
     OrderSerializer,
     OrderListSerializer,
-    OrderDetailSerializer
+    OrderDetailSerializer,
+    OrderFromHoldSerializer
 )
 
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    pagination_ordering = ["-created_at", "-id"]
 
     def get_queryset(self):
         return Order.objects.filter(user=self.request.user).prefetch_related(
@@ -26,12 +34,58 @@ class OrderViewSet(viewsets.ModelViewSet):
             )
         )
 
+    def get_throttles(self):
+        if self.action in ("create", "from_hold"):
+            self.throttle_scope = "orders"
+        return super().get_throttles()
+
     def get_serializer_class(self):
         if self.action == "list":
             return OrderListSerializer
         if self.action == "retrieve":
             return OrderDetailSerializer
+        if self.action == "from_hold":
+            return OrderFromHoldSerializer
         return OrderSerializer
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=["post"], url_path="from-hold")
+    def from_hold(self, request):
+        """Create an order from the seats of an active hold"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = order_from_hold(
+            request.user,
+            serializer.validated_data["hold"]
+        )
+        return Response(
+            OrderSerializer(order, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class OrderExportView(ExportView):
+    queryset = Order.objects.all()
+    columns = {"id": "id", "user": "user_id", "created_at": "created_at"}
+    date_field = "created_at"
+    filename = "orders"
+
+
+class TicketExportView(ExportView):
+    """Tickets by the time they were ordered."""
+
+    queryset = Ticket.objects.all()
+    columns = {
+        "id": "id",
+        "order": "order_id",
+        "user": "order__user_id",
+        "ordered_at": "order__created_at",
+        "flight": "flight_id",
+        "departure_time": "flight__departure_time",
+        "row": "row",
+        "seat": "seat",
+    }
+    date_field = "order__created_at"
+    filename = "tickets"
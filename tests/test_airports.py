@@ -0,0 +1,382 @@
+import tempfile
+from io import StringIO
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airports.autocomplete import AutocompleteIndex
+from airports.distances import (
+    build_distance_matrix,
+    dijkstra,
+    floyd_warshall,
+    get_distance_matrix,
+    relax_edges,
+)
+from airports.geo import covering_cells, encode_geohash, haversine
+from airports.models import Airport, Route
+
+AUTOCOMPLETE_URL = reverse("airports:airport-autocomplete")
+DISTANCES_URL = reverse("airports:airport-distances")
+NEARBY_URL = reverse("airports:airport-nearby")
+AIRPORT_URL = reverse("airports:airport-list")
+ROUTE_URL = reverse("airports:routes-list")
+
+
+class AutocompleteIndexTest(SimpleTestCase):
+    """Test suite for the in-memory airport prefix index"""
+
+    def setUp(self):
+        self.index = AutocompleteIndex(
+            [
+                (1, "Kyiv Boryspil", "Kyiv"),
+                (2, "Lviv Danylo Halytskyi", "Lviv"),
+                (3, "Zürich Airport", "Zurich"),
+                (4, "Kraków John Paul II", "Krakow"),
+            ]
+        )
+
+    def _ids(self, query, limit=10):
+        return [airport["id"] for airport in self.index.search(query, limit)]
+
+    def test_prefix_matches_name_city_and_words(self):
+        """Test prefixes match the name, the city and inner words"""
+        self.assertEqual(self._ids("kyiv"), [1])
+        self.assertEqual(self._ids("bory"), [1])
+        self.assertEqual(self._ids("halyt"), [2])
+
+    def test_accents_and_case_are_ignored(self):
+        """Test queries are normalized like the indexed names"""
+        self.assertEqual(self._ids("ZURI"), [3])
+        self.assertEqual(self._ids("krako"), [4])
+
+    def test_name_prefix_ranks_first_and_limit_applies(self):
+        """Test name prefixes beat inner words and results are capped"""
+        self.assertEqual(self._ids("k"), [4, 1])
+        self.assertEqual(self._ids("k", limit=1), [4])
+        self.assertEqual(self._ids(""), [])
+
+
+class AutocompleteApiTest(TestCase):
+    """Test suite for the airport autocomplete endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="customer@example.com", password="pass123"
+            )
+        )
+        self.airport = Airport.objects.create(
+            name="Boryspil", closest_big_city="Kyiv"
+        )
+
+    def test_autocomplete_served_without_queries(self):
+        """Test warm autocomplete requests do not touch the database"""
+        self.client.get(AUTOCOMPLETE_URL, {"q": "bor"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(AUTOCOMPLETE_URL, {"q": "bor"})
+
+        self.assertEqual(response.data[0]["id"], self.airport.id)
+
+    def test_index_rebuilt_after_airport_change(self):
+        """Test saving an airport makes it searchable"""
+        self.client.get(AUTOCOMPLETE_URL, {"q": "bor"})
+        Airport.objects.create(name="Chopin", closest_big_city="Warsaw")
+
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "war"})
+
+        self.assertEqual(response.data[0]["name"], "Chopin")
+
+
+class ShortestDistanceTest(SimpleTestCase):
+    """Test suite for the all-pairs distance algorithms"""
+
+    edges = np.array(
+        [(0, 1, 5), (1, 2, 3), (0, 2, 10), (2, 3, 1)], dtype=np.int64
+    )
+
+    def test_floyd_warshall_and_dijkstra_agree(self):
+        """Test both algorithms produce the same shortest distances"""
+        matrix = floyd_warshall(5, self.edges)
+
+        self.assertEqual(matrix[0, 2], 8)
+        self.assertEqual(matrix[0, 3], 9)
+        self.assertTrue(np.isinf(matrix[3, 0]))
+        self.assertTrue(np.isinf(matrix[0, 4]))
+        np.testing.assert_array_equal(matrix, dijkstra(5, self.edges))
+
+    def test_relaxing_new_edge_matches_full_rebuild(self):
+        """Test incremental updates equal a recomputation"""
+        new_edge = np.array([(3, 4, 2), (0, 3, 4)], dtype=np.int64)
+
+        relaxed = relax_edges(floyd_warshall(5, self.edges), new_edge)
+
+        np.testing.assert_array_equal(
+            relaxed, floyd_warshall(5, np.vstack([self.edges, new_edge]))
+        )
+
+
+class DistanceMatrixApiTest(TestCase):
+    """Test suite for the persisted distance matrix and its endpoint"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(
+            DISTANCE_MATRIX_DIR=directory.name
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="customer@example.com", password="pass123"
+            )
+        )
+        self.kyiv, self.lviv, self.warsaw = (
+            Airport.objects.create(name=name, closest_big_city=city)
+            for name, city in (
+                ("Boryspil", "Kyiv"),
+                ("Danylo Halytskyi", "Lviv"),
+                ("Chopin", "Warsaw"),
+            )
+        )
+        Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=470
+        )
+        Route.objects.create(
+            source=self.lviv, destination=self.warsaw, distance=330
+        )
+
+    def _distance(self, source, destination):
+        response = self.client.get(
+            DISTANCES_URL, {"source": source.id, "destination": destination.id}
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data["distance"]
+
+    def test_unbuilt_matrix_is_unavailable(self):
+        """Test the endpoint reports a missing matrix"""
+        response = self.client.get(DISTANCES_URL, {"source": self.kyiv.id})
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_shortest_distances_served_from_matrix(self):
+        """Test connecting distances and unreachable pairs"""
+        call_command("build_distance_matrix", stdout=StringIO())
+
+        self.assertEqual(self._distance(self.kyiv, self.warsaw), 800)
+        self.assertIsNone(self._distance(self.warsaw, self.kyiv))
+
+        response = self.client.get(DISTANCES_URL, {"source": self.lviv.id})
+        self.assertEqual(
+            response.data["distances"], {self.lviv.id: 0, self.warsaw.id: 330}
+        )
+        self.assertEqual(
+            get_distance_matrix().unreachable_to(self.lviv.id),
+            {self.warsaw.id},
+        )
+
+    def test_new_route_applied_incrementally(self):
+        """Test a shorter route is relaxed into the stored matrix"""
+        build_distance_matrix()
+        Route.objects.create(
+            source=self.kyiv, destination=self.warsaw, distance=690
+        )
+
+        self.assertEqual(build_distance_matrix()["mode"], "incremental")
+        self.assertEqual(self._distance(self.kyiv, self.warsaw), 690)
+
+    def test_route_change_marks_matrix_stale(self):
+        """Test the endpoint flags a matrix built before a route change"""
+        build_distance_matrix()
+        response = self.client.get(DISTANCES_URL, {"source": self.kyiv.id})
+        self.assertFalse(response.data["stale"])
+
+        Route.objects.create(
+            source=self.warsaw, destination=self.kyiv, distance=690
+        )
+        response = self.client.get(DISTANCES_URL, {"source": self.kyiv.id})
+        self.assertTrue(response.data["stale"])
+
+        build_distance_matrix()
+        response = self.client.get(DISTANCES_URL, {"source": self.kyiv.id})
+        self.assertFalse(response.data["stale"])
+
+    def test_removed_route_triggers_full_rebuild(self):
+        """Test deleting a route recomputes the matrix"""
+        build_distance_matrix()
+        Route.objects.filter(source=self.lviv).delete()
+
+        self.assertEqual(build_distance_matrix()["mode"], "full")
+        self.assertIsNone(self._distance(self.kyiv, self.warsaw))
+
+
+class GeoTest(SimpleTestCase):
+    """Test suite for geohash cells and haversine distances"""
+
+    def test_haversine_known_distance(self):
+        """Test Kyiv-Lviv great-circle distance"""
+        self.assertAlmostEqual(
+            float(haversine(50.345, 30.8947, 49.8125, 23.9561)), 498, delta=1
+        )
+
+    def test_covering_cells_contain_points_on_the_circle(self):
+        """Test every point within the radius falls in a covering cell"""
+        cells = covering_cells(50.0, 30.0, 50)
+
+        self.assertLessEqual(len(cells), 4)
+        for latitude, longitude in ((50.44, 30.0), (50.0, 30.69), (50, 30)):
+            self.assertTrue(
+                any(
+                    encode_geohash(latitude, longitude).startswith(cell)
+                    for cell in cells
+                )
+            )
+
+    def test_huge_radius_disables_prefix_filter(self):
+        """Test circles larger than any cell are not prefix-filtered"""
+        self.assertEqual(covering_cells(50.0, 30.0, 8000), set())
+
+
+class AirportGeoApiTest(TestCase):
+    """Test suite for nearby airports and route distance recomputation"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="customer@example.com", password="pass123"
+            )
+        )
+        self.kyiv = Airport.objects.create(
+            name="Boryspil",
+            closest_big_city="Kyiv",
+            latitude=50.345,
+            longitude=30.8947,
+        )
+        self.zhuliany = Airport.objects.create(
+            name="Zhuliany",
+            closest_big_city="Kyiv",
+            latitude=50.4017,
+            longitude=30.4497,
+        )
+        self.lviv = Airport.objects.create(
+            name="Danylo Halytskyi",
+            closest_big_city="Lviv",
+            latitude=49.8125,
+            longitude=23.9561,
+        )
+        Airport.objects.create(name="Unknown", closest_big_city="Nowhere")
+
+    def test_geohash_set_on_save(self):
+        """Test saving coordinates stores the geohash"""
+        self.assertEqual(
+            self.kyiv.geohash, encode_geohash(50.345, 30.8947)
+        )
+
+    def test_nearby_airports_sorted_by_distance(self):
+        """Test only airports inside the radius are returned, nearest first"""
+        response = self.client.get(
+            NEARBY_URL, {"lat": 50.45, "lon": 30.52, "radius": 100}
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            [airport["id"] for airport in response.data],
+            [self.zhuliany.id, self.kyiv.id],
+        )
+
+    def test_nearby_validates_coordinates(self):
+        """Test out-of-range coordinates are rejected"""
+        response = self.client.get(NEARBY_URL, {"lat": 91, "lon": 0})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_recompute_route_distances(self):
+        """Test route distances are replaced by haversine distances"""
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=1
+        )
+
+        call_command("recompute_route_distances", stdout=StringIO())
+
+        route.refresh_from_db()
+        self.assertEqual(route.distance, 498)
+
+    def test_recompute_skips_airports_without_longitude(self):
+        """Test half-located airports keep their route distance"""
+        nowhere = Airport.objects.create(
+            name="Nowhere", closest_big_city="Nowhere", latitude=50.0
+        )
+        route = Route.objects.create(
+            source=self.kyiv, destination=nowhere, distance=123
+        )
+
+        call_command("recompute_route_distances", stdout=StringIO())
+
+        route.refresh_from_db()
+        self.assertEqual(route.distance, 123)
+
+
+class AirportCodeTest(TestCase):
+    """Test suite for IATA/ICAO airport codes"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@example.com", password="pass123"
+            )
+        )
+        self.kyiv = Airport.objects.create(
+            name="Boryspil",
+            closest_big_city="Kyiv",
+            iata_code="KBP",
+            icao_code="UKBB",
+        )
+        self.lviv = Airport.objects.create(
+            name="Danylo Halytskyi", closest_big_city="Lviv"
+        )
+        self.route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=470
+        )
+        Route.objects.create(
+            source=self.lviv, destination=self.kyiv, distance=470
+        )
+
+    def test_codes_are_upper_cased_and_unique(self):
+        """Test codes are normalized before the unique check"""
+        response = self.client.post(
+            AIRPORT_URL,
+            {"name": "Other", "closest_big_city": "Kyiv", "iata_code": "kbp"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("iata_code", response.data)
+
+    def test_airports_without_codes_do_not_collide(self):
+        """Test blank codes are stored as NULL"""
+        response = self.client.post(
+            AIRPORT_URL,
+            {"name": "Other", "closest_big_city": "Lviv", "iata_code": ""},
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertIsNone(Airport.objects.get(name="Other").iata_code)
+
+    def test_routes_filtered_by_code(self):
+        """Test route endpoints accept IATA and ICAO codes"""
+        for code in ("KBP", "ukbb"):
+            response = self.client.get(ROUTE_URL, {"source": code})
+
+            self.assertEqual(
+                [route["id"] for route in response.data["results"]],
+                [self.route.id],
+            )
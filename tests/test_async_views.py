@@ -0,0 +1,114 @@
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.throttling import get_token_bucket_store
+from tests.test_flight_search import UTC, FlightFixtureMixin
+
+ASYNC_FLIGHT_LIST_URL = reverse("flights:async-flight-list")
+FLIGHT_LIST_URL = reverse("flights:flight-list")
+
+
+def async_detail_url(flight_id):
+    return reverse("flights:async-flight-detail", args=[flight_id])
+
+
+def async_seat_map_url(flight_id):
+    return reverse("flights:async-flight-seat-map", args=[flight_id])
+
+
+class AsyncFlightViewsTest(FlightFixtureMixin, TestCase):
+    """Test suite for the async flight read endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        get_token_bucket_store().clear()
+        self.async_client = AsyncClient()
+        self.auth = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        self.first = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 8, 0, tzinfo=UTC)
+        )
+        self.second = self._flight(
+            self.lviv_warsaw, datetime(2030, 5, 1, 12, 0, tzinfo=UTC)
+        )
+
+    async def test_list_matches_sync_list(self):
+        """Test the async search returns the same page as the viewset"""
+        params = {"source": "Boryspil", "date": "2030-05-01"}
+
+        response = await self.async_client.get(
+            ASYNC_FLIGHT_LIST_URL, params, headers=self.auth
+        )
+
+        self.assertEqual(response.status_code, 200)
+        expected = await self._sync_list(params)
+        self.assertEqual(response.json()["results"], expected)
+        self.assertEqual(
+            [flight["id"] for flight in expected], [self.first.id]
+        )
+
+    async def _sync_list(self, params):
+        response = await sync_to_async(self.client.get)(
+            FLIGHT_LIST_URL, params
+        )
+        return response.json()["results"]
+
+    async def test_list_paginates(self):
+        """Test the keyset cursor walks the async results"""
+        response = await self.async_client.get(
+            ASYNC_FLIGHT_LIST_URL, {"page_size": 1}, headers=self.auth
+        )
+        page = response.json()
+        self.assertEqual(page["results"][0]["id"], self.second.id)
+
+        response = await self.async_client.get(
+            page["next"], headers=self.auth
+        )
+
+        self.assertEqual(response.json()["results"][0]["id"], self.first.id)
+
+    async def test_invalid_filter(self):
+        """Test validation errors use the DRF error format"""
+        response = await self.async_client.get(
+            ASYNC_FLIGHT_LIST_URL,
+            {"min_seats_available": "many"},
+            headers=self.auth,
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("min_seats_available", response.json())
+
+    async def test_requires_authentication(self):
+        """Test anonymous requests are rejected"""
+        response = await AsyncClient().get(ASYNC_FLIGHT_LIST_URL)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response)
+
+    async def test_detail(self):
+        """Test the async detail includes crew and taken seats"""
+        response = await self.async_client.get(
+            async_detail_url(self.first.id), headers=self.auth
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["taken_seats"], [])
+        response = await self.async_client.get(
+            async_detail_url(0), headers=self.auth
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def test_seat_map(self):
+        """Test the async seat map has the layout and an empty bitmap"""
+        response = await self.async_client.get(
+            async_seat_map_url(self.first.id), headers=self.auth
+        )
+
+        data = response.json()
+        self.assertEqual((data["rows"], data["seats_in_row"]), (10, 4))
+        self.assertEqual(data["bitmap"], "AAAAAAA=")
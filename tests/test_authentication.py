@@ -0,0 +1,309 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from config.versioning import bump_object_version
+from users.authentication import UserCache, user_cache
+from users.hashing import hash_password, password_hash_pool
+from users.models import RevokedToken
+from users.revocation import BloomFilter, revocation_list
+
+ME_URL = reverse("user:manage")
+LOGOUT_URL = reverse("user:logout")
+REVOKE_URL = reverse("user:token_revoke")
+REFRESH_URL = reverse("user:token_refresh")
+VERIFY_URL = reverse("user:token_verify")
+REGISTER_URL = reverse("user:create")
+TOKEN_URL = reverse("user:token_obtain_pair")
+ASYNC_REGISTER_URL = reverse("user:async_create")
+ASYNC_TOKEN_URL = reverse("user:async_token_obtain_pair")
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    """Test suite for cached JWT user resolution"""
+
+    def setUp(self):
+        user_cache.clear()
+        revocation_list.reset()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_repeated_requests_skip_user_query(self):
+        """Test a warm cache authenticates without touching the database"""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data["email"], "customer@example.com")
+
+    def test_profile_update_invalidates_cache(self):
+        """Test ManageUserView updates are visible on the next request"""
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {"email": "renamed@example.com"})
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data["email"], "renamed@example.com")
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivation takes effect despite a cached user"""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_other_process_invalidation_via_version(self):
+        """Test a version bump alone drops the local entry"""
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            email="elsewhere@example.com"
+        )
+        # What the signal does in the worker that saved the user.
+        bump_object_version(get_user_model(), self.user.pk)
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.data["email"], "elsewhere@example.com")
+
+    def test_full_cache_evicts_least_recently_used(self):
+        """Test a full cache drops one stale entry, not all of them"""
+        cache = UserCache(max_size=2)
+        cache.set("1", 1, "first", ttl=60)
+        cache.set("2", 1, "second", ttl=60)
+        cache.get("1", 1)
+
+        cache.set("3", 1, "third", ttl=60)
+
+        self.assertEqual(cache.get("1", 1), "first")
+        self.assertIsNone(cache.get("2", 1))
+        self.assertEqual(cache.get("3", 1), "third")
+
+
+class TokenRevocationTest(TestCase):
+    """Test suite for logout and token revocation"""
+
+    def setUp(self):
+        user_cache.clear()
+        revocation_list.reset()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = self.refresh.access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+    def test_logout_rejects_access_token(self):
+        """Test the access token stops working after logout"""
+        response = self.client.post(LOGOUT_URL, {"refresh": str(self.refresh)})
+        self.assertEqual(response.status_code, 204)
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_rejects_refresh_token(self):
+        """Test a refresh token revoked on logout cannot be refreshed"""
+        self.client.post(LOGOUT_URL, {"refresh": str(self.refresh)})
+
+        response = APIClient().post(
+            REFRESH_URL, {"refresh": str(self.refresh)}
+        )
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_logout_rejects_foreign_refresh_token(self):
+        """Test logout cannot revoke another user's refresh token"""
+        other = get_user_model().objects.create_user(
+            email="other@example.com", password="pass123"
+        )
+
+        response = self.client.post(
+            LOGOUT_URL, {"refresh": str(RefreshToken.for_user(other))}
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_revoke_endpoint(self):
+        """Test a revoked token fails verification"""
+        response = APIClient().post(REVOKE_URL, {"token": str(self.access)})
+        self.assertEqual(response.status_code, 204)
+
+        response = APIClient().post(VERIFY_URL, {"token": str(self.access)})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_unrevoked_token_skips_revocation_query(self):
+        """Test a warm filter answers negatives without the database"""
+        other = RefreshToken.for_user(self.user)
+        APIClient().post(REVOKE_URL, {"token": str(other)})
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(REVOKED_SYNC_INTERVAL=0)
+    def test_revocation_seen_without_version_bump(self):
+        """Test rows revoked by another worker are found after the interval"""
+        self.client.get(ME_URL)
+        # Another worker's cache bumped its own version, not this one.
+        RevokedToken.objects.create(
+            jti=self.access["jti"],
+            user=self.user,
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_bloom_filter(self):
+        """Test added values are always reported as present"""
+        bloom = BloomFilter(1000, 0.01)
+        values = [f"jti-{i}" for i in range(1000)]
+        for value in values:
+            bloom.add(value)
+
+        self.assertTrue(all(value in bloom for value in values))
+        false_positives = sum(
+            f"other-{i}" in bloom for i in range(10_000)
+        )
+        self.assertLess(false_positives, 300)
+
+
+class PasswordHashPoolTest(TestCase):
+    """Test suite for pooled password hashing"""
+
+    def setUp(self):
+        password_hash_pool.reset()
+        self.addCleanup(password_hash_pool.reset)
+
+    def test_register_and_obtain_token(self):
+        """Test registration and login hash through the pool"""
+        payload = {"email": "new@example.com", "password": "pass12345"}
+
+        response = self.client.post(REGISTER_URL, payload)
+        self.assertEqual(response.status_code, 201)
+        user = get_user_model().objects.get(email="new@example.com")
+        self.assertTrue(user.check_password("pass12345"))
+
+        response = self.client.post(TOKEN_URL, payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+
+        response = self.client.post(
+            TOKEN_URL, {"email": "new@example.com", "password": "wrong"}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(password_hash_pool.metrics()["completed"], 3)
+
+    def test_async_obtain_token(self):
+        """Test the async view issues tokens through the hash pool"""
+        user = get_user_model().objects.create_user(
+            email="async@example.com", password="pass12345"
+        )
+
+        response = self.client.post(
+            ASYNC_TOKEN_URL,
+            {"email": "async@example.com", "password": "pass12345"},
+        )
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.json()["access"])
+        self.assertEqual(access["user_id"], str(user.id))
+
+        response = self.client.post(
+            ASYNC_TOKEN_URL, {"email": "async@example.com", "password": "x"}
+        )
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(ASYNC_TOKEN_URL, {"email": "a@b.com"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json())
+        self.assertEqual(password_hash_pool.metrics()["completed"], 2)
+
+    def test_async_register(self):
+        """Test the async view registers users through the hash pool"""
+        payload = {"email": "new@example.com", "password": "pass12345"}
+
+        response = self.client.post(ASYNC_REGISTER_URL, payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("password", response.json())
+        user = get_user_model().objects.get(email="new@example.com")
+        self.assertTrue(user.check_password("pass12345"))
+
+        response = self.client.post(ASYNC_REGISTER_URL, payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("email", response.json())
+        self.assertEqual(password_hash_pool.metrics()["completed"], 1)
+
+    @override_settings(PASSWORD_HASH_WORKERS=1)
+    def test_pool_processes_start_from_forkserver(self):
+        """Test pool processes are not forked from the serving worker"""
+        encoded = hash_password("pass12345")
+
+        user = get_user_model()(email="pool@example.com", password=encoded)
+        self.assertTrue(user.check_password("pass12345"))
+        self.assertEqual(
+            password_hash_pool.executor._mp_context.get_start_method(),
+            "forkserver",
+        )
+
+    @override_settings(PASSWORD_HASH_QUEUE_SIZE=0)
+    def test_saturated_pool_returns_429(self):
+        """Test logins are rejected instead of queued when saturated"""
+        get_user_model().objects.create_user(
+            email="busy@example.com", password="pass12345"
+        )
+
+        response = self.client.post(
+            TOKEN_URL, {"email": "busy@example.com", "password": "pass12345"}
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(password_hash_pool.metrics()["rejected"], 1)
+
+    def test_import_users(self):
+        """Test the bulk import creates users and skips known emails"""
+        get_user_model().objects.create_user(
+            email="known@example.com", password="pass12345"
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as f:
+            f.write(
+                "email,password,first_name\n"
+                "known@example.com,secret1,Known\n"
+                "a@example.com,secret2,Ann\n"
+                "b@example.com,secret3,\n"
+                "a@example.com,secret4,Duplicate\n"
+            )
+            f.flush()
+            call_command(
+                "import_users",
+                f.name,
+                workers=0,
+                batch_size=2,
+                stdout=StringIO(),
+            )
+
+        ann = get_user_model().objects.get(email="a@example.com")
+        self.assertEqual(ann.first_name, "Ann")
+        self.assertTrue(ann.check_password("secret2"))
+        self.assertEqual(get_user_model().objects.count(), 3)
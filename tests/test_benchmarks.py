@@ -0,0 +1,448 @@
+import json
+import math
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from itertools import count
+from pathlib import Path
+from string import ascii_uppercase
+from unittest import mock, skipIf
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airports.models import Airport, Route
+from config.synthetic import DatasetGenerator
+from config.throttling import get_token_bucket_store
+from flights.models import Airplane, AirplaneType, Crew, Flight
+from orders.models import Order
+from tests.test_flight_search import UTC
+
+BUDGETS_PATH = Path(settings.BASE_DIR) / "benchmarks" / "budgets.json"
+ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", "20"))
+# Scales latency budgets for slower or faster machines.
+LATENCY_FACTOR = float(os.getenv("BENCHMARK_LATENCY_FACTOR", "1"))
+RESULTS_PATH = os.getenv("BENCHMARK_RESULTS")
+UPDATE_BUDGETS = os.getenv("BENCHMARK_UPDATE_BUDGETS") == "1"
+DATASET = {
+    "airports": 200,
+    "routes": 2000,
+    "airplane_types": 6,
+    "airplanes": 40,
+    "crew": 100,
+    "flights": 100,
+}
+PASSWORD = "bench-pass-123"
+
+
+def _code(prefix, i):
+    return prefix + ascii_uppercase[i // 26 % 26] + ascii_uppercase[i % 26]
+
+
+class EndpointBenchmarkTest(TestCase):
+    """
+    Test suite for per-endpoint query, latency and memory budgets.
+
+    Every request runs with empty response caches and throttle buckets,
+    so the full view is measured. Set BENCHMARK_RESULTS to a path to get
+    the measurements as JSON, and BENCHMARK_UPDATE_BUDGETS=1 to rewrite
+    benchmarks/budgets.json from them.
+    """
+
+    results = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.customer = User.objects.create_user(
+            email="bench@example.com", password=PASSWORD
+        )
+        # Orders go to the existing users, i.e. the customer.
+        DatasetGenerator(seed=1, start=date(2031, 1, 1)).generate(
+            users=0, **DATASET
+        )
+        cls.staff = User.objects.create_user(
+            email="bench-staff@example.com", password=PASSWORD, is_staff=True
+        )
+        cls.airplane = Airplane.objects.create(
+            name="BENCH-1",
+            airplane_type=AirplaneType.objects.first(),
+            rows=60,
+            seats_in_row=10,
+        )
+        departure = datetime(2032, 1, 1, 8, 0, tzinfo=UTC)
+        cls.empty_flight = Flight.objects.create(
+            route=Route.objects.first(),
+            airplane=cls.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if RESULTS_PATH:
+            with open(RESULTS_PATH, "w") as f:
+                json.dump(
+                    {
+                        "rounds": ROUNDS,
+                        "database": connection.vendor,
+                        "dataset": DATASET,
+                        "endpoints": dict(sorted(cls.results.items())),
+                    },
+                    f,
+                    indent=2,
+                )
+        if UPDATE_BUDGETS and cls.results:
+            budgets = cls._read_budgets()
+            for name, result in cls.results.items():
+                budgets[name] = {
+                    "queries": result["queries"],
+                    "p50_ms": math.ceil(result["p50_ms"] * 2),
+                    "p99_ms": math.ceil(result["p99_ms"] * 2),
+                    "memory_kb": math.ceil(result["memory_kb"] * 1.5),
+                }
+            with open(BUDGETS_PATH, "w") as f:
+                json.dump(dict(sorted(budgets.items())), f, indent=2)
+                f.write("\n")
+
+    @staticmethod
+    def _read_budgets():
+        if not BUDGETS_PATH.exists():
+            return {}
+        with open(BUDGETS_PATH) as f:
+            return json.load(f)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+        self.rounds = count()
+
+    def _request(self, method, url, data=None):
+        cache.clear()
+        get_token_bucket_store().clear()
+        if method == "get":
+            return self.client.get(url, data)
+        return getattr(self.client, method)(url, data, format="json")
+
+    def _queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._request("get", url, data)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def _benchmark(self, method, url_name, args=(), data=None, status=200):
+        """Measure an endpoint and check it against its budget."""
+        name = f"{url_name} {method.upper()}"
+        url = reverse(url_name, args=args)
+
+        def payload():
+            return data(next(self.rounds)) if callable(data) else data
+
+        # One traced request for the query count and peak memory.
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                response = self._request(method, url, payload())
+            memory = tracemalloc.get_traced_memory()[1]
+            # Read now: the next request_started resets the query log.
+            query_count = len(queries)
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(response.status_code, status, response.content)
+
+        timings = []
+        for _ in range(ROUNDS):
+            body = payload()
+            started = time.perf_counter()
+            response = self._request(method, url, body)
+            timings.append((time.perf_counter() - started) * 1000)
+            self.assertEqual(response.status_code, status)
+        cut_points = (
+            statistics.quantiles(timings, n=100, method="inclusive")
+            if len(timings) > 1
+            else timings * 99
+        )
+
+        result = {
+            "queries": query_count,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p99_ms": round(cut_points[98], 2),
+            "memory_kb": round(memory / 1024, 1),
+        }
+        self.results[name] = result
+        if UPDATE_BUDGETS:
+            return
+
+        budget = self._read_budgets().get(name)
+        self.assertIsNotNone(budget, f"No budget for {name} in budgets.json")
+        over = [
+            f"{metric} {result[metric]} > {limit}"
+            for metric, limit in (
+                ("queries", budget["queries"]),
+                ("p50_ms", budget["p50_ms"] * LATENCY_FACTOR),
+                ("p99_ms", budget["p99_ms"] * LATENCY_FACTOR),
+                ("memory_kb", budget["memory_kb"]),
+            )
+            if result[metric] > limit
+        ]
+        self.assertFalse(over, f"{name} is over budget: {', '.join(over)}")
+
+    def _assert_constant_queries(self, url_name, small, large):
+        """Check queries do not grow with the rows in the response."""
+        self.assertEqual(
+            self._queries(reverse(url_name, args=small[0]), small[1]),
+            self._queries(reverse(url_name, args=large[0]), large[1]),
+            f"{url_name} runs more queries for more rows",
+        )
+
+    def _assert_constant_list_queries(self, url_name):
+        self._assert_constant_queries(
+            url_name, ((), {"page_size": 1}), ((), {"page_size": 50})
+        )
+
+    def _busiest(self, queryset, relation):
+        ranked = queryset.annotate(size=Count(relation)).order_by("size")
+        return ranked.first().pk, ranked.last().pk
+
+    def _as_staff(self):
+        self.client.force_authenticate(self.staff)
+
+    @skipIf(UPDATE_BUDGETS, "budgets are being rewritten")
+    def test_query_budget_enforced(self):
+        """Test a view running more queries than its budget fails"""
+        limits = {"queries": 0, "p50_ms": 1e9, "p99_ms": 1e9, "memory_kb": 1e9}
+        budgets = {"flights:flight-list GET": limits}
+
+        with mock.patch.object(self, "_read_budgets", return_value=budgets):
+            with self.assertRaisesRegex(AssertionError, r"queries \d+ > 0"):
+                self._benchmark("get", "flights:flight-list")
+
+    def test_airport_list(self):
+        """Test the airport list budget"""
+        self._benchmark("get", "airports:airport-list")
+        self._assert_constant_list_queries("airports:airport-list")
+
+    def test_airport_detail(self):
+        """Test the airport detail budget with the busiest airport"""
+        quiet, hub = self._busiest(Airport.objects, "source_routes")
+
+        self._benchmark("get", "airports:airport-detail", args=[hub])
+        self._assert_constant_queries(
+            "airports:airport-detail", ([quiet], None), ([hub], None)
+        )
+
+    def test_airport_create(self):
+        """Test the airport create budget"""
+        self._as_staff()
+        self._benchmark(
+            "post",
+            "airports:airport-list",
+            data=lambda i: {
+                "name": f"Bench {i}",
+                "closest_big_city": "Bench",
+                "iata_code": _code("Z", i),
+                "icao_code": _code("ZZ", i),
+                "latitude": 50.0,
+                "longitude": 30.0,
+            },
+            status=201,
+        )
+
+    def test_route_list(self):
+        """Test the route list budget"""
+        self._benchmark("get", "airports:routes-list")
+        self._assert_constant_list_queries("airports:routes-list")
+
+    def test_route_detail(self):
+        """Test the route detail budget with the busiest route"""
+        quiet, busy = self._busiest(Route.objects, "flights")
+
+        self._benchmark("get", "airports:routes-detail", args=[busy])
+        self._assert_constant_queries(
+            "airports:routes-detail", ([quiet], None), ([busy], None)
+        )
+
+    def test_route_create(self):
+        """Test the route create budget"""
+        self._as_staff()
+        airports = list(Airport.objects.values_list("id", flat=True)[:2])
+        self._benchmark(
+            "post",
+            "airports:routes-list",
+            data={
+                "source": airports[0],
+                "destination": airports[1],
+                "distance": 500,
+            },
+            status=201,
+        )
+
+    def test_airplane_type_list(self):
+        """Test the airplane type list budget"""
+        self._benchmark("get", "flights:airplanetype-list")
+
+    def test_airplane_type_detail(self):
+        """Test the airplane type detail budget"""
+        self._benchmark(
+            "get",
+            "flights:airplanetype-detail",
+            args=[AirplaneType.objects.first().pk],
+        )
+
+    def test_airplane_type_create(self):
+        """Test the airplane type create budget"""
+        self._as_staff()
+        self._benchmark(
+            "post",
+            "flights:airplanetype-list",
+            data=lambda i: {"name": f"Bench type {i}"},
+            status=201,
+        )
+
+    def test_airplane_list(self):
+        """Test the airplane list budget"""
+        self._benchmark("get", "flights:airplane-list")
+
+    def test_airplane_detail(self):
+        """Test the airplane detail budget"""
+        self._benchmark(
+            "get", "flights:airplane-detail", args=[self.airplane.pk]
+        )
+
+    def test_airplane_create(self):
+        """Test the airplane create budget"""
+        self._as_staff()
+        self._benchmark(
+            "post",
+            "flights:airplane-list",
+            data=lambda i: {
+                "name": f"BENCH-{i + 2}",
+                "airplane_type": self.airplane.airplane_type_id,
+                "rows": 30,
+                "seats_in_row": 6,
+            },
+            status=201,
+        )
+
+    def test_crew_list(self):
+        """Test the crew list budget"""
+        self._as_staff()
+        self._benchmark("get", "flights:crew-list")
+
+    def test_crew_detail(self):
+        """Test the crew detail budget"""
+        self._as_staff()
+        self._benchmark(
+            "get", "flights:crew-detail", args=[Crew.objects.first().pk]
+        )
+
+    def test_crew_create(self):
+        """Test the crew create budget"""
+        self._as_staff()
+        self._benchmark(
+            "post",
+            "flights:crew-list",
+            data=lambda i: {"first_name": "Bench", "last_name": f"Crew {i}"},
+            status=201,
+        )
+
+    def test_flight_list(self):
+        """Test the flight list budget"""
+        self._benchmark("get", "flights:flight-list")
+        self._assert_constant_list_queries("flights:flight-list")
+
+    def test_flight_detail(self):
+        """Test the flight detail budget with the fullest flight"""
+        emptiest, fullest = self._busiest(Flight.objects, "tickets")
+
+        self._benchmark("get", "flights:flight-detail", args=[fullest])
+        self._assert_constant_queries(
+            "flights:flight-detail", ([emptiest], None), ([fullest], None)
+        )
+
+    def test_flight_create(self):
+        """Test the flight create budget"""
+        self._as_staff()
+        route = self.empty_flight.route_id
+        crew = list(Crew.objects.values_list("id", flat=True)[:3])
+
+        def flight(i):
+            departure = self.empty_flight.departure_time + timedelta(days=i)
+            return {
+                "departure_time": departure.isoformat(),
+                "arrival_time": (departure + timedelta(hours=2)).isoformat(),
+                "airplane": self.airplane.pk,
+                "route": route,
+                "crew": crew,
+            }
+
+        self._benchmark("post", "flights:flight-list", data=flight, status=201)
+
+    def test_order_list(self):
+        """Test the order list budget"""
+        self._benchmark("get", "orders:orders-list")
+        self._assert_constant_list_queries("orders:orders-list")
+
+    def test_order_detail(self):
+        """Test the order detail budget with the largest order"""
+        smallest, largest = self._busiest(
+            Order.objects.filter(user=self.customer), "tickets"
+        )
+
+        self._benchmark("get", "orders:orders-detail", args=[largest])
+        self._assert_constant_queries(
+            "orders:orders-detail", ([smallest], None), ([largest], None)
+        )
+
+    def test_order_create(self):
+        """Test the order create budget"""
+        seats = self.airplane.seats_in_row
+
+        def order(i):
+            return {
+                "tickets": [
+                    {
+                        "flight": self.empty_flight.pk,
+                        "row": i // seats + 1,
+                        "seat": i % seats + 1,
+                    }
+                ]
+            }
+
+        self._benchmark("post", "orders:orders-list", data=order, status=201)
+
+    def test_user_create(self):
+        """Test the registration budget"""
+        self.client.force_authenticate(None)
+        self._benchmark(
+            "post",
+            "user:create",
+            data=lambda i: {
+                "email": f"bench-new-{i}@example.com",
+                "password": PASSWORD,
+            },
+            status=201,
+        )
+
+    def test_user_detail(self):
+        """Test the own profile budget"""
+        self._benchmark("get", "user:manage")
+
+    def test_token_create(self):
+        """Test the token obtain budget"""
+        self.client.force_authenticate(None)
+        self._benchmark(
+            "post",
+            "user:token_obtain_pair",
+            data={"email": self.customer.email, "password": PASSWORD},
+        )
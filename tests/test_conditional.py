@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from airports.models import Airport, Route
+from flights.models import Airplane, AirplaneType, Flight
+
+FLIGHT_LIST_URL = reverse("flights:flight-list")
+ROUTE_LIST_URL = reverse("airports:routes-list")
+
+
+def flight_detail_url(flight_id):
+    return reverse("flights:flight-detail", args=[flight_id])
+
+
+def sample_flight():
+    route = Route.objects.create(
+        source=Airport.objects.create(
+            name="Source Airport", closest_big_city="Source City"
+        ),
+        destination=Airport.objects.create(
+            name="Destination Airport", closest_big_city="Destination City"
+        ),
+        distance=1000,
+    )
+    airplane = Airplane.objects.create(
+        name="AB-001",
+        airplane_type=AirplaneType.objects.create(name="Airbus A320"),
+        rows=10,
+        seats_in_row=4,
+    )
+    departure = timezone.now() + timedelta(days=1)
+    return Flight.objects.create(
+        route=route,
+        airplane=airplane,
+        departure_time=departure,
+        arrival_time=departure + timedelta(hours=2),
+    )
+
+
+class ConditionalGetTest(TestCase):
+    """Test suite for ETag / Last-Modified handling"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="customer@example.com", password="pass123"
+            )
+        )
+        self.flight = sample_flight()
+
+    def _etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_matching_etag_returns_304_without_serializing(self):
+        """Test If-None-Match short-circuits the list"""
+        etag = self._etag(FLIGHT_LIST_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                FLIGHT_LIST_URL, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    # Cached search pages keep their tag until they are refreshed.
+    @override_settings(FLIGHT_SEARCH_CACHE_TTL=0)
+    def test_seat_sales_and_deletions_change_list_etag(self):
+        """Test seat counter updates and deletions invalidate the tag"""
+        etag = self._etag(FLIGHT_LIST_URL)
+        Flight.objects.add_seats_sold({self.flight.id: 1})
+        sold_etag = self._etag(FLIGHT_LIST_URL)
+        self.flight.delete()
+
+        self.assertNotEqual(sold_etag, etag)
+        self.assertEqual(
+            self.client.get(
+                FLIGHT_LIST_URL, HTTP_IF_NONE_MATCH=sold_etag
+            ).status_code,
+            200,
+        )
+
+    def test_related_change_invalidates_etag(self):
+        """Test renaming an airport changes the flight list tag"""
+        etag = self._etag(FLIGHT_LIST_URL)
+        airport = Airport.objects.get(name="Source Airport")
+        airport.name = "Renamed Airport"
+        airport.save()
+
+        self.assertNotEqual(self._etag(FLIGHT_LIST_URL), etag)
+
+    def test_if_modified_since_on_detail(self):
+        """Test details honour If-Modified-Since via updated_at"""
+        url = flight_detail_url(self.flight.id)
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        not_modified = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        modified = self.client.get(
+            url,
+            HTTP_IF_MODIFIED_SINCE=http_date(
+                (self.flight.updated_at - timedelta(seconds=5)).timestamp()
+            ),
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(modified.status_code, 200)
+
+    def test_routes_support_etags(self):
+        """Test route lists answer If-None-Match"""
+        etag = self._etag(ROUTE_LIST_URL)
+
+        response = self.client.get(ROUTE_LIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,251 @@
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+from unittest import mock, skipUnless
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, F
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from airports.models import Airport, DatasetLoad, Route
+from config.dataset import iter_json_array
+from flights.models import AirplaneType, Crew, Flight
+from orders.models import Order, Ticket
+
+UTC = ZoneInfo("UTC")
+
+DATASET = [
+    {"model": "users.user", "pk": 7, "fields": {
+        "password": "!", "email": "loaded@example.com",
+        "is_staff": False, "is_superuser": False, "is_active": True,
+        "first_name": "", "last_name": "",
+        "date_joined": "2025-12-01T00:00:00Z",
+    }},
+    {"model": "orders.ticket", "pk": 1, "fields": {
+        "order": 1, "flight": 1, "row": 5, "seat": 3,
+    }},
+    {"model": "orders.order", "pk": 1, "fields": {
+        "created_at": "2025-12-10T10:00:00Z", "user": 7,
+    }},
+    {"model": "flights.flight", "pk": 1, "fields": {
+        "departure_time": "2025-12-15T08:00:00Z",
+        "arrival_time": "2025-12-15T14:30:00Z",
+        "airplane": 1, "route": 1, "crew": [1, 2],
+    }},
+    {"model": "flights.crew", "pk": 1, "fields": {
+        "first_name": "John", "last_name": "Smith",
+    }},
+    {"model": "flights.crew", "pk": 2, "fields": {
+        "first_name": "Jane", "last_name": "Doe",
+    }},
+    {"model": "flights.airplanetype", "pk": 1, "fields": {
+        "name": "Boeing 737",
+    }},
+    {"model": "flights.airplane", "pk": 1, "fields": {
+        "name": "Spirit", "airplane_type": 1, "rows": 30, "seats_in_row": 6,
+    }},
+    {"model": "airports.airport", "pk": 1, "fields": {
+        "name": "Boryspil", "closest_big_city": "Kyiv",
+    }},
+    {"model": "airports.airport", "pk": 2, "fields": {
+        "name": "Chopin", "closest_big_city": "Warsaw",
+    }},
+    {"model": "airports.route", "pk": 1, "fields": {
+        "source": 1, "destination": 2, "distance": 800,
+    }},
+]
+
+
+class IterJsonArrayTest(SimpleTestCase):
+    """Test suite for the streaming dataset parser"""
+
+    @mock.patch("config.dataset.READ_SIZE", 7)
+    def test_objects_split_across_reads(self):
+        """Test objects cut at read boundaries are still parsed"""
+        text = json.dumps(DATASET, indent=2)
+
+        self.assertEqual(list(iter_json_array(io.StringIO(text))), DATASET)
+
+    def test_truncated_dataset(self):
+        """Test a dataset without its closing bracket is rejected"""
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('[{"model": "a"},')))
+
+
+class LoadDatasetTest(TestCase):
+    """Test suite for the load_dataset command"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "data.json")
+        self._write(DATASET)
+
+    def _write(self, dataset):
+        with open(self.path, "w") as f:
+            json.dump(dataset, f)
+
+    def _load(self, *args):
+        out = io.StringIO()
+        call_command("load_dataset", self.path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_loads_rows_in_dependency_order(self):
+        """Test rows, m2m relations and derived counters are loaded"""
+        self._load()
+
+        flight = Flight.objects.get(pk=1)
+        self.assertEqual(
+            sorted(flight.crew.values_list("id", flat=True)), [1, 2]
+        )
+        self.assertEqual(flight.seats_sold, 1)
+        self.assertEqual(
+            Order.objects.get(pk=1).created_at,
+            datetime(2025, 12, 10, 10, 0, tzinfo=UTC),
+        )
+        self.assertEqual(Airport.objects.create(name="New").pk, 3)
+
+    def test_same_dataset_is_skipped(self):
+        """Test a second run with an unchanged file does nothing"""
+        self._load()
+
+        with self.assertNumQueries(1):
+            output = self._load()
+
+        self.assertIn("already loaded", output)
+        self.assertEqual(DatasetLoad.objects.count(), 1)
+
+    def test_changed_dataset_updates_rows(self):
+        """Test a changed file overwrites rows with the same keys"""
+        self._load()
+        changed = json.loads(json.dumps(DATASET))
+        changed[3]["fields"]["crew"] = [2]
+        changed[-1]["fields"]["distance"] = 810
+        self._write(changed)
+
+        self._load()
+
+        flight = Flight.objects.get(pk=1)
+        self.assertEqual(list(flight.crew.values_list("id", flat=True)), [2])
+        self.assertEqual(flight.route.distance, 810)
+        self.assertEqual(Flight.objects.count(), 1)
+
+    def test_exclude(self):
+        """Test excluded apps are not loaded"""
+        self._load("--exclude", "orders")
+
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(Flight.objects.get(pk=1).seats_sold, 0)
+
+    @skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+    def test_snapshot_round_trip(self):
+        """Test a restored snapshot brings back the dumped rows"""
+        self._load()
+        snapshot = os.path.join(self.dir.name, "snapshot.tar.gz")
+        call_command("dump_snapshot", snapshot, stdout=io.StringIO())
+        Flight.objects.all().delete()
+
+        call_command(
+            "load_dataset", snapshot, "--snapshot", stdout=io.StringIO()
+        )
+
+        flight = Flight.objects.get(pk=1)
+        self.assertEqual(flight.seats_sold, 1)
+        self.assertEqual(flight.crew.count(), 2)
+
+
+class GenerateDatasetTest(TestCase):
+    """Test suite for the generate_dataset command"""
+
+    SIZES = {
+        "airports": 30, "routes": 120, "airplane_types": 3,
+        "airplanes": 10, "crew": 20, "flights": 40, "users": 5,
+    }
+
+    def _generate(self, **sizes):
+        sizes = {**self.SIZES, **sizes}
+        options = [
+            f"--{name.replace('_', '-')}={value}"
+            for name, value in sizes.items()
+        ]
+        call_command(
+            "generate_dataset",
+            "--seed=7",
+            "--start=2030-01-01",
+            "--chunk-size=500",
+            *options,
+            stdout=io.StringIO(),
+        )
+
+    def _snapshot(self):
+        return [
+            list(queryset.order_by("id"))
+            for queryset in (
+                Airport.objects.values_list(
+                    "iata_code", "latitude", "longitude", "geohash"
+                ),
+                Flight.objects.values_list(
+                    "departure_time", "arrival_time", "airplane_id",
+                    "route_id", "seats_sold",
+                ),
+                Ticket.objects.values_list(
+                    "order_id", "flight_id", "row", "seat"
+                ),
+            )
+        ]
+
+    def test_generates_consistent_rows(self):
+        """Test counts, unique route pairs and seats_sold"""
+        self._generate()
+
+        self.assertEqual(Airport.objects.count(), 30)
+        self.assertEqual(Route.objects.count(), 120)
+        self.assertEqual(
+            Route.objects.values("source", "destination").distinct().count(),
+            120,
+        )
+        self.assertFalse(
+            Route.objects.filter(source=F("destination")).exists()
+        )
+        self.assertEqual(Flight.objects.count(), 40)
+        self.assertFalse(Flight.objects.filter(crew=None).exists())
+        flights = Flight.objects.select_related("airplane")
+        for flight in flights.annotate(ticket_count=Count("tickets")):
+            self.assertEqual(flight.seats_sold, flight.ticket_count)
+            self.assertLessEqual(
+                flight.ticket_count, flight.airplane.capacity
+            )
+        self.assertFalse(
+            Ticket.objects.filter(
+                row__gt=F("flight__airplane__rows")
+            ).exists()
+        )
+        self.assertFalse(Order.objects.filter(tickets=None).exists())
+        self.assertFalse(
+            Order.objects.filter(created_at__gt=timezone.now()).exists()
+        )
+        crew = Crew.objects.create(first_name="New", last_name="Crew")
+        self.assertEqual(crew.pk, 21)
+
+    def test_same_seed_same_rows(self):
+        """Test a seed reproduces the dataset on an empty database"""
+        self._generate()
+        first = self._snapshot()
+        Airport.objects.all().delete()
+        for model in (AirplaneType, Crew, get_user_model()):
+            model.objects.all().delete()
+
+        self._generate()
+
+        self.assertEqual(self._snapshot(), first)
+
+    def test_flights_need_parents(self):
+        """Test flights cannot be generated without airplanes"""
+        with self.assertRaises(CommandError):
+            self._generate(airplanes=0)
@@ -0,0 +1,112 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from orders.models import Order, Ticket
+from tests.test_flight_search import UTC, FlightFixtureMixin
+
+FLIGHT_EXPORT_URL = reverse("flights:flight-export")
+ORDER_EXPORT_URL = reverse("orders:order-export")
+TICKET_EXPORT_URL = reverse("orders:ticket-export")
+
+
+class ExportTest(FlightFixtureMixin, TestCase):
+    """Test suite for the streaming staff exports"""
+
+    def setUp(self):
+        super().setUp()
+        self.staff = get_user_model().objects.create_user(
+            email="staff@example.com", password="pass123", is_staff=True
+        )
+        self.client.force_authenticate(self.staff)
+        self.may = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 8, 0, tzinfo=UTC)
+        )
+        self.june = self._flight(
+            self.lviv_warsaw, datetime(2030, 6, 1, 8, 0, tzinfo=UTC)
+        )
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.may, row=1, seat=2)
+        Ticket.objects.create(order=order, flight=self.june, row=3, seat=4)
+
+    def _export(self, url, headers=None, **params):
+        response = self.client.get(url, params, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_staff_only(self):
+        """Test regular users cannot export"""
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(TICKET_EXPORT_URL)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_ndjson(self):
+        """Test NDJSON has one object per row in id order"""
+        response, body = self._export(FLIGHT_EXPORT_URL)
+
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [row["id"] for row in rows], [self.may.id, self.june.id]
+        )
+        self.assertEqual(rows[0]["capacity"], 40)
+        self.assertEqual(
+            rows[0]["departure_time"], "2030-05-01T08:00:00+00:00"
+        )
+
+    def test_csv(self):
+        """Test CSV starts with a header row"""
+        response, body = self._export(
+            TICKET_EXPORT_URL, headers={"Accept": "text/csv"}, output="csv"
+        )
+
+        rows = list(csv.DictReader(io.StringIO(body.decode())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual((rows[0]["row"], rows[0]["seat"]), ("1", "2"))
+        self.assertEqual(rows[0]["user"], str(self.user.id))
+
+    def test_gzip_and_date_range(self):
+        """Test gzip output and the departure range filter"""
+        response, body = self._export(
+            FLIGHT_EXPORT_URL, gzip="1", date_from="2030-06-01"
+        )
+
+        rows = gzip.decompress(body).decode().splitlines()
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn("flights.ndjson.gz", response["Content-Disposition"])
+        self.assertEqual(
+            [json.loads(row)["id"] for row in rows], [self.june.id]
+        )
+
+    async def test_streams_asynchronously_under_asgi(self):
+        """Test ASGI gets an async iterator instead of a buffered list"""
+        token = await sync_to_async(AccessToken.for_user)(self.staff)
+
+        response = await AsyncClient().get(
+            FLIGHT_EXPORT_URL, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(
+            [json.loads(line)["id"] for line in body.decode().splitlines()],
+            [self.may.id, self.june.id],
+        )
+
+    def test_invalid_output(self):
+        """Test unknown output formats are rejected"""
+        response = self.client.get(ORDER_EXPORT_URL, {"output": "xml"})
+
+        self.assertEqual(response.status_code, 400)
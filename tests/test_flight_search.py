@@ -0,0 +1,389 @@
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest import mock, skipUnless
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airports.distances import build_distance_matrix
+from airports.models import Airport, Route
+from airports.search import match_airports
+from flights.itineraries import RouteGraph
+from flights.models import AirplaneType, Airplane, Flight
+
+FLIGHT_LIST_URL = reverse("flights:flight-list")
+ITINERARY_URL = reverse("flights:itineraries")
+UTC = ZoneInfo("UTC")
+
+
+class FlightFixtureMixin:
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.kyiv = Airport.objects.create(
+            name="Boryspil", closest_big_city="Kyiv"
+        )
+        self.lviv = Airport.objects.create(
+            name="Danylo Halytskyi", closest_big_city="Lviv"
+        )
+        self.warsaw = Airport.objects.create(
+            name="Chopin", closest_big_city="Warsaw"
+        )
+        self.kyiv_lviv = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=470
+        )
+        self.lviv_warsaw = Route.objects.create(
+            source=self.lviv, destination=self.warsaw, distance=330
+        )
+        self.airplane = Airplane.objects.create(
+            name="AB-001",
+            airplane_type=AirplaneType.objects.create(name="A320"),
+            rows=10,
+            seats_in_row=4,
+        )
+
+    def _flight(self, route, departure):
+        return Flight.objects.create(
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=1),
+            airplane=self.airplane,
+            route=route,
+        )
+
+
+class FlightSearchTest(FlightFixtureMixin, TestCase):
+    """Test suite for flight search filters"""
+
+    def _search(self, **params):
+        response = self.client.get(FLIGHT_LIST_URL, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return {flight["id"] for flight in response.data["results"]}
+
+    def test_date_range_is_half_open_and_inclusive_of_date_to(self):
+        """Test date_from/date_to include whole days"""
+        inside = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 2, 23, 59, tzinfo=UTC)
+        )
+        self._flight(self.kyiv_lviv, datetime(2030, 5, 3, 0, 0, tzinfo=UTC))
+        first = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 0, 0, tzinfo=UTC)
+        )
+
+        found = self._search(date_from="2030-05-01", date_to="2030-05-02")
+
+        self.assertEqual(found, {inside.id, first.id})
+
+    def test_single_day_in_time_zone(self):
+        """Test date is interpreted in the requested time zone"""
+        # 2030-05-01 22:30 UTC is already 2030-05-02 in Kyiv (UTC+3).
+        late = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 22, 30, tzinfo=UTC)
+        )
+        self._flight(self.kyiv_lviv, datetime(2030, 5, 1, 12, 0, tzinfo=UTC))
+
+        found = self._search(date="2030-05-02", tz="Europe/Kyiv")
+
+        self.assertEqual(found, {late.id})
+
+    def test_invalid_date_and_time_zone_rejected(self):
+        """Test malformed dates and zones return 400"""
+        for params in ({"date": "2030-13-01"}, {"tz": "Mars/Olympus"}):
+            response = self.client.get(FLIGHT_LIST_URL, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_source_and_destination_id_filters(self):
+        """Test flights can be filtered by airport ids"""
+        departure = datetime(2030, 5, 1, 12, tzinfo=UTC)
+        to_lviv = self._flight(self.kyiv_lviv, departure)
+        from_lviv = self._flight(self.lviv_warsaw, departure)
+
+        self.assertEqual(
+            self._search(source_id=self.lviv.id), {from_lviv.id}
+        )
+        self.assertEqual(
+            self._search(destination_id=self.lviv.id), {to_lviv.id}
+        )
+
+    def test_source_name_substring_match(self):
+        """Test source keeps matching case-insensitive name substrings"""
+        departure = datetime(2030, 5, 1, 12, tzinfo=UTC)
+        from_kyiv = self._flight(self.kyiv_lviv, departure)
+        self._flight(self.lviv_warsaw, departure)
+
+        self.assertEqual(self._search(source="borys"), {from_kyiv.id})
+
+    def test_source_and_destination_codes(self):
+        """Test IATA/ICAO codes resolve to exact airports"""
+        self.kyiv.iata_code = "kbp"
+        self.kyiv.save()
+        self.warsaw.icao_code = "EPWA"
+        self.warsaw.save()
+        departure = datetime(2030, 5, 1, 12, tzinfo=UTC)
+        from_kyiv = self._flight(self.kyiv_lviv, departure)
+        to_warsaw = self._flight(self.lviv_warsaw, departure)
+
+        self.assertEqual(self._search(source="KBP"), {from_kyiv.id})
+        self.assertEqual(self._search(destination="epwa"), {to_warsaw.id})
+
+    @skipUnless(connection.vendor == "postgresql", "needs pg_trgm")
+    def test_source_name_typo_match(self):
+        """Test misspelled airport names still match via trigrams"""
+        departure = datetime(2030, 5, 1, 12, tzinfo=UTC)
+        from_kyiv = self._flight(self.kyiv_lviv, departure)
+
+        self.assertEqual(self._search(source="Boryspol"), {from_kyiv.id})
+
+    @skipUnless(connection.vendor == "postgresql", "needs pg_trgm")
+    def test_airports_ranked_by_similarity(self):
+        """Test the closest airport name is ranked first"""
+        Airport.objects.create(name="Borispil Old", closest_big_city="Kyiv")
+
+        self.assertEqual(match_airports("Boryspil").first(), self.kyiv)
+
+
+class ItinerarySearchTest(FlightFixtureMixin, TestCase):
+    """Test suite for multi-leg itinerary search"""
+
+    def _itineraries(self, **params):
+        response = self.client.get(ITINERARY_URL, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [
+            [leg["flight"] for leg in itinerary["legs"]]
+            for itinerary in response.data
+        ]
+
+    def test_direct_and_connecting_itineraries(self):
+        """Test connections respect the minimum connection time"""
+        direct = Route.objects.create(
+            source=self.kyiv, destination=self.warsaw, distance=800
+        )
+        nonstop = self._flight(direct, datetime(2030, 5, 1, 9, tzinfo=UTC))
+        first = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 8, tzinfo=UTC)
+        )
+        # Leaves 30 minutes after the first leg lands: too tight.
+        self._flight(
+            self.lviv_warsaw, datetime(2030, 5, 1, 9, 30, tzinfo=UTC)
+        )
+        second = self._flight(
+            self.lviv_warsaw, datetime(2030, 5, 1, 10, 30, tzinfo=UTC)
+        )
+
+        found = self._itineraries(
+            source=self.kyiv.id,
+            destination=self.warsaw.id,
+            date="2030-05-01",
+        )
+
+        self.assertEqual(found, [[nonstop.id], [first.id, second.id]])
+
+    def test_max_stops_zero_returns_direct_only(self):
+        """Test max_stops limits the number of legs"""
+        first = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 8, tzinfo=UTC)
+        )
+        self._flight(self.lviv_warsaw, datetime(2030, 5, 1, 11, tzinfo=UTC))
+
+        self.assertEqual(
+            self._itineraries(
+                source=self.kyiv.id,
+                destination=self.warsaw.id,
+                date="2030-05-01",
+                max_stops=0,
+            ),
+            [],
+        )
+        self.assertEqual(
+            self._itineraries(
+                source=self.kyiv.id,
+                destination=self.lviv.id,
+                date="2030-05-01",
+                max_stops=0,
+            ),
+            [[first.id]],
+        )
+
+    def test_stale_distance_matrix_does_not_prune(self):
+        """Test routes added after the matrix build are still searched"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(
+            override_settings(DISTANCE_MATRIX_DIR=directory.name)
+        )
+        self.lviv_warsaw.delete()
+        # Lviv cannot reach Warsaw yet.
+        build_distance_matrix()
+        lviv_warsaw = Route.objects.create(
+            source=self.lviv, destination=self.warsaw, distance=330
+        )
+        first = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 8, tzinfo=UTC)
+        )
+        second = self._flight(
+            lviv_warsaw, datetime(2030, 5, 1, 11, tzinfo=UTC)
+        )
+
+        self.assertEqual(
+            self._itineraries(
+                source=self.kyiv.id,
+                destination=self.warsaw.id,
+                date="2030-05-01",
+            ),
+            [[first.id, second.id]],
+        )
+
+    @mock.patch("flights.itineraries.MAX_ROUTE_PATHS", 2)
+    def test_route_paths_fewest_legs_first(self):
+        """Test direct routes are found before the path cap fills up"""
+        graph = RouteGraph(airports={})
+        # 1 -> 2 -> 4, 1 -> 3 -> 4, 1 -> 5 (dead end) and direct 1 -> 4.
+        for source, destination, route_id, distance in [
+            (1, 2, 12, 100),
+            (1, 3, 13, 100),
+            (2, 4, 24, 100),
+            (3, 4, 34, 50),
+            (1, 5, 15, 10),
+            (1, 4, 14, 900),
+        ]:
+            graph.edges[source].append((destination, route_id, distance))
+        deadline = time.monotonic() + 10
+
+        self.assertEqual(
+            list(graph.route_paths(1, 4, 3, deadline, dead_ends={5})),
+            [((14,), 900), ((13, 34), 150)],
+        )
+
+
+class FlightSearchCacheTest(FlightFixtureMixin, TestCase):
+    """Test suite for the flight search result cache"""
+
+    def setUp(self):
+        super().setUp()
+        self.params = {"source_id": self.kyiv.id, "date": "2030-05-01"}
+        self.flight = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 12, tzinfo=UTC)
+        )
+
+    def _get(self, **params):
+        response = self.client.get(FLIGHT_LIST_URL, {**self.params, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_repeated_search_served_from_cache(self):
+        """Test a repeated search skips the flight query"""
+        self.assertEqual(self._get()["X-Search-Cache"], "miss")
+
+        with self.assertNumQueries(0):
+            response = self._get()
+
+        self.assertEqual(response["X-Search-Cache"], "hit")
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [self.flight.id],
+        )
+
+    def test_equivalent_filters_share_an_entry(self):
+        """Test date/tz spellings of the same day normalize to one key"""
+        self._get()
+
+        response = self._get(tz="UTC")
+
+        self.assertEqual(response["X-Search-Cache"], "hit")
+
+    def test_schemes_do_not_share_an_entry(self):
+        """Test an http page is never served with its links to https"""
+        self._get()
+
+        response = self.client.get(FLIGHT_LIST_URL, self.params, secure=True)
+
+        self.assertEqual(response["X-Search-Cache"], "miss")
+
+    def test_new_flight_on_route_invalidates(self):
+        """Test flight changes on a searched route refresh the result"""
+        self._get()
+        other = self._flight(
+            self.kyiv_lviv, datetime(2030, 5, 1, 15, tzinfo=UTC)
+        )
+
+        response = self._get()
+
+        self.assertEqual(response["X-Search-Cache"], "miss")
+        self.assertIn(
+            other.id, [flight["id"] for flight in response.data["results"]]
+        )
+
+    def test_sell_out_invalidates(self):
+        """Test a flight selling out drops out of availability searches"""
+        self._get(min_seats_available=1)
+        Flight.objects.add_seats_sold({self.flight.id: 40})
+
+        response = self._get(min_seats_available=1)
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_cached_entry_keeps_its_etag(self):
+        """Test a cached page is sent with the tag it was stored with"""
+        etag = self._get()["ETag"]
+        Flight.objects.add_seats_sold({self.flight.id: 1})
+
+        response = self._get()
+        not_modified = self.client.get(
+            FLIGHT_LIST_URL, self.params, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response["X-Search-Cache"], "hit")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(not_modified.status_code, 304)
+
+    @override_settings(FLIGHT_SEARCH_EARLY_REFRESH_BETA=1e9)
+    def test_stale_entry_served_while_another_worker_refreshes(self):
+        """Test requests that lose the refresh lock serve the old entry"""
+        self._get()
+
+        with mock.patch("flights.search_cache.cache.add", return_value=False):
+            response = self._get()
+
+        self.assertEqual(response["X-Search-Cache"], "stale")
+
+
+class FlightSearchPlanTest(TestCase):
+    """Test suite checking search predicates can use the indexes"""
+
+    def _plan(self, queryset):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Tiny test tables are always cheaper to scan sequentially.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
+
+    def test_route_and_date_range_use_composite_index(self):
+        """Test route + departure range is served by the composite index"""
+        start = datetime(2030, 5, 1, tzinfo=UTC)
+        queryset = Flight.objects.filter(
+            route_id__in=Route.objects.filter(source_id=1).values("id"),
+            departure_time__gte=start,
+            departure_time__lt=start + timedelta(days=1),
+        )
+
+        self.assertIn("flight_route_departure_idx", self._plan(queryset))
+
+    def test_date_range_uses_departure_index(self):
+        """Test a bare departure range avoids a sequential scan"""
+        start = datetime(2030, 5, 1, tzinfo=UTC)
+        queryset = Flight.objects.filter(
+            departure_time__gte=start,
+            departure_time__lt=start + timedelta(days=1),
+        )
+
+        plan = self._plan(queryset)
+        self.assertNotIn("Seq Scan", plan)
+        self.assertRegex(plan, r"flight_(departure_id|route_departure)_idx")
@@ -0,0 +1,119 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airports.models import Airport, Route
+from flights.models import AirplaneType, Airplane, Flight
+
+FLIGHT_LIST_URL = reverse("flights:flight-list")
+AIRPORT_LIST_URL = reverse("airports:airport-list")
+
+
+class KeysetPaginationTest(TestCase):
+    """Test suite for keyset (cursor) pagination of list endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+
+        source = Airport.objects.create(name="A", closest_big_city="A")
+        destination = Airport.objects.create(name="B", closest_big_city="B")
+        route = Route.objects.create(
+            source=source, destination=destination, distance=100
+        )
+        airplane = Airplane.objects.create(
+            name="AB-001",
+            airplane_type=AirplaneType.objects.create(name="A320"),
+            rows=10,
+            seats_in_row=4,
+        )
+        departure = timezone.now()
+        # Pairs of flights share a departure time to exercise the id
+        # tie-breaker.
+        self.flights = [
+            Flight.objects.create(
+                departure_time=departure + timedelta(hours=index // 2),
+                arrival_time=departure + timedelta(hours=index // 2 + 2),
+                airplane=airplane,
+                route=route,
+            )
+            for index in range(7)
+        ]
+
+    def _walk(self, url, params):
+        seen = []
+        queries = []
+        while url:
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            queries.append(context.captured_queries)
+            seen.extend(item["id"] for item in response.data["results"])
+            url, params = response.data["next"], None
+        return seen, queries
+
+    def test_pages_cover_every_flight_once_in_order(self):
+        """Test walking the cursor returns each flight exactly once"""
+        seen, _ = self._walk(FLIGHT_LIST_URL, {"page_size": 2})
+
+        expected = [
+            flight.id
+            for flight in sorted(
+                self.flights,
+                key=lambda flight: (flight.departure_time, flight.id),
+                reverse=True,
+            )
+        ]
+        self.assertEqual(seen, expected)
+
+    def test_pages_never_count_rows(self):
+        """Test no page issues COUNT(*) and deep pages cost the same"""
+        _, queries = self._walk(FLIGHT_LIST_URL, {"page_size": 2})
+
+        self.assertEqual(len({len(page) for page in queries}), 1)
+        for page in queries:
+            for query in page:
+                self.assertNotIn("COUNT(", query["sql"].upper())
+
+    def test_previous_link_returns_previous_page(self):
+        """Test following previous from the second page gives the first"""
+        first = self.client.get(FLIGHT_LIST_URL, {"page_size": 3}).data
+        second = self.client.get(first["next"]).data
+
+        previous = self.client.get(second["previous"]).data
+
+        self.assertEqual(
+            [item["id"] for item in previous["results"]],
+            [item["id"] for item in first["results"]],
+        )
+
+    def test_invalid_cursor_returns_404(self):
+        """Test a tampered cursor is rejected"""
+        response = self.client.get(AIRPORT_LIST_URL, {"cursor": "garbage"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_values_of_wrong_type_return_404(self):
+        """Test cursor values must match the ordering fields' types"""
+        for url, values in (
+            (AIRPORT_LIST_URL, ["Boryspil", "abc"]),
+            (AIRPORT_LIST_URL, ["Boryspil", [1]]),
+            (FLIGHT_LIST_URL, ["not-a-date", 1]),
+        ):
+            payload = json.dumps({"v": values, "r": False}).encode()
+            cursor = base64.urlsafe_b64encode(payload).decode()
+
+            response = self.client.get(url, {"cursor": cursor})
+
+            self.assertEqual(response.status_code, 404, values)
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from airports.models import Airport
+from flights.models import Airplane, AirplaneType
+
+AIRPORT_URL = reverse("airports:airport-list")
+AIRPLANE_URL = reverse("flights:airplane-list")
+
+
+class ResponseCacheTest(TestCase):
+    """Test suite for the versioned response cache"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="customer@example.com", password="pass123"
+            )
+        )
+        self.airport = Airport.objects.create(
+            name="Boryspil", closest_big_city="Kyiv"
+        )
+        self.airplane_type = AirplaneType.objects.create(name="A320")
+        self.airplane = Airplane.objects.create(
+            name="AB-001",
+            airplane_type=self.airplane_type,
+            rows=10,
+            seats_in_row=4,
+        )
+
+    def test_repeated_get_served_from_cache(self):
+        """Test a warm list is returned without database queries"""
+        first = self.client.get(AIRPORT_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(first["X-Response-Cache"], "miss")
+        self.assertEqual(second["X-Response-Cache"], "hit")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+
+    def test_query_string_is_part_of_the_key(self):
+        """Test different query strings are cached separately"""
+        self.client.get(AIRPORT_URL)
+
+        response = self.client.get(AIRPORT_URL, {"page_size": 1})
+
+        self.assertEqual(response["X-Response-Cache"], "miss")
+
+    def test_save_invalidates_cached_response(self):
+        """Test saving a model switches readers to fresh data"""
+        self.client.get(AIRPORT_URL)
+        Airport.objects.create(name="Chopin", closest_big_city="Warsaw")
+
+        response = self.client.get(AIRPORT_URL)
+
+        self.assertEqual(response["X-Response-Cache"], "miss")
+        self.assertEqual(len(response.json()["results"]), 2)
+
+    def test_related_model_change_invalidates(self):
+        """Test airplane lists follow airplane type renames"""
+        self.client.get(AIRPLANE_URL)
+        self.airplane_type.name = "A321"
+        self.airplane_type.save()
+
+        response = self.client.get(AIRPLANE_URL)
+
+        self.assertEqual(response.json()[0]["airplane_type"], "A321")
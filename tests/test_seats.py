@@ -0,0 +1,527 @@
+import base64
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from airports.models import Airport, Route
+from config.versioning import model_version
+from flights.allocation import SeatAllocator
+from flights.models import AirplaneType, Airplane, Flight
+from orders.models import Order, SeatHold, Ticket
+
+FLIGHT_LIST_URL = reverse("flights:flight-list")
+ORDER_URL = reverse("orders:orders-list")
+
+
+def sample_flight(rows=10, seats_in_row=4, **params):
+    source, _ = Airport.objects.get_or_create(
+        name="Source Airport", closest_big_city="Source City"
+    )
+    destination, _ = Airport.objects.get_or_create(
+        name="Destination Airport", closest_big_city="Destination City"
+    )
+    route, _ = Route.objects.get_or_create(
+        source=source, destination=destination, defaults={"distance": 1000}
+    )
+    airplane_type, _ = AirplaneType.objects.get_or_create(name="Airbus A320")
+    airplane = Airplane.objects.create(
+        name="AB-001",
+        airplane_type=airplane_type,
+        rows=rows,
+        seats_in_row=seats_in_row,
+    )
+    departure = timezone.now() + timedelta(days=1)
+    defaults = {
+        "departure_time": departure,
+        "arrival_time": departure + timedelta(hours=2),
+        "airplane": airplane,
+        "route": route,
+    }
+    defaults.update(params)
+    return Flight.objects.create(**defaults)
+
+
+class SeatsSoldCounterTest(TestCase):
+    """Test suite for the denormalized Flight.seats_sold counter"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.flight = sample_flight()
+
+    def test_ticket_create_and_delete_update_counter(self):
+        """Test saving and deleting tickets keeps seats_sold in sync"""
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            order=order, flight=self.flight, row=1, seat=1
+        )
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=2)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2)
+
+        ticket.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
+
+        order.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 0)
+
+    def test_cascade_delete_updates_counters_once(self):
+        """Test deleting an order applies all seat deltas in one UPDATE"""
+        other_flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                order=order, flight=self.flight, row=1, seat=seat
+            )
+            Ticket.objects.create(
+                order=order, flight=other_flight, row=1, seat=seat
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            order.delete()
+
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "flights_flight"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.flight.refresh_from_db()
+        other_flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 0)
+        self.assertEqual(other_flight.seats_sold, 0)
+
+    def test_seat_sales_keep_flight_model_version(self):
+        """Test selling seats leaves caches keyed on flights alone"""
+        version = model_version(Flight)
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+        order.delete()
+
+        self.assertEqual(model_version(Flight), version)
+
+    def test_moving_ticket_between_flights_updates_both(self):
+        """Test changing a ticket's flight moves the sold seat"""
+        other_flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+
+        ticket = Ticket.objects.get(order=order)
+        ticket.flight = other_flight
+        ticket.save()
+
+        self.flight.refresh_from_db()
+        other_flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 0)
+        self.assertEqual(other_flight.seats_sold, 1)
+
+    def test_reconcile_command_fixes_drift(self):
+        """Test reconcile_seats_sold recounts tickets per flight"""
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+        Flight.objects.filter(pk=self.flight.pk).update(seats_sold=7)
+
+        call_command("reconcile_seats_sold", stdout=StringIO())
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 1)
+
+
+class FlightSeatsAvailableApiTest(TestCase):
+    """Test suite for seat availability filtering on the flight list"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.full_flight = sample_flight(rows=1, seats_in_row=2)
+        self.empty_flight = sample_flight(rows=1, seats_in_row=2)
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 2):
+            Ticket.objects.create(
+                order=order, flight=self.full_flight, row=1, seat=seat
+            )
+
+    def _ids(self, response):
+        return [flight["id"] for flight in response.data["results"]]
+
+    def test_min_seats_available_filter(self):
+        """Test flights without enough free seats are filtered out"""
+        response = self.client.get(
+            FLIGHT_LIST_URL, {"min_seats_available": 1}
+        )
+
+        self.assertEqual(self._ids(response), [self.empty_flight.id])
+
+    def test_ordering_by_seats_available(self):
+        """Test flights can be ordered by free seats"""
+        response = self.client.get(
+            FLIGHT_LIST_URL, {"ordering": "seats_available"}
+        )
+
+        self.assertEqual(
+            self._ids(response), [self.full_flight.id, self.empty_flight.id]
+        )
+
+    def test_invalid_ordering_rejected(self):
+        """Test unknown ordering fields return 400"""
+        response = self.client.get(FLIGHT_LIST_URL, {"ordering": "crew"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_query_count_does_not_grow_with_flights(self):
+        """Test tickets_available does not issue a query per flight"""
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(FLIGHT_LIST_URL)
+        for _ in range(5):
+            sample_flight()
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(FLIGHT_LIST_URL)
+
+        self.assertEqual(len(few), len(many))
+        available = {
+            flight["id"]: flight["tickets_available"]
+            for flight in response.data["results"]
+        }
+        self.assertEqual(available[self.full_flight.id], 0)
+        self.assertEqual(available[self.empty_flight.id], 2)
+
+
+class BulkBookingApiTest(TestCase):
+    """Test suite for set-based ticket validation and creation"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(rows=20, seats_in_row=10)
+
+    def _book(self, seats, flight=None):
+        flight = flight or self.flight
+        return self.client.post(
+            ORDER_URL,
+            {
+                "tickets": [
+                    {"flight": flight.id, "row": row, "seat": seat}
+                    for row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_query_count_does_not_grow_with_tickets(self):
+        """Test booking many seats costs the same queries as booking two"""
+        with CaptureQueriesContext(connection) as small:
+            response = self._book([(1, 1), (1, 2)])
+        self.assertEqual(response.status_code, 201)
+
+        with CaptureQueriesContext(connection) as large:
+            response = self._book(
+                [(row, seat) for row in range(2, 20) for seat in (1, 2, 3)]
+            )
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(len(small), len(large))
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2 + 18 * 3)
+
+    def test_all_conflicting_seats_reported(self):
+        """Test taken, duplicate and out of range seats in one error"""
+        self._book([(1, 1)])
+
+        response = self._book([(1, 1), (2, 2), (2, 2), (21, 1), (3, 11)])
+
+        self.assertEqual(response.status_code, 400)
+        reasons = {
+            (int(conflict["row"]), int(conflict["seat"])): conflict["reason"]
+            for conflict in response.data["tickets"]["seats"]
+        }
+        self.assertEqual(
+            reasons,
+            {
+                (1, 1): "taken",
+                (2, 2): "duplicate",
+                (21, 1): "invalid_row",
+                (3, 11): "invalid_seat",
+            },
+        )
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 1)
+
+    def test_taken_seats_reported(self):
+        """Test already sold seats are listed in the error"""
+        self._book([(1, 1), (1, 2)])
+
+        response = self._book([(1, 1), (1, 2), (1, 3)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            sorted(
+                (int(conflict["row"]), int(conflict["seat"]))
+                for conflict in response.data["tickets"]["seats"]
+                if conflict["reason"] == "taken"
+            ),
+            [(1, 1), (1, 2)],
+        )
+        self.assertEqual(Ticket.objects.count(), 2)
+
+
+class SeatHoldApiTest(TestCase):
+    """Test suite for seat holds and orders created from them"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(rows=5, seats_in_row=4)
+        self.holds_url = reverse(
+            "flights:flight-holds", args=[self.flight.id]
+        )
+
+    def _hold(self, seats):
+        return self.client.post(
+            self.holds_url,
+            {"seats": [{"row": row, "seat": seat} for row, seat in seats]},
+            format="json",
+        )
+
+    def test_competing_hold_fails_fast(self):
+        """Test a second client cannot hold seats that are already held"""
+        response = self._hold([(1, 1), (1, 2)])
+        self.assertEqual(response.status_code, 201)
+
+        self.client.force_authenticate(self.other_user)
+        response = self._hold([(1, 2), (1, 3)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [
+                (int(conflict["row"]), int(conflict["seat"]))
+                for conflict in response.data["seats"]
+            ],
+            [(1, 2)],
+        )
+
+    def test_non_numeric_flight_id_is_not_found(self):
+        """Test a malformed flight id gives a 404, not a server error"""
+        url = self.holds_url.replace(str(self.flight.id), "abc")
+
+        response = self.client.post(
+            url, {"seats": [{"row": 1, "seat": 1}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_direct_order_rejects_seats_held_by_others(self):
+        """Test held seats cannot be ordered by another user"""
+        self._hold([(1, 1)])
+
+        self.client.force_authenticate(self.other_user)
+        response = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["tickets"]["seats"][0]["reason"], "held"
+        )
+
+    def test_order_from_hold(self):
+        """Test an order created from a hold books the held seats"""
+        hold_id = self._hold([(2, 1), (2, 2)]).data["id"]
+
+        response = self.client.post(
+            reverse("orders:orders-from-hold"), {"hold": hold_id}
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(
+                self.flight.tickets.values_list("row", "seat")
+            ),
+            [(2, 1), (2, 2)],
+        )
+        self.assertFalse(SeatHold.objects.filter(pk=hold_id).exists())
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_sold, 2)
+
+    def test_expired_holds_are_reclaimed(self):
+        """Test expired holds neither block nor convert into orders"""
+        hold_id = self._hold([(3, 1)]).data["id"]
+        SeatHold.objects.filter(pk=hold_id).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        response = self.client.post(
+            reverse("orders:orders-from-hold"), {"hold": hold_id}
+        )
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.other_user)
+        response = self._hold([(3, 1)])
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(SeatHold.objects.filter(pk=hold_id).exists())
+
+
+class SeatMapApiTest(TestCase):
+    """Test suite for the bitset seat map endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(rows=3, seats_in_row=4)
+        self.url = reverse("flights:flight-seat-map", args=[self.flight.id])
+
+    def _bitmap(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return base64.b64decode(response.data["bitmap"])
+
+    def test_seat_map_bits(self):
+        """Test sold seats are set at (row - 1) * seats_in_row + seat - 1"""
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+        Ticket.objects.create(order=order, flight=self.flight, row=3, seat=4)
+
+        self.assertEqual(self._bitmap(), bytes([0b10000000, 0b00010000]))
+
+    def test_seat_map_skips_seats_outside_the_airplane(self):
+        """Test tickets that no longer fit the airplane are left out"""
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+        Ticket.objects.create(order=order, flight=self.flight, row=3, seat=1)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=4)
+        Airplane.objects.filter(pk=self.flight.airplane_id).update(
+            rows=2, seats_in_row=3
+        )
+
+        self.assertEqual(self._bitmap(), bytes([0b10000000]))
+
+    def test_seat_map_cached_and_invalidated_on_booking(self):
+        """Test the seat map is served from cache until tickets change"""
+        self.assertEqual(self._bitmap(), bytes(2))
+
+        with self.assertNumQueries(1):
+            self._bitmap()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                ORDER_URL,
+                {
+                    "tickets": [
+                        {"flight": self.flight.id, "row": 1, "seat": 2}
+                    ]
+                },
+                format="json",
+            )
+
+        self.assertEqual(self._bitmap(), bytes([0b01000000, 0]))
+
+    def test_seat_map_binary_response(self):
+        """Test the raw bitset is returned for application/octet-stream"""
+        response = self.client.get(
+            self.url, HTTP_ACCEPT="application/octet-stream"
+        )
+
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertEqual(response.content, bytes(2))
+        self.assertEqual(response["X-Seat-Map-Seats-In-Row"], "4")
+
+
+class SeatAllocatorTest(SimpleTestCase):
+    """Test suite for the in-memory adjacent seat allocator"""
+
+    def test_best_fit_prefers_smallest_gap(self):
+        """Test a party takes the tightest free run that fits"""
+        allocator = SeatAllocator(
+            rows=2, seats_in_row=6, taken=[(2, 3), (2, 4), (2, 5), (2, 6)]
+        )
+
+        self.assertEqual(allocator.allocate(2), [(2, 1), (2, 2)])
+        self.assertEqual(allocator.allocate(3), [(1, 1), (1, 2), (1, 3)])
+
+    def test_large_party_spans_fewest_consecutive_rows(self):
+        """Test parties wider than a row use adjacent rows"""
+        allocator = SeatAllocator(rows=4, seats_in_row=3, taken=[(1, 1)])
+
+        seats = allocator.allocate(5)
+
+        rows = {row for row, _ in seats}
+        self.assertEqual(len(seats), 5)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(max(rows) - min(rows), 1)
+
+    def test_allocate_many_keeps_request_order(self):
+        """Test many parties are allocated in one pass without overlap"""
+        allocator = SeatAllocator(rows=3, seats_in_row=4, taken=[])
+
+        allocations = allocator.allocate_many([1, 4, 2, 20])
+
+        self.assertEqual([len(seats) for seats in allocations[:3]], [1, 4, 2])
+        self.assertIsNone(allocations[3])
+        all_seats = [seat for seats in allocations[:3] for seat in seats]
+        self.assertEqual(len(all_seats), len(set(all_seats)))
+
+
+class SeatAllocationApiTest(TestCase):
+    """Test suite for the seat allocation endpoint"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="customer@example.com", password="pass123"
+        )
+        self.client.force_authenticate(self.user)
+        self.flight = sample_flight(rows=2, seats_in_row=4)
+
+    def test_allocation_skips_sold_and_held_seats(self):
+        """Test suggested seats avoid tickets and active holds"""
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(order=order, flight=self.flight, row=1, seat=1)
+        self.client.post(
+            reverse("flights:flight-holds", args=[self.flight.id]),
+            {"seats": [{"row": 2, "seat": 1}]},
+            format="json",
+        )
+
+        response = self.client.post(
+            reverse("flights:flight-allocate", args=[self.flight.id]),
+            {"party_sizes": [3, 3]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                [(seat["row"], seat["seat"]) for seat in party["seats"]]
+                for party in response.data["parties"]
+            ],
+            [[(1, 2), (1, 3), (1, 4)], [(2, 2), (2, 3), (2, 4)]],
+        )
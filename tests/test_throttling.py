@@ -0,0 +1,101 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from config.throttling import (
+    LocalTokenBucketStore,
+    ScopedTokenBucketThrottle,
+    get_token_bucket_store,
+)
+
+FLIGHT_LIST_URL = reverse("flights:flight-list")
+ORDER_URL = reverse("orders:orders-list")
+
+
+class LocalTokenBucketStoreTest(SimpleTestCase):
+    """Test suite for the in-process token bucket"""
+
+    def setUp(self):
+        self.store = LocalTokenBucketStore()
+
+    @mock.patch("config.throttling.time.monotonic")
+    def test_bucket_drains_and_refills(self, monotonic):
+        """Test capacity, refusal with wait time and refill"""
+        monotonic.return_value = 100.0
+        results = [self.store.consume("key", 2, 0.5) for _ in range(3)]
+
+        self.assertEqual(
+            [allowed for allowed, _ in results], [True, True, False]
+        )
+        self.assertAlmostEqual(results[-1][1], 2.0)
+
+        monotonic.return_value = 102.0
+        self.assertEqual(self.store.consume("key", 2, 0.5), (True, 0.0))
+
+    def test_keys_have_separate_buckets(self):
+        """Test one key running dry does not affect another"""
+        self.store.consume("a", 1, 0.001)
+
+        self.assertFalse(self.store.consume("a", 1, 0.001)[0])
+        self.assertTrue(self.store.consume("b", 1, 0.001)[0])
+
+    def test_full_store_evicts_least_recently_used(self):
+        """Test only the oldest bucket is forgotten when the store is full"""
+        self.store.max_buckets = 2
+        self.store.consume("a", 1, 0.001)
+        self.store.consume("b", 1, 0.001)
+        self.store.consume("a", 1, 0.001)
+        self.store.consume("c", 1, 0.001)
+
+        self.assertEqual(list(self.store.buckets), ["a", "c"])
+        self.assertFalse(self.store.consume("a", 1, 0.001)[0])
+
+
+@mock.patch.object(
+    ScopedTokenBucketThrottle,
+    "THROTTLE_RATES",
+    {"orders": "2/minute", "flight_search": "3/minute"},
+)
+class ScopedThrottleApiTest(TestCase):
+    """Test suite for per-endpoint throttle budgets"""
+
+    def setUp(self):
+        get_token_bucket_store().clear()
+        self.addCleanup(get_token_bucket_store().clear)
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="customer@example.com", password="pass123"
+            )
+        )
+
+    def test_order_creation_has_its_own_budget(self):
+        """Test order creation is limited without blocking searches"""
+        statuses = [
+            self.client.post(ORDER_URL, {}, format="json").status_code
+            for _ in range(3)
+        ]
+
+        self.assertNotEqual(statuses[1], 429)
+        self.assertEqual(statuses[2], 429)
+        self.assertEqual(self.client.get(FLIGHT_LIST_URL).status_code, 200)
+
+    def test_flight_search_throttled_with_retry_after(self):
+        """Test the search budget and the Retry-After header"""
+        for _ in range(3):
+            self.assertEqual(
+                self.client.get(FLIGHT_LIST_URL).status_code, 200
+            )
+
+        response = self.client.get(FLIGHT_LIST_URL)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_order_list_is_not_scoped(self):
+        """Test reading orders does not spend the order budget"""
+        for _ in range(3):
+            self.assertEqual(self.client.get(ORDER_URL).status_code, 200)
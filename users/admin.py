@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.utils.translation import gettext as _
 
-from .models import User
+from .models import RevokedToken, User
 
 
 @admin.register(User)
@@ -38,3 +38,10 @@ class UserAdmin(DjangoUserAdmin):
     list_display = ("email", "first_name", "last_name", "is_staff")
     search_fields = ("email", "first_name", "last_name")
     ordering = ("email",)
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ["jti", "user", "revoked_at", "expires_at"]
+    search_fields = ["jti", "user__email"]
+    readonly_fields = ["jti", "user", "revoked_at", "expires_at"]
@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import aauthenticate, get_user_model
+from django.contrib.auth.models import update_last_login
+from rest_framework import exceptions
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from config.async_views import AsyncAPIView
+from users.hashing import ahash_password
+from users.serializers import UserSerializer
+
+
+class AsyncCreateUserView(AsyncAPIView):
+    """CreateUserView that awaits the password hash pool."""
+
+    http_method_names = ["post", "options"]
+    authentication_classes = ()
+
+    def check_request(self, request):
+        self.check_throttles(request)
+
+    async def post(self, request):
+        serializer = UserSerializer(data=request.data)
+        # Runs the unique email lookup, hence the thread.
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        user_model = get_user_model()
+        user = user_model(
+            email=user_model.objects.normalize_email(
+                serializer.validated_data["email"]
+            ),
+            password=await ahash_password(
+                serializer.validated_data["password"]
+            ),
+        )
+        await user.asave()
+        return self.render(UserSerializer(user).data, status=201)
+
+
+class AsyncTokenObtainPairView(AsyncAPIView):
+    """
+    TokenObtainPairView that awaits the password hash pool.
+
+    The sync view holds its thread while the pool verifies the password;
+    here the event loop serves other requests in the meantime.
+    """
+
+    http_method_names = ["post", "options"]
+    authentication_classes = ()
+
+    def check_request(self, request):
+        self.check_throttles(request)
+
+    async def post(self, request):
+        serializer = TokenObtainPairSerializer()
+        # Field validation only; validate() would authenticate synchronously.
+        credentials = serializer.to_internal_value(request.data)
+        user = await aauthenticate(request._request, **credentials)
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed(
+                serializer.error_messages["no_active_account"],
+                "no_active_account",
+            )
+
+        refresh = await sync_to_async(serializer.get_token)(user)
+        if api_settings.UPDATE_LAST_LOGIN:
+            await sync_to_async(update_last_login)(None, user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
@@ -0,0 +1,100 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from config.versioning import object_version
+from users.revocation import is_revoked
+
+USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 10_000
+
+
+class UserCache:
+    """
+    Per-process user id (str) -> (expires, version, user) with a TTL.
+
+    Beyond max_size the least recently used entry is dropped, so a burst
+    of new users does not evict the active ones.
+    """
+
+    def __init__(self, max_size=USER_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, cached_version, user = entry
+            if expires < time.monotonic() or cached_version != version:
+                return None
+            self.entries.move_to_end(user_id)
+        return user
+
+    def set(self, user_id, version, user, ttl):
+        with self.lock:
+            self.entries[user_id] = (time.monotonic() + ttl, version, user)
+            self.entries.move_to_end(user_id)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from the token's user id
+    claim through a short-TTL per-process cache instead of a query.
+
+    Each entry is tagged with the user's object version; saving or
+    deleting the user (profile updates, deactivation) bumps it, so every
+    worker drops the stale entry on its next request. Changes made with
+    queryset.update() bypass the signal and last until the TTL expires.
+
+    Tokens whose JTI has been revoked are rejected.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise InvalidToken("Token has been revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(
+                "Token contained no recognizable user identification"
+            ) from None
+
+        version = object_version(get_user_model(), user_id)
+        user = user_cache.get(user_id, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(
+                user_id,
+                version,
+                user,
+                getattr(settings, "USER_CACHE_TTL", USER_CACHE_TTL),
+            )
+        # Views may modify request.user; never hand out the shared copy.
+        return copy.copy(user)
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from users.hashing import (
+    ahash_password,
+    averify_password,
+    hash_password,
+    verify_password,
+)
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend that hashes and verifies passwords in the hash pool."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = user_model._default_manager.get_by_natural_key(username)
+        except user_model.DoesNotExist:
+            # Hash anyway so unknown emails are as slow as wrong passwords.
+            hash_password(password)
+            return None
+        if verify_password(user, password) and self.user_can_authenticate(
+            user
+        ):
+            return user
+        return None
+
+    async def aauthenticate(
+        self, request, username=None, password=None, **kwargs
+    ):
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await user_model._default_manager.aget_by_natural_key(
+                username
+            )
+        except user_model.DoesNotExist:
+            await ahash_password(password)
+            return None
+        if await averify_password(
+            user, password
+        ) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,205 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+from rest_framework.exceptions import Throttled
+
+# 0 hashes in the calling thread (tests, development).
+PASSWORD_HASH_WORKERS = 0
+PASSWORD_HASH_QUEUE_SIZE = 16
+
+
+class PasswordHashingBusy(Throttled):
+    default_detail = "Too many sign-ins in progress, try again shortly."
+    default_code = "password_hashing_busy"
+
+
+def encode_password(algorithm, password, salt):
+    return get_hasher(algorithm).encode(password, salt)
+
+
+def verify_encoded(algorithm, password, encoded):
+    return get_hasher(algorithm).verify(password, encoded)
+
+
+class PasswordHashPool:
+    """
+    Bounded per-process pool for password hashing and verification.
+
+    At most PASSWORD_HASH_QUEUE_SIZE jobs are running or queued at once;
+    further jobs are rejected with a 429 instead of piling up behind the
+    pool and pinning request threads. The executor is created on first
+    use, i.e. after the server has forked its workers, and starts its
+    processes from a forkserver rather than forking a worker that may
+    already run threads (an event loop, the executor's own).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+        self.workers = 0
+        self.capacity = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _configure(self):
+        if self.slots is not None:
+            return
+        with self.lock:
+            if self.slots is not None:
+                return
+            self.workers = getattr(
+                settings, "PASSWORD_HASH_WORKERS", PASSWORD_HASH_WORKERS
+            )
+            self.capacity = getattr(
+                settings, "PASSWORD_HASH_QUEUE_SIZE", PASSWORD_HASH_QUEUE_SIZE
+            )
+            if self.workers:
+                self.executor = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                    initializer=django.setup,
+                )
+            self.slots = threading.BoundedSemaphore(self.capacity)
+
+    def _done(self, slots):
+        slots.release()
+        with self.lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def submit(self, fn, *args) -> Future:
+        self._configure()
+        slots = self.slots
+        if not slots.acquire(blocking=False):
+            with self.lock:
+                self.rejected += 1
+            raise PasswordHashingBusy(wait=1)
+        with self.lock:
+            self.in_flight += 1
+
+        if self.executor is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            try:
+                future = self.executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool for the next request.
+                self._done(slots)
+                self._shutdown()
+                raise
+        future.add_done_callback(lambda _: self._done(slots))
+        return future
+
+    def metrics(self) -> dict:
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self.in_flight,
+                "queued": (
+                    max(0, self.in_flight - self.workers)
+                    if self.workers
+                    else 0
+                ),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def _shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            self.slots = None
+
+    def reset(self):
+        """Drop the pool and counters so settings are re-read."""
+        self._shutdown()
+        with self.lock:
+            self.in_flight = self.completed = self.rejected = 0
+
+
+password_hash_pool = PasswordHashPool()
+
+
+def _submit_hash(password):
+    hasher = get_hasher()
+    return password_hash_pool.submit(
+        encode_password, hasher.algorithm, password, hasher.salt()
+    )
+
+
+def _submit_check(password, encoded):
+    """Return (future of the result, whether to rehash), or None."""
+    if password is None or encoded is None:
+        return None
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return None
+    preferred = get_hasher()
+    must_update = (
+        hasher.algorithm != preferred.algorithm
+        or preferred.must_update(encoded)
+    )
+    future = password_hash_pool.submit(
+        verify_encoded, hasher.algorithm, password, encoded
+    )
+    return future, must_update
+
+
+def hash_password(password) -> str:
+    """make_password() with the hashing done in the pool."""
+    if password is None:
+        return make_password(None)
+    return _submit_hash(password).result()
+
+
+async def ahash_password(password) -> str:
+    if password is None:
+        return make_password(None)
+    return await asyncio.wrap_future(_submit_hash(password))
+
+
+def verify_password(user, password) -> bool:
+    """
+    user.check_password() with the verification done in the pool,
+    including the upgrade of outdated hashes.
+    """
+    check = _submit_check(password, user.password)
+    if check is None:
+        return False
+    future, must_update = check
+    valid = future.result()
+    if valid and must_update:
+        user.password = hash_password(password)
+        user.save(update_fields=["password"])
+    return valid
+
+
+async def averify_password(user, password) -> bool:
+    check = _submit_check(password, user.password)
+    if check is None:
+        return False
+    future, must_update = check
+    valid = await asyncio.wrap_future(future)
+    if valid and must_update:
+        user.password = await ahash_password(password)
+        await user.asave(update_fields=["password"])
+    return valid
@@ -0,0 +1,115 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from users.hashing import encode_password
+
+FIELDS = ("first_name", "last_name")
+
+
+class Command(BaseCommand):
+    """Django command to bulk import users from a CSV file."""
+
+    help = (
+        "Create users from a CSV file with an 'email' and 'password' column "
+        "(optionally 'first_name' and 'last_name'), hashing the passwords "
+        "in parallel. Existing emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Hashing processes (0 hashes in this process).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Users hashed and inserted per batch.",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        user_model = get_user_model()
+        hasher = get_hasher()
+        workers = options["workers"]
+        executor = (
+            ProcessPoolExecutor(workers, initializer=django.setup)
+            if workers
+            else None
+        )
+        created = skipped = 0
+        seen = set()
+        try:
+            with open(options["path"], newline="") as f:
+                reader = csv.DictReader(f)
+                if not {"email", "password"} <= set(reader.fieldnames or ()):
+                    raise CommandError(
+                        "CSV must have 'email' and 'password' columns."
+                    )
+                while batch := list(islice(reader, options["batch_size"])):
+                    rows = []
+                    for row in batch:
+                        email = user_model.objects.normalize_email(
+                            row["email"].strip()
+                        )
+                        if not email or email in seen:
+                            skipped += 1
+                            continue
+                        seen.add(email)
+                        rows.append((email, row))
+                    existing = set(
+                        user_model.objects.filter(
+                            email__in=[email for email, _ in rows]
+                        ).values_list("email", flat=True)
+                    )
+                    rows = [r for r in rows if r[0] not in existing]
+                    skipped += len(existing)
+
+                    passwords = [row["password"] for _, row in rows]
+                    salts = [hasher.salt() for _ in rows]
+                    args = (repeat(hasher.algorithm), passwords, salts)
+                    encoded = list(
+                        executor.map(
+                            encode_password,
+                            *args,
+                            chunksize=max(1, len(rows) // (workers * 4)),
+                        )
+                        if executor
+                        else map(encode_password, *args)
+                    )
+                    users = [
+                        user_model(
+                            email=email,
+                            password=password,
+                            **{
+                                field: row.get(field) or ""
+                                for field in FIELDS
+                            },
+                        )
+                        for (email, row), password in zip(
+                            rows, encoded, strict=True
+                        )
+                    ]
+                    with transaction.atomic():
+                        user_model.objects.bulk_create(users)
+                    created += len(users)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created} user(s), skipped {skipped}."
+            )
+        )
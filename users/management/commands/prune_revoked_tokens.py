@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    """Django command to delete revocations of expired tokens."""
+
+    help = (
+        "Delete revoked token records whose tokens have expired and would "
+        "be rejected anyway."
+    )
+
+    def handle(self, *args, **options):
+        """Handle the command."""
+        deleted, _ = RevokedToken.objects.filter(
+            expires_at__lte=timezone.now()
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"Pruned {deleted} revoked token(s).")
+        )
@@ -0,0 +1,178 @@
+import math
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from hashlib import blake2b
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from config.versioning import bump_model_version, model_version
+from users.models import RevokedToken
+
+REVOKED_FILTER_CAPACITY = 100_000
+REVOKED_FILTER_ERROR_RATE = 0.001
+# Ids are not committed in order; re-read recent rows on every sync so a
+# slow transaction's row is not skipped.
+REVOKED_SYNC_OVERLAP = timedelta(minutes=1)
+# Version bumps only reach the processes sharing the cache, so re-read new
+# rows at least this often (seconds) even when the version is unchanged.
+REVOKED_SYNC_INTERVAL = 5
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing)."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first + i * second) % self.size for i in range(self.hashes)
+        )
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class RevocationList:
+    """
+    Per-process Bloom filter of revoked JTIs, synced from RevokedToken.
+
+    A negative answer needs no query. Whenever the RevokedToken version
+    changes, and at least every REVOKED_SYNC_INTERVAL seconds because other
+    workers may bump a different cache, only new rows (higher id, or revoked
+    within the last minute) are loaded; the filter is rebuilt from unexpired
+    rows once it holds more entries than it was sized for. Positive answers
+    are confirmed in the database because Bloom filters have false
+    positives.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.last_id = 0
+        self.recent_ids = set()
+        self.synced_at = None
+        self.version = None
+
+    def _capacity(self):
+        return getattr(
+            settings, "REVOKED_FILTER_CAPACITY", REVOKED_FILTER_CAPACITY
+        )
+
+    def _fresh(self, version):
+        if self.filter is None or self.version != version:
+            return False
+        interval = getattr(
+            settings, "REVOKED_SYNC_INTERVAL", REVOKED_SYNC_INTERVAL
+        )
+        return timezone.now() - self.synced_at < timedelta(seconds=interval)
+
+    def _rebuild(self):
+        self.synced_at = timezone.now()
+        rows = list(
+            RevokedToken.objects.filter(expires_at__gt=timezone.now())
+            .order_by("id")
+            .values_list("id", "jti")
+        )
+        bloom = BloomFilter(
+            max(self._capacity(), len(rows) * 2),
+            getattr(
+                settings,
+                "REVOKED_FILTER_ERROR_RATE",
+                REVOKED_FILTER_ERROR_RATE,
+            ),
+        )
+        for _, jti in rows:
+            bloom.add(jti)
+        self.filter = bloom
+        self.last_id = rows[-1][0] if rows else 0
+        self.recent_ids = set()
+
+    def _sync(self):
+        version = model_version(RevokedToken)
+        if self._fresh(version):
+            return
+        with self.lock:
+            if self._fresh(version):
+                return
+            if self.filter is None:
+                self._rebuild()
+            else:
+                since = self.synced_at - REVOKED_SYNC_OVERLAP
+                self.synced_at = timezone.now()
+                recent_ids = set()
+                for row_id, jti in (
+                    RevokedToken.objects.filter(
+                        Q(id__gt=self.last_id) | Q(revoked_at__gte=since)
+                    )
+                    .order_by("id")
+                    .values_list("id", "jti")
+                ):
+                    recent_ids.add(row_id)
+                    if row_id not in self.recent_ids:
+                        self.filter.add(jti)
+                    self.last_id = max(self.last_id, row_id)
+                self.recent_ids = recent_ids
+                if self.filter.count > self.filter.capacity:
+                    self._rebuild()
+            self.version = version
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._sync()
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def reset(self):
+        with self.lock:
+            self.filter = None
+            self.version = None
+            self.last_id = 0
+            self.recent_ids = set()
+            self.synced_at = None
+
+
+revocation_list = RevocationList()
+
+
+def is_revoked(token) -> bool:
+    return revocation_list.is_revoked(token.get(api_settings.JTI_CLAIM))
+
+
+def revoke_token(token, user=None) -> None:
+    """Record a validated token as revoked until it would expire anyway."""
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(
+                jti=token[api_settings.JTI_CLAIM],
+                user=user,
+                expires_at=expires_at,
+            )
+    except IntegrityError:
+        # Already revoked.
+        return
+    bump_model_version(RevokedToken)
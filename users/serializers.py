@@ -1,5 +1,15 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer,
+    TokenVerifySerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+
+from users.hashing import hash_password
+from users.revocation import is_revoked
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -11,14 +21,61 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create a new user with encrypted password and return it"""
-        return get_user_model().objects.create_user(**validated_data)
+        user_model = get_user_model()
+        user = user_model(
+            email=user_model.objects.normalize_email(validated_data["email"]),
+            password=hash_password(validated_data["password"]),
+        )
+        user.save()
+        return user
 
     def update(self, instance, validated_data):
         """Update a user, set the password correctly and return it """
         password = validated_data.pop("password", None)
         user = super().update(instance, validated_data)
         if password:
-            user.set_password(password)
+            user.password = hash_password(password)
             user.save()
 
         return user
+
+
+def _validated_token(token_class, raw_token):
+    try:
+        return token_class(raw_token)
+    except TokenError as e:
+        raise serializers.ValidationError(e.args[0]) from e
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    token = serializers.CharField(write_only=True)
+
+    def validate_token(self, value):
+        return _validated_token(UntypedToken, value)
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(write_only=True, required=False)
+
+    def validate_refresh(self, value):
+        refresh = _validated_token(RefreshToken, value)
+        user = self.context["request"].user
+        if str(refresh.get(api_settings.USER_ID_CLAIM)) != str(user.pk):
+            raise serializers.ValidationError(
+                "Token belongs to another user."
+            )
+        return refresh
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        if is_revoked(self.token_class(attrs["refresh"])):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
+
+
+class RevocableTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        if is_revoked(UntypedToken(attrs["token"])):
+            raise InvalidToken("Token has been revoked")
+        return super().validate(attrs)
@@ -5,14 +5,41 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
-from users.views import CreateUserView, ManageUserView
+from users.async_views import (
+    AsyncCreateUserView,
+    AsyncTokenObtainPairView,
+)
+from users.views import (
+    CreateUserView,
+    LogoutView,
+    ManageUserView,
+    PasswordHashMetricsView,
+    TokenRevokeView,
+)
 
 app_name = "user"
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
+    path(
+        "async/register/",
+        AsyncCreateUserView.as_view(),
+        name="async_create",
+    ),
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path(
+        "async/token/",
+        AsyncTokenObtainPairView.as_view(),
+        name="async_token_obtain_pair",
+    ),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("token/revoke/", TokenRevokeView.as_view(), name="token_revoke"),
+    path("logout/", LogoutView.as_view(), name="logout"),
     path("me/", ManageUserView.as_view(), name="manage"),
+    path(
+        "hashing/metrics/",
+        PasswordHashMetricsView.as_view(),
+        name="hashing_metrics",
+    ),
 ]
@@ -1,8 +1,15 @@
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
-
-from users.serializers import UserSerializer
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from users.authentication import CachedJWTAuthentication
+from users.hashing import password_hash_pool
+from users.revocation import revoke_token
+from users.serializers import (
+    LogoutSerializer,
+    TokenRevokeSerializer,
+    UserSerializer,
+)
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -11,8 +18,49 @@ class CreateUserView(generics.CreateAPIView):
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
         return self.request.user
+
+
+class TokenRevokeView(generics.GenericAPIView):
+    """Revoke an access or refresh token; holding the token is enough."""
+
+    serializer_class = TokenRevokeSerializer
+    authentication_classes = ()
+    permission_classes = ()
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke_token(serializer.validated_data["token"])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class LogoutView(generics.GenericAPIView):
+    """Revoke the current access token and, if given, a refresh token."""
+
+    serializer_class = LogoutSerializer
+    authentication_classes = (CachedJWTAuthentication,)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        revoke_token(request.auth, user=request.user)
+        if "refresh" in serializer.validated_data:
+            revoke_token(
+                serializer.validated_data["refresh"], user=request.user
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class PasswordHashMetricsView(APIView):
+    """Queue depth of this worker process's password hashing pool."""
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request):
+        return Response(password_hash_pool.metrics())